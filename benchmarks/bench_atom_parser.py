@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Atom parser benchmark
+
+Parses one large arXiv API page (2,000 entries by default) with the
+feedparser path the fetcher used before and with the streaming lxml
+parser, reporting entries/sec, MB/s and peak traced memory of each
+(Python allocations; libxml2's own buffers are not traced), and checks
+that both produce the same papers. The page is assembled from the
+entries of a fixture set (a recorded one with --fixtures, or the
+synthetic set), repeated with fresh ids if the set has fewer entries; a
+recorded page can be given directly with --feed.
+
+Usage:
+    python benchmarks/bench_atom_parser.py
+    python benchmarks/bench_atom_parser.py --fixtures benchmarks/fixtures/arxiv-2024-10-15
+    python benchmarks/bench_atom_parser.py --feed page.xml --repeat 10
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import feedparser
+
+from fixtures import ENTRY_PATTERN, FEED_HEADER, ensure_fixtures
+from data_acquisition.arxiv_fetcher import ArxivFetcher
+from data_acquisition.atom_parser import iter_atom_papers, published_day
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'synthetic')
+ID_PATTERN = re.compile(rb'(arxiv\.org/(?:abs|pdf)/)(\d{4}\.\d{4,5})')
+TOTAL_RESULTS = (b'<opensearch:totalResults xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/">'
+                 b'%d</opensearch:totalResults>\n')
+
+
+def build_feed(fixture_dir: str, entries: int) -> bytes:
+    """One Atom page of the given number of entries from a fixture set"""
+    manifest = ensure_fixtures(fixture_dir)
+    recorded = []
+    for _category, path in sorted(manifest['feeds'].items()):
+        with open(os.path.join(fixture_dir, path), 'rb') as f:
+            recorded.extend(ENTRY_PATTERN.findall(f.read()))
+    if not recorded:
+        raise ValueError(f"No entries in {fixture_dir}")
+
+    page = []
+    for i in range(entries):
+        entry = recorded[i % len(recorded)]
+        copy = i // len(recorded)
+        if copy:
+            # Later copies get distinct ids so they are distinct papers
+            entry = ID_PATTERN.sub(lambda m: m.group(1) + m.group(2) + b'%d' % copy, entry)
+        page.append(entry)
+    return FEED_HEADER + TOTAL_RESULTS % entries + b'\n'.join(page) + b'</feed>\n'
+
+
+def parse_feedparser(content: bytes) -> list:
+    """The fetcher's former path: feedparser, strptime, then _parse_paper_entry"""
+    fetcher = ArxivFetcher(categories=[])
+    papers = []
+    for entry in feedparser.parse(content).entries:
+        datetime.strptime(entry.published, '%Y-%m-%dT%H:%M:%SZ').date()
+        papers.append(fetcher._parse_paper_entry(entry, 'cs.LG'))
+    return papers
+
+
+def parse_lxml(content: bytes) -> list:
+    """The streaming parser"""
+    papers = []
+    for paper in iter_atom_papers(content, 'cs.LG'):
+        published_day(paper.published_date)
+        papers.append(paper)
+    return papers
+
+
+PARSERS = {'feedparser': parse_feedparser, 'lxml': parse_lxml}
+
+
+def measure(parse, content: bytes, repeat: int) -> dict:
+    """Best time over repeat runs, then peak traced memory of one more run"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        papers = parse(content)
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    parse(content)
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'entries': len(papers),
+        'seconds': round(best, 4),
+        'entries_per_second': round(len(papers) / best, 1),
+        'mb_per_second': round(len(content) / 1e6 / best, 2),
+        'peak_traced_mb': round(peak / 1e6, 2)
+    }, papers
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES,
+                        help='Fixture set directory (a synthetic one is generated if missing)')
+    parser.add_argument('--feed', help='Recorded Atom page to parse instead of a fixture set')
+    parser.add_argument('--entries', type=int, default=2000, help='Entries in the assembled page')
+    parser.add_argument('--save-feed', help='Write the assembled page to this file')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions (best is kept)')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    if args.feed:
+        with open(args.feed, 'rb') as f:
+            content = f.read()
+    else:
+        content = build_feed(args.fixtures, args.entries)
+    if args.save_feed:
+        with open(args.save_feed, 'wb') as f:
+            f.write(content)
+
+    results, outputs = {}, {}
+    for name, parse in PARSERS.items():
+        results[name], outputs[name] = measure(parse, content, args.repeat)
+
+    expected = [paper.to_dict() for paper in outputs['feedparser']]
+    actual = [paper.to_dict() for paper in outputs['lxml']]
+    mismatches = sum(a != b for a, b in zip(expected, actual)) + abs(len(expected) - len(actual))
+
+    report = {
+        'benchmark': 'atom_parser',
+        'feed': args.feed or args.fixtures,
+        'feed_mb': round(len(content) / 1e6, 2),
+        'parsers': results,
+        'speedup': round(results['feedparser']['seconds'] / results['lxml']['seconds'], 2),
+        'mismatched_papers': mismatches
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if mismatches:
+        print(f"{mismatches} papers differ between the parsers", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Embedding backend benchmark
+
+Embeds a fixed corpus (the papers of a fixture set) with each Embedder
+backend and reports texts/sec next to how closely each backend reproduces
+the PyTorch embeddings: per-paper cosine similarity to the torch vector,
+the largest change in any pairwise similarity, and how many of each
+paper's 10 nearest neighbours stay the same.
+
+Usage:
+    python benchmarks/bench_embedding_backends.py
+    python benchmarks/bench_embedding_backends.py --backends torch onnx-int8 --min-cosine 0.99
+    python benchmarks/bench_embedding_backends.py --pool-workers 8 --threads-per-worker 4
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import feedparser
+import numpy as np
+
+from fixtures import ENTRY_PATTERN, FEED_HEADER, ensure_fixtures
+from data_acquisition.arxiv_fetcher import ArxivFetcher
+from embedding.embedder import Embedder
+from embedding.similarity import normalize_rows, top_k_similar
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'synthetic')
+BACKENDS = {
+    'torch': {'backend': 'torch'},
+    'onnx': {'backend': 'onnx'},
+    'onnx-int8': {'backend': 'onnx', 'quantize': True}
+}
+
+
+def load_corpus(fixture_dir: str, limit: int) -> list:
+    """Unique papers of a fixture set, in listing order"""
+    manifest = ensure_fixtures(fixture_dir)
+    parser = ArxivFetcher(categories=[])
+    papers, seen = [], set()
+    for category, path in sorted(manifest['feeds'].items()):
+        with open(os.path.join(fixture_dir, path), 'rb') as f:
+            feed = FEED_HEADER + b''.join(ENTRY_PATTERN.findall(f.read())) + b'</feed>\n'
+        for entry in feedparser.parse(feed).entries:
+            paper = parser._parse_paper_entry(entry, category)
+            if paper and paper['id'] not in seen:
+                seen.add(paper['id'])
+                papers.append(paper)
+    return papers[:limit]
+
+
+def neighbour_overlap(reference: np.ndarray, candidate: np.ndarray, k: int = 10) -> float:
+    """Mean fraction of each row's k nearest neighbours that both matrices agree on"""
+    _scores, expected = top_k_similar(reference, reference, k, normalized=True, exclude_self=True)
+    _scores, actual = top_k_similar(candidate, candidate, k, normalized=True, exclude_self=True)
+    return float(np.mean([len(set(a) & set(b)) / max(len(a), 1) for a, b in zip(expected, actual)]))
+
+
+def accuracy(reference: np.ndarray, candidate: np.ndarray) -> dict:
+    """How closely candidate embeddings reproduce the reference ones"""
+    cosine = np.sum(reference * candidate, axis=1)
+    pairwise_error = np.abs(reference @ reference.T - candidate @ candidate.T)
+    return {
+        'cosine_mean': round(float(cosine.mean()), 6),
+        'cosine_min': round(float(cosine.min()), 6),
+        'pairwise_max_abs_error': round(float(pairwise_error.max()), 6),
+        'neighbour_overlap_at_10': round(neighbour_overlap(reference, candidate), 4)
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES,
+                        help='Fixture set directory (a synthetic one is generated if missing)')
+    parser.add_argument('--papers', type=int, default=1000, help='Corpus size')
+    parser.add_argument('--model', default='all-MiniLM-L6-v2', help='Model name or path')
+    parser.add_argument('--backends', nargs='+', default=list(BACKENDS), choices=list(BACKENDS))
+    parser.add_argument('--onnx-dir', default=None,
+                        help='Directory for exported models (a temporary one by default)')
+    parser.add_argument('--batch-size', type=int, default=32)
+    parser.add_argument('--max-seq-length', type=int, default=256)
+    parser.add_argument('--num-threads', type=int, default=None, help='ONNX Runtime intra-op threads')
+    parser.add_argument('--pool-workers', type=int, default=0,
+                        help='Embed in this many worker processes (0 = in-process)')
+    parser.add_argument('--threads-per-worker', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is kept)')
+    parser.add_argument('--min-cosine', type=float, default=None,
+                        help='Exit with status 1 if any paper is below this cosine to torch')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    papers = load_corpus(args.fixtures, args.papers)
+    onnx_dir = args.onnx_dir or tempfile.mkdtemp(prefix='bench-onnx-')
+    results, embeddings = {}, {}
+
+    for name in args.backends:
+        embedder = Embedder(model_name=args.model, batch_size=args.batch_size,
+                            max_seq_length=args.max_seq_length, cache_dir=None,
+                            onnx_dir=onnx_dir, num_threads=args.num_threads,
+                            pool_workers=args.pool_workers,
+                            threads_per_worker=args.threads_per_worker, **BACKENDS[name])
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            model = embedder.model
+        load_seconds = time.perf_counter() - start
+        if model is None:
+            results[name] = {'error': 'model could not be loaded'}
+            continue
+
+        embedder.generate_paper_embeddings(papers[:args.batch_size])  # warm up
+        best = float('inf')
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            _ids, matrix = embedder.generate_paper_embeddings(papers)
+            best = min(best, time.perf_counter() - start)
+
+        embedder.close()
+        embeddings[name] = normalize_rows(matrix)
+        results[name] = {'load_seconds': round(load_seconds, 3), 'seconds': round(best, 4),
+                         'texts_per_second': round(len(papers) / best, 1)}
+
+    if 'torch' in embeddings:
+        for name, matrix in embeddings.items():
+            results[name].update(accuracy(embeddings['torch'], matrix))
+            results[name]['speedup'] = round(results['torch']['seconds'] / results[name]['seconds'], 2)
+
+    report = {
+        'benchmark': 'embedding_backends',
+        'model': args.model,
+        'papers': len(papers),
+        'settings': {'batch_size': args.batch_size, 'max_seq_length': args.max_seq_length,
+                     'num_threads': args.num_threads, 'pool_workers': args.pool_workers,
+                     'threads_per_worker': args.threads_per_worker, 'repeat': args.repeat,
+                     'cpu_count': os.cpu_count()},
+        'backends': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.min_cosine is not None:
+        failing = [name for name, result in results.items()
+                   if result.get('cosine_min', 1.0) < args.min_cosine or 'error' in result]
+        if failing:
+            print(f"Below cosine {args.min_cosine} against torch: {', '.join(failing)}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+PDF worker benchmark
+
+Parses the fixture set's sample PDFs (--copies of each) with --workers
+extraction processes, with one document that hangs and one whose worker
+process dies mixed into the queue. Checks that the hung document times
+out and the dead worker is reported, that each of them kills and
+replaces only its own worker, and that every other document still
+parses. Reports the wall time next to that of the same queue without
+the two bad documents, so the cost of a timeout can be compared with
+the timeout itself.
+
+Usage:
+    python benchmarks/bench_pdf_workers.py
+    python benchmarks/bench_pdf_workers.py --workers 4 --copies 8 --timeout 3
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from fixtures import ensure_fixtures
+from utils.metrics import metrics
+from parsing.pdf_parser import PYMUPDF_AVAILABLE, PDFParser, extract_pdf
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'synthetic')
+
+
+def extract_or_misbehave(pdf_path: str, max_pages=None) -> dict:
+    """extract_pdf, except that 'hang' documents never finish and 'crash' ones kill the worker"""
+    name = os.path.basename(pdf_path)
+    if name.startswith('hang'):
+        time.sleep(3600)
+    if name.startswith('crash'):
+        os._exit(1)
+    return extract_pdf(pdf_path, max_pages)
+
+
+def parse(paths: list, warm_up: list, workers: int, timeout: float) -> tuple:
+    """Parse paths with a fresh parser, returning (seconds, results, workers killed)"""
+    cache_dir = tempfile.mkdtemp(prefix='bench-pdf-workers-')
+    parser = PDFParser(cache_dir=cache_dir, timeout=timeout, max_workers=workers,
+                       extract_func=extract_or_misbehave)
+    try:
+        parser.parse_pdfs(warm_up)  # start the workers
+        metrics.reset()
+        start = time.perf_counter()
+        results = parser.parse_pdfs(paths)
+        seconds = time.perf_counter() - start
+    finally:
+        parser.close()
+        shutil.rmtree(cache_dir, ignore_errors=True)
+    return seconds, results, metrics.summary()['counters'].get('pdf.workers_killed', 0)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES,
+                        help='Fixture set with sample PDFs (a synthetic one is generated if missing)')
+    parser.add_argument('--workers', type=int, default=2, help='Extraction processes')
+    parser.add_argument('--copies', type=int, default=4, help='Copies of each sample PDF in the queue')
+    parser.add_argument('--timeout', type=float, default=2.0, help='Per-document timeout in seconds')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    if not PYMUPDF_AVAILABLE:
+        print("PyMuPDF is required to write and parse the sample PDFs", file=sys.stderr)
+        sys.exit(1)
+    manifest = ensure_fixtures(args.fixtures)
+    samples = [os.path.join(args.fixtures, path) for path in manifest.get('pdfs', [])]
+    if not samples:
+        print(f"No sample PDFs in {args.fixtures}", file=sys.stderr)
+        sys.exit(1)
+
+    work_dir = tempfile.mkdtemp(prefix='bench-pdf-queue-')
+    try:
+        good = []
+        for copy in range(args.copies):
+            for i, sample in enumerate(samples):
+                path = os.path.join(work_dir, f"ok-{copy}-{i}.pdf")
+                shutil.copyfile(sample, path)
+                good.append(path)
+        hang = os.path.join(work_dir, 'hang.pdf')
+        crash = os.path.join(work_dir, 'crash.pdf')
+        shutil.copyfile(samples[0], hang)
+        shutil.copyfile(samples[0], crash)
+
+        middle = len(good) // 2
+        queue = good[:1] + [hang] + good[1:middle] + [crash] + good[middle:]
+        warm_up = good[:args.workers]
+        clean_seconds, _results, _killed = parse(good, warm_up, args.workers, args.timeout)
+        seconds, results, killed = parse(queue, warm_up, args.workers, args.timeout)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    problems = []
+    if 'timed out' not in results[hang].get('error', ''):
+        problems.append(f"hung document was not timed out: {results[hang]}")
+    if 'died' not in results[crash].get('error', ''):
+        problems.append(f"crashed worker was not reported: {results[crash]}")
+    if killed != 2:
+        problems.append(f"{killed} workers killed, expected 2")
+    failed = [path for path in good if 'error' in results[path]]
+    if failed:
+        problems.append(f"{len(failed)} of {len(good)} good documents failed, "
+                        f"e.g. {results[failed[0]]['error']}")
+
+    report = {
+        'benchmark': 'pdf_workers',
+        'settings': {'workers': args.workers, 'documents': len(queue), 'timeout': args.timeout},
+        'seconds_without_bad_documents': round(clean_seconds, 3),
+        'seconds': round(seconds, 3),
+        'workers_killed': killed,
+        'parsed': len(good) - len(failed),
+        'problems': problems
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if problems:
+        for problem in problems:
+            print(problem, file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
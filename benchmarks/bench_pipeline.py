@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Pipeline benchmark
+
+Replays a fixture set (recorded or synthetic arXiv listings and sample
+PDFs) through a local stand-in server and measures papers/sec for each
+stage on its own and for the whole daily pipeline. Results are printed as
+JSON and can be saved and compared against a baseline run.
+
+Usage:
+    python benchmarks/bench_pipeline.py --mock-embeddings --output results.json
+    python benchmarks/bench_pipeline.py --mock-embeddings --baseline results.json
+    python benchmarks/bench_pipeline.py --fixtures benchmarks/fixtures/arxiv-2024-10-15
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+from datetime import datetime
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import feedparser
+
+from fixtures import ENTRY_PATTERN, FEED_HEADER, FixtureServer, ensure_fixtures
+from utils.config_manager import ConfigManager
+from utils.logger import Logger
+from utils.metrics import metrics
+from data_acquisition.arxiv_fetcher import ArxivFetcher
+from data_acquisition.deduplicator import PaperDeduplicator
+from parsing.pdf_parser import PDFParser
+from parsing.text_cleaner import TextCleaner
+from embedding.embedder import Embedder
+from analysis.recommender import Recommender
+
+import main as paper_daily
+
+
+DEFAULT_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'synthetic')
+
+
+def best_of(repeat: int, func, *args):
+    """Run func repeat times; return (best seconds, last result)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def stage_result(papers: int, seconds: float, **extra) -> dict:
+    return dict({'papers': papers, 'seconds': round(seconds, 4),
+                 'papers_per_second': round(papers / seconds, 1) if seconds > 0 else 0.0}, **extra)
+
+
+def bench_stages(args, server: FixtureServer, manifest: dict, config: ConfigManager) -> dict:
+    """Time each stage in isolation on the same inputs"""
+    results = {}
+    date = manifest['date']
+
+    def fetch():
+        fetcher = ArxivFetcher(categories=manifest['categories'], max_results=args.page_size,
+                               base_url=server.api_url, max_workers=args.fetch_workers,
+                               requests_per_second=1000, burst=100)
+        return fetcher.fetch_papers(date)
+
+    seconds, papers = best_of(args.repeat, fetch)
+    results['fetch'] = stage_result(len(papers), seconds)
+
+    # Atom parsing alone, on one feed holding every recorded entry
+    feed = FEED_HEADER + b''.join(entry for entries in server.entries.values()
+                                  for entry in entries) + b'</feed>\n'
+    parser = ArxivFetcher(categories=[])
+
+    def parse_feed():
+        return [parser._parse_paper_entry(entry, 'cs.LG') for entry in feedparser.parse(feed).entries]
+
+    seconds, parsed = best_of(args.repeat, parse_feed)
+    results['parse_feed'] = stage_result(len(parsed), seconds, feed_mb=round(len(feed) / 1e6, 3))
+
+    deduplicator = PaperDeduplicator()
+    seconds, unique = best_of(args.repeat, deduplicator.deduplicate, papers)
+    results['dedup'] = stage_result(len(papers), seconds, output=len(unique))
+
+    cleaner = TextCleaner()
+    seconds, _ = best_of(args.repeat, lambda: cleaner.clean_papers(copy.deepcopy(unique)))
+    seconds_copy, _ = best_of(args.repeat, copy.deepcopy, unique)
+    results['clean'] = stage_result(len(unique), max(seconds - seconds_copy, 1e-9))
+    cleaned = cleaner.clean_papers(copy.deepcopy(unique))
+
+    if args.pdfs and manifest.get('pdfs'):
+        urls = [paper['pdf_url'] for paper in cleaned[:args.pdfs] if paper.get('pdf_url')]
+
+        def parse_pdfs():
+            cache_dir = tempfile.mkdtemp(prefix='bench-pdfs-')
+            pdf_parser = PDFParser(cache_dir=cache_dir, max_pages=args.pdf_max_pages,
+                                   lazy=args.pdf_lazy)
+            try:
+                return pdf_parser.parse_pdfs(urls)
+            finally:
+                pdf_parser.close()
+                shutil.rmtree(cache_dir, ignore_errors=True)
+
+        seconds, parsed_pdfs = best_of(args.repeat, parse_pdfs)
+        errors = sum(1 for result in parsed_pdfs.values() if 'error' in result)
+        results['pdf'] = stage_result(len(urls), seconds, errors=errors)
+
+    embedder = Embedder(model_name=config.get_config('embedding.model_name', 'all-MiniLM-L6-v2'),
+                        batch_size=config.get_config('embedding.batch_size', 32),
+                        max_seq_length=config.get_config('embedding.max_seq_length', 512),
+                        use_mock=args.mock_embeddings)
+    embedder.generate_paper_embeddings(cleaned[:8])  # warm up
+    seconds, (_ids, embeddings) = best_of(args.repeat, embedder.generate_paper_embeddings, cleaned)
+    results['embed'] = stage_result(len(cleaned), seconds, model_loaded=embedder.model is not None)
+
+    recommender = Recommender(top_k=config.get_config('analysis.top_k', 10), embedder=embedder,
+                              interest_profiles=config.get_config('analysis.interest_profiles', {}))
+    recommender.recommend_top_10(cleaned[:20], embeddings[:20])  # embeds the profiles once
+    seconds, _ = best_of(args.repeat, recommender.recommend_top_10, cleaned, embeddings)
+    results['rank'] = stage_result(len(cleaned), seconds)
+
+    return results
+
+
+def bench_end_to_end(args, server: FixtureServer, manifest: dict, config_path: str) -> dict:
+    """
+    Time run_daily_pipeline against the fixture server with fresh storage each run
+
+    Throughput counts the unique papers left after dedup, the ones every
+    later stage processes; raw feed entries, which repeat cross-listed
+    papers once per category, are reported separately as feed_entries.
+    """
+    best = None
+    for _ in range(args.repeat):
+        work_dir = tempfile.mkdtemp(prefix='bench-pipeline-')
+        config = ConfigManager(config_path)
+        overrides = {
+            'arxiv.categories': manifest['categories'],
+            'arxiv.api_url': server.api_url,
+            'arxiv.max_results': args.page_size,
+            'arxiv.requests_per_second': 1000,
+            'arxiv.burst': 100,
+            'http_cache.enabled': False,
+            'openreview.enabled': False,
+            'database.db_path': os.path.join(work_dir, 'papers.db'),
+            'database.vector_index_path': os.path.join(work_dir, 'vector_index.faiss'),
+            'embedding.cache_dir': os.path.join(work_dir, 'embeddings'),
+            'embedding.mock': args.mock_embeddings,
+            'pdf.enabled': bool(args.pdfs and args.pdf_in_pipeline),
+            'pdf.cache_dir': os.path.join(work_dir, 'pdfs'),
+            'metrics.enabled': False
+        }
+        for key, value in overrides.items():
+            config.set_config(key, value)
+
+        logger = Logger(log_file=None, level='WARNING')
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            paper_daily.run_daily_pipeline(config, logger, manifest['date'])
+        seconds = time.perf_counter() - start
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+        if best is None or seconds < best['seconds']:
+            summary = metrics.summary()
+            stages = {}
+            for name, value in summary['gauges'].items():
+                if name.startswith('pipeline.') and name.endswith('.items_per_second'):
+                    stages[name.split('.')[1]] = value
+            best = stage_result(int(summary['gauges'].get('pipeline.dedup.items_out', 0)), seconds,
+                                feed_entries=int(summary['counters'].get('arxiv.papers', 0)),
+                                stage_items_per_second=stages)
+    return best
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> dict:
+    """Relative papers/sec change per stage; negative is slower"""
+    rows = {}
+    current_stages = dict(current['stages'], end_to_end=current['end_to_end'])
+    baseline_stages = dict(baseline.get('stages', {}))
+    # Older results counted raw feed entries end to end, which isn't comparable
+    if 'feed_entries' in baseline.get('end_to_end', {}):
+        baseline_stages['end_to_end'] = baseline['end_to_end']
+
+    for name, result in current_stages.items():
+        before = baseline_stages.get(name, {}).get('papers_per_second')
+        if not before:
+            continue
+        change = result['papers_per_second'] / before - 1
+        rows[name] = {'baseline': before, 'current': result['papers_per_second'],
+                      'change': round(change, 4), 'regression': change < -tolerance}
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--fixtures', default=DEFAULT_FIXTURES,
+                        help='Fixture set directory (a synthetic one is generated if missing)')
+    parser.add_argument('--config', default=os.path.join(ROOT, 'config.json'), help='Config file')
+    parser.add_argument('--papers-per-category', type=int, default=300,
+                        help='Papers per category when generating synthetic fixtures')
+    parser.add_argument('--mock-embeddings', action='store_true',
+                        help='Use mock embeddings instead of loading the model')
+    parser.add_argument('--pdfs', type=int, default=8, help='PDFs parsed in the pdf stage (0 = skip)')
+    parser.add_argument('--pdf-max-pages', type=int, default=30)
+    parser.add_argument('--pdf-lazy', action='store_true', help='Use lazy PDF extraction')
+    parser.add_argument('--pdf-in-pipeline', action='store_true',
+                        help='Enable the PDF stage in the end-to-end run')
+    parser.add_argument('--page-size', type=int, default=100, help='API page size')
+    parser.add_argument('--fetch-workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='Seconds of simulated network latency per request')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed repetitions (best is kept)')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--baseline', help='Compare against a previous results JSON')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Allowed papers/sec drop before a stage counts as a regression')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='Exit with status 1 when any stage regresses')
+    args = parser.parse_args()
+
+    manifest = ensure_fixtures(args.fixtures, papers_per_category=args.papers_per_category)
+    config = ConfigManager(args.config)
+
+    with FixtureServer(args.fixtures, latency=args.latency) as server:
+        with redirect_stdout(io.StringIO()):
+            stages = bench_stages(args, server, manifest, config)
+        end_to_end = bench_end_to_end(args, server, manifest, args.config)
+
+    results = {
+        'benchmark': 'pipeline',
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'environment': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'mock_embeddings': args.mock_embeddings
+        },
+        'fixtures': {
+            'path': os.path.relpath(args.fixtures, ROOT),
+            'source': manifest.get('source', 'recorded'),
+            'date': manifest['date'],
+            'categories': manifest['categories']
+        },
+        'settings': {'repeat': args.repeat, 'latency': args.latency, 'page_size': args.page_size,
+                     'fetch_workers': args.fetch_workers, 'pdfs': args.pdfs},
+        'stages': stages,
+        'end_to_end': end_to_end
+    }
+
+    regressions = False
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            results['comparison'] = compare(results, json.load(f), args.tolerance)
+        regressions = any(row['regression'] for row in results['comparison'].values())
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+    print(json.dumps(results, indent=2))
+    if 'comparison' in results:
+        for name, row in results['comparison'].items():
+            flag = '  REGRESSION' if row['regression'] else ''
+            print(f"{name:12s} {row['baseline']:>10.1f} -> {row['current']:>10.1f} papers/s "
+                  f"({row['change']:+.1%}){flag}", file=sys.stderr)
+
+    if regressions and args.fail_on_regression:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Local search benchmark
+
+Builds a synthetic archive (100,000 papers by default) in a temporary
+database, indexes it with BM25 and a vector index of random unit vectors,
+and reports index build, save and load times plus p50/p95 query latency
+of keyword, semantic and fused search. Query encoding is not timed (its
+cost is measured by bench_embedding_backends.py); query vectors are
+random, so only retrieval, fusion and loading the result rows count.
+
+Usage:
+    python benchmarks/bench_search.py
+    python benchmarks/bench_search.py --papers 200000 --queries 500 --max-p95-ms 50
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+import numpy as np
+
+from fixtures import METHODS, TOPICS, WORDS, _synthetic_abstract
+from analysis.bm25_index import BM25Index
+from analysis.search_engine import HybridSearchEngine
+from embedding.vector_index import VectorIndex
+from utils.db_manager import DBManager
+
+
+class RandomQueryEncoder:
+    """Stands in for the Embedder, returning a fixed random vector per query"""
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.model = self  # Anything but None enables semantic search
+
+    def generate_embedding(self, text: str) -> np.ndarray:
+        rng = np.random.default_rng(abs(hash(text)) % (2 ** 32))
+        return rng.standard_normal(self.dimension).astype(np.float32)
+
+
+def synthetic_papers(count: int, seed: int = 0) -> list:
+    """Papers with titles and abstracts drawn from the fixture vocabulary"""
+    rng = random.Random(seed)
+    papers = []
+    for i in range(count):
+        topic, method = rng.choice(TOPICS), rng.choice(METHODS)
+        name = ''.join(rng.choice('ABCDEFGHJKLMNPRSTUVWXYZ') for _ in range(5))
+        papers.append({
+            'id': f"{2400 + i // 100000}.{i % 100000:05d}",
+            'title': f"{name}: {method.capitalize()} for {topic} with {rng.choice(WORDS)} {rng.choice(WORDS)}",
+            'abstract': _synthetic_abstract(rng, name, topic, method),
+            'authors': [f"Author {rng.randint(1, 5000)}"],
+            'published_date': '2024-10-15T00:00:00Z',
+            'categories': ['cs.LG'],
+            'primary_category': 'cs.LG',
+            'source': 'arxiv'
+        })
+    return papers
+
+
+def synthetic_queries(count: int, seed: int = 1) -> list:
+    """Short keyword queries mixing topic, method and vocabulary terms"""
+    rng = random.Random(seed)
+    return [' '.join([rng.choice(TOPICS), rng.choice(WORDS)] +
+                     ([rng.choice(METHODS)] if rng.random() < 0.5 else []))
+            for _ in range(count)]
+
+
+def latency(func, queries: list) -> dict:
+    """p50/p95/max latency of func over the queries in milliseconds"""
+    func(queries[0])  # warm up
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        func(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return {'p50_ms': round(float(np.percentile(timings, 50)), 2),
+            'p95_ms': round(float(np.percentile(timings, 95)), 2),
+            'max_ms': round(max(timings), 2)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--papers', type=int, default=100000, help='Archive size')
+    parser.add_argument('--queries', type=int, default=200, help='Timed queries')
+    parser.add_argument('--dimension', type=int, default=384, help='Embedding dimension')
+    parser.add_argument('--index-type', default='flat', choices=['flat', 'ivf', 'hnsw'],
+                        help='Vector index type')
+    parser.add_argument('--k', type=int, default=10, help='Results per query')
+    parser.add_argument('--max-p95-ms', type=float, default=None,
+                        help='Exit with status 1 if fused search p95 exceeds this')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    args = parser.parse_args()
+
+    papers = synthetic_papers(args.papers)
+    queries = synthetic_queries(args.queries)
+    workdir = tempfile.mkdtemp(prefix='bench-search-')
+    db_manager = DBManager(os.path.join(workdir, 'papers.db'))
+    db_manager.save_papers(papers)
+
+    index_path = os.path.join(workdir, 'bm25_index.npz')
+    bm25_index = BM25Index(index_path)
+    start = time.perf_counter()
+    bm25_index.add_papers(papers)
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    bm25_index.save()
+    save_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    bm25_index = BM25Index(index_path)
+    load_seconds = time.perf_counter() - start
+    file_mb = os.path.getsize(index_path) / 1e6
+
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((len(papers), args.dimension)).astype(np.float32)
+    vector_index = VectorIndex(os.path.join(workdir, 'vectors.faiss'), args.dimension,
+                               index_type=args.index_type)
+    vector_index.add(vectors, [paper['id'] for paper in papers])
+
+    engine = HybridSearchEngine(db_manager, bm25_index, embedder=RandomQueryEncoder(args.dimension),
+                                vector_index=vector_index, min_similarity=-1.0)
+    results = {
+        'bm25': latency(lambda query: bm25_index.search(query, engine.candidates), queries),
+        'semantic': latency(engine.semantic_hits, queries),
+        'hybrid': latency(lambda query: engine.search(query, args.k), queries)
+    }
+    db_manager.close()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        'benchmark': 'search',
+        'papers': len(papers),
+        'queries': len(queries),
+        'settings': {'dimension': args.dimension, 'index_type': args.index_type, 'k': args.k,
+                     'candidates': engine.candidates},
+        'index': {**bm25_index.get_info(), 'build_seconds': round(build_seconds, 2),
+                  'docs_per_second': round(len(papers) / build_seconds),
+                  'save_seconds': round(save_seconds, 3), 'load_seconds': round(load_seconds, 3),
+                  'file_mb': round(file_mb, 1)},
+        'latency': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    print(json.dumps(report, indent=2))
+
+    if args.max_p95_ms is not None and results['hybrid']['p95_ms'] > args.max_p95_ms:
+        print(f"Hybrid search p95 {results['hybrid']['p95_ms']} ms exceeds {args.max_p95_ms} ms",
+              file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
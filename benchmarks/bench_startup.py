@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark
+
+Runs short main.py commands in fresh interpreters with -X importtime and
+reports wall time, total import time, the slowest imports and whether any
+heavy dependency (torch, sentence-transformers, faiss, PyMuPDF, ...) was
+imported. Those should only load once a command actually needs them.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --max-seconds 0.5 --output startup.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+HEAVY_MODULES = ('torch', 'sentence_transformers', 'transformers', 'faiss', 'fitz',
+                 'pdfplumber', 'numpy', 'requests', 'feedparser', 'streamlit')
+IMPORTTIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+COMMANDS = {
+    'help': [os.path.join(ROOT, 'main.py'), '--help'],
+    'import_main': ['-c', 'import main'],
+}
+
+
+def measure(args: list, repeat: int) -> dict:
+    """Best wall time and the import profile of one command"""
+    best, stderr = float('inf'), ''
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=ROOT,
+                                capture_output=True, text=True, stdin=subprocess.DEVNULL)
+        elapsed = time.perf_counter() - start
+        if elapsed < best:
+            best, stderr = elapsed, result.stderr
+
+    imports = []
+    for line in stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            imports.append((name, int(cumulative_us), len(indent) // 2))
+
+    top_level = [entry for entry in imports if entry[2] == 0]
+    slowest = sorted(top_level, key=lambda entry: entry[1], reverse=True)[:10]
+    loaded = {name.split('.')[0] for name, _us, _depth in imports}
+
+    return {
+        'wall_seconds': round(best, 4),
+        'import_seconds': round(sum(us for _name, us, _depth in top_level) / 1e6, 4),
+        'modules_imported': len(imports),
+        'heavy_modules': sorted(loaded.intersection(HEAVY_MODULES)),
+        'slowest_imports': [{'module': name, 'seconds': round(us / 1e6, 4)}
+                            for name, us, _depth in slowest]
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per command (best is kept)')
+    parser.add_argument('--output', help='Write results JSON to this file')
+    parser.add_argument('--max-seconds', type=float,
+                        help='Exit with status 1 if any command is slower than this')
+    args = parser.parse_args()
+
+    results = {
+        'benchmark': 'startup',
+        'python': sys.version.split()[0],
+        'commands': {name: measure(command, args.repeat) for name, command in COMMANDS.items()}
+    }
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+    if args.max_seconds is not None:
+        slow = [name for name, result in results['commands'].items()
+                if result['wall_seconds'] > args.max_seconds]
+        if slow:
+            print(f"Startup budget of {args.max_seconds}s exceeded by: {', '.join(slow)}",
+                  file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+TextCleaner micro-benchmark
+
+Measures cleaning throughput in MB/s over a corpus of abstracts, either a
+JSON-lines file with an 'abstract' field per line or a synthetic corpus
+with arXiv-style LaTeX.
+
+Usage:
+    python benchmarks/bench_text_cleaner.py --count 20000
+    python benchmarks/bench_text_cleaner.py --input abstracts.jsonl
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from parsing.text_cleaner import TextCleaner
+
+
+SNIPPETS = [
+    r"We propose \textbf{FastNet}, an $\mathcal{O}(n \log n)$ method \cite{smith2020} for",
+    r"large-scale graph learning~\citep{doe2021,roe2022}. Our approach im-",
+    "proves accuracy by 5\\% over the \\emph{state of the art} (see Sec.~\\ref{sec:exp}).",
+    r"Experiments on $\alpha$-divergence objectives show gains of $3.2\times$ in",
+    "throughput while keeping memory\n  usage   constant.",
+    r"Code is available at \url{https://github.com/example/fastnet}.",
+    "Transformers have become the dominant architecture for sequence modelling,",
+    "yet their quadratic attention cost limits context length in practice.",
+]
+
+
+def synthetic_corpus(count: int, seed: int = 0) -> list:
+    """Build abstracts by sampling arXiv-style sentences"""
+    rng = random.Random(seed)
+    return ['\n'.join(rng.choice(SNIPPETS) for _ in range(rng.randint(6, 14)))
+            for _ in range(count)]
+
+
+def load_corpus(path: str) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line)['abstract'] for line in f if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--input', help='JSON-lines file with an "abstract" field')
+    parser.add_argument('--count', type=int, default=20000, help='Synthetic abstracts')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed repetitions')
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.input) if args.input else synthetic_corpus(args.count)
+    megabytes = sum(len(text.encode('utf-8')) for text in corpus) / 1e6
+    cleaner = TextCleaner()
+
+    cleaner.clean_batch(corpus[:100])  # warm up
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        cleaned = cleaner.clean_batch(corpus)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(json.dumps({
+        'benchmark': 'text_cleaner',
+        'documents': len(corpus),
+        'input_mb': round(megabytes, 3),
+        'output_mb': round(sum(len(t.encode('utf-8')) for t in cleaned) / 1e6, 3),
+        'best_seconds': round(best, 4),
+        'mb_per_second': round(megabytes / best, 2),
+        'docs_per_second': round(len(corpus) / best, 1)
+    }))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,525 @@
+"""
+Benchmark fixtures for Paper Daily
+
+A fixture set is a directory with one recorded arXiv Atom listing per
+category, sample PDFs and a manifest.json describing them:
+
+    {"date": "2024-10-15", "categories": ["cs.LG", ...],
+     "feeds": {"cs.LG": "feeds/cs.LG.xml", ...},
+     "pdfs": ["pdfs/sample-0.pdf", ...]}
+
+FixtureServer replays a fixture set as a stand-in for the arXiv API,
+paging each listing by the start/max_results query parameters and serving
+the sample PDFs for every paper's PDF link.
+
+An OpenReview fixture set holds one JSON list of submission notes per
+venue (API v2 format) and a manifest.json:
+
+    {"venues": {"ICLR.cc/2024": "notes/ICLR.cc_2024.json", ...},
+     "invitation": "{venue}/Conference/-/Submission"}
+
+NotesServer replays it as a stand-in for the OpenReview notes API.
+"""
+
+import http.server
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+
+ENTRY_PATTERN = re.compile(rb'<entry>.*?</entry>', re.DOTALL)
+FEED_HEADER = (b'<?xml version="1.0" encoding="UTF-8"?>\n'
+               b'<feed xmlns="http://www.w3.org/2005/Atom" '
+               b'xmlns:opensearch="http://a9.com/-/spec/opensearch/1.1/" '
+               b'xmlns:arxiv="http://arxiv.org/schemas/atom">\n')
+PDF_LINK_PATTERN = re.compile(rb'https?://(?:export\.)?arxiv\.org/pdf/')
+
+TOPICS = ['large language models', 'diffusion models', 'graph neural networks',
+          'reinforcement learning', 'vision transformers', 'federated learning',
+          'speech recognition', 'neural architecture search', 'contrastive learning',
+          'model quantization', 'retrieval-augmented generation', 'causal inference']
+METHODS = ['sparse attention', 'low-rank adapters', 'curriculum learning', 'knowledge distillation',
+           'mixture of experts', 'Bayesian optimization', 'self-supervised pretraining',
+           'policy gradients', 'score matching', 'prompt tuning']
+WORDS = ('accuracy adaptive agent alignment benchmark bias calibration compact compositional '
+         'compute corpus cross-lingual data dense depth discrete domain dynamic efficient '
+         'embedding encoder error evaluation feature fine-tuning generalization generative '
+         'gradient graph hierarchical image inference interpretable kernel label latent layer '
+         'linear long-context loss memory multilingual multimodal noise objective optimal '
+         'parameter perception planning pretrained privacy probabilistic regularization reward '
+         'robust sample scalable semantic signal simulation sparse stochastic structured '
+         'supervision synthetic temporal token training transfer uncertainty video weight '
+         'zero-shot').split()
+CLAIMS = [
+    r"We propose \textbf{{{name}}}, a method based on {method} for {topic}.",
+    r"Our approach reduces the cost from $\mathcal{{O}}(n^2)$ to $\mathcal{{O}}(n \log n)$ \cite{{prior{n}}}.",
+    "Experiments on {k} benchmarks show improvements of {gain}% over strong baselines.",
+    r"We analyse the role of {method} in {topic}~\citep{{ref{n}}} and derive new bounds.",
+    "Code and models are available at https://github.com/example/{name_lower}.",
+    "Unlike prior work, our method scales to {k}B parameters without additional memory.",
+    r"Theoretical results in Sec.~\ref{{sec:theory}} explain the observed gains.",
+]
+
+
+def load_manifest(fixture_dir: str) -> Dict:
+    """Read a fixture set's manifest"""
+    with open(os.path.join(fixture_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_manifest(fixture_dir: str, manifest: Dict) -> None:
+    with open(os.path.join(fixture_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def _synthetic_abstract(rng: random.Random, name: str, topic: str, method: str) -> str:
+    sentences = []
+    for _ in range(rng.randint(5, 9)):
+        template = rng.choice(CLAIMS)
+        sentences.append(template.format(name=name, name_lower=name.lower(), topic=topic,
+                                         method=method, n=rng.randint(1, 99),
+                                         k=rng.randint(2, 40), gain=rng.randint(1, 30)))
+        # Free-form clauses keep unrelated abstracts from looking like near-duplicates
+        sentences.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(8, 16))).capitalize() + '.')
+    # Abstracts arrive line-wrapped, sometimes mid-word
+    text = ' '.join(sentences)
+    return '\n'.join(text[i:i + 76] for i in range(0, len(text), 76))
+
+
+def _atom_entry(paper_id: str, published: str, title: str, abstract: str,
+                authors: List[str], categories: List[str]) -> str:
+    authors_xml = ''.join(f'<author><name>{escape(a)}</name></author>' for a in authors)
+    categories_xml = ''.join(f'<category term="{c}" scheme="http://arxiv.org/schemas/atom"/>'
+                             for c in categories)
+    return (
+        f'<entry>\n<id>http://arxiv.org/abs/{paper_id}</id>\n'
+        f'<updated>{published}</updated>\n<published>{published}</published>\n'
+        f'<title>{escape(title)}</title>\n<summary>{escape(abstract)}</summary>\n'
+        f'{authors_xml}\n'
+        f'<link href="http://arxiv.org/abs/{paper_id}" rel="alternate" type="text/html"/>\n'
+        f'<link title="pdf" href="http://arxiv.org/pdf/{paper_id}" rel="related" '
+        f'type="application/pdf"/>\n'
+        f'<arxiv:primary_category term="{categories[0]}" '
+        f'scheme="http://arxiv.org/schemas/atom"/>\n{categories_xml}\n</entry>\n'
+    )
+
+
+def _write_sample_pdf(path: str, rng: random.Random, pages: int) -> bool:
+    """Write a paper-shaped PDF with PyMuPDF; False when it isn't installed"""
+    try:
+        import fitz
+    except ImportError:
+        return False
+
+    document = fitz.open()
+    headings = ['Abstract', '1 Introduction', '2 Related Work', '3 Method',
+                '4 Experiments', '5 Conclusion', 'References']
+    for page_number in range(pages):
+        page = document.new_page()
+        lines = []
+        if page_number == 0:
+            lines.append(f"Sample Paper {rng.randint(1, 9999)}")
+        heading = headings[min(page_number, len(headings) - 1)]
+        lines.append(heading)
+        for _ in range(40):
+            lines.append(' '.join(rng.choice(TOPICS + METHODS).split()[0] for _ in range(10)))
+        page.insert_text((50, 60), '\n'.join(lines), fontsize=9)
+    document.save(path)
+    document.close()
+    return True
+
+
+def generate_synthetic_fixtures(fixture_dir: str, date: str = '2024-10-15',
+                                categories: Optional[List[str]] = None,
+                                papers_per_category: int = 300, num_pdfs: int = 4,
+                                pdf_pages: int = 12, seed: int = 0) -> Dict:
+    """
+    Generate a deterministic fixture set shaped like real arXiv listings
+
+    Each category lists papers_per_category papers for the date (plus a few
+    from the previous day so harvesting has to stop on its own). About 10%
+    of papers are cross-listed in a second category and a few appear as two
+    versions, so deduplication has real work to do.
+
+    Args:
+        fixture_dir: Output directory
+        date: Listing date in YYYY-MM-DD format
+        categories: arXiv categories (defaults to cs.AI, cs.LG, cs.CL)
+        papers_per_category: Papers listed per category on the date
+        num_pdfs: Sample PDFs to write
+        pdf_pages: Pages per sample PDF
+        seed: Random seed
+
+    Returns:
+        The fixture manifest
+    """
+    categories = categories or ['cs.AI', 'cs.LG', 'cs.CL']
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(fixture_dir, 'feeds'), exist_ok=True)
+    os.makedirs(os.path.join(fixture_dir, 'pdfs'), exist_ok=True)
+
+    day = datetime.strptime(date, '%Y-%m-%d')
+    listings: Dict[str, List[tuple]] = {category: [] for category in categories}
+    serial = 0
+
+    for category in categories:
+        for i in range(papers_per_category + 5):
+            serial += 1
+            paper_id = f"{day:%y%m}.{serial:05d}v1"
+            # Newest first; the last few entries belong to the previous day
+            if i < papers_per_category:
+                stamp = day + timedelta(hours=23, minutes=59) - timedelta(seconds=i * 80000 // papers_per_category)
+            else:
+                stamp = day - timedelta(hours=i - papers_per_category + 1)
+            topic, method = rng.choice(TOPICS), rng.choice(METHODS)
+            name = ''.join(rng.choice('ABCDEFGHKLMNPRSTVXZ') for _ in range(5))
+            title = f"{name}: {method.capitalize()} for {topic.title()}"
+            abstract = _synthetic_abstract(rng, name, topic, method)
+            authors = [f"Author {rng.randint(1, 5000)}" for _ in range(rng.randint(1, 8))]
+
+            entry_categories = [category]
+            if rng.random() < 0.1:
+                other = rng.choice(categories)
+                if other != category:
+                    entry_categories.append(other)
+                    listings[other].append((stamp, _atom_entry(paper_id, f"{stamp:%Y-%m-%dT%H:%M:%SZ}",
+                                                               title, abstract, authors,
+                                                               entry_categories)))
+            if rng.random() < 0.02:
+                revised = paper_id[:-1] + '2'
+                listings[category].append((stamp, _atom_entry(revised, f"{stamp:%Y-%m-%dT%H:%M:%SZ}",
+                                                               title, abstract, authors,
+                                                               entry_categories)))
+
+            listings[category].append((stamp, _atom_entry(paper_id, f"{stamp:%Y-%m-%dT%H:%M:%SZ}",
+                                                          title, abstract, authors,
+                                                          entry_categories)))
+
+    feeds = {}
+    for category, entries in listings.items():
+        entries.sort(key=lambda item: item[0], reverse=True)
+        path = os.path.join('feeds', f"{category}.xml")
+        with open(os.path.join(fixture_dir, path), 'w', encoding='utf-8') as f:
+            f.write(FEED_HEADER.decode('utf-8'))
+            f.write(f'<title>ArXiv Query: cat:{category}</title>\n')
+            f.writelines(entry for _stamp, entry in entries)
+            f.write('</feed>\n')
+        feeds[category] = path
+
+    pdfs = []
+    for i in range(num_pdfs):
+        path = os.path.join('pdfs', f"sample-{i}.pdf")
+        if _write_sample_pdf(os.path.join(fixture_dir, path), rng, pdf_pages):
+            pdfs.append(path)
+
+    manifest = {'date': date, 'categories': categories, 'feeds': feeds, 'pdfs': pdfs,
+                'source': 'synthetic', 'seed': seed}
+    write_manifest(fixture_dir, manifest)
+    return manifest
+
+
+def ensure_fixtures(fixture_dir: str, **kwargs) -> Dict:
+    """Load a fixture set, generating the synthetic one if it doesn't exist yet"""
+    if not os.path.exists(os.path.join(fixture_dir, 'manifest.json')):
+        return generate_synthetic_fixtures(fixture_dir, **kwargs)
+    return load_manifest(fixture_dir)
+
+
+class FixtureServer:
+    """Local HTTP stand-in for the arXiv API and PDF hosting"""
+
+    def __init__(self, fixture_dir: str, latency: float = 0.0, port: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            fixture_dir: Fixture set directory
+            latency: Seconds added to every response to mimic network round trips
+            port: Port to listen on (0 picks a free one)
+        """
+        self.fixture_dir = fixture_dir
+        self.manifest = load_manifest(fixture_dir)
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+        self.entries: Dict[str, List[bytes]] = {}
+        for category, path in self.manifest['feeds'].items():
+            with open(os.path.join(fixture_dir, path), 'rb') as f:
+                self.entries[category] = ENTRY_PATTERN.findall(f.read())
+
+        self.pdfs: List[bytes] = []
+        for path in self.manifest.get('pdfs', []):
+            with open(os.path.join(fixture_dir, path), 'rb') as f:
+                self.pdfs.append(f.read())
+
+        handler = self._make_handler()
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_port}"
+        self.api_url = f"{self.base_url}/api/query"
+        self._thread: Optional[threading.Thread] = None
+
+    def _feed_page(self, query: Dict[str, List[str]]) -> bytes:
+        match = re.search(r'cat:(\S+)', query.get('search_query', [''])[0])
+        entries = self.entries.get(match.group(1), []) if match else []
+        start = int(query.get('start', ['0'])[0])
+        size = int(query.get('max_results', ['10'])[0])
+
+        page = b''.join(entries[start:start + size])
+        page = PDF_LINK_PATTERN.sub(f"{self.base_url}/pdf/".encode(), page)
+        return (FEED_HEADER +
+                f'<opensearch:totalResults>{len(entries)}</opensearch:totalResults>\n'
+                f'<opensearch:startIndex>{start}</opensearch:startIndex>\n'
+                f'<opensearch:itemsPerPage>{size}</opensearch:itemsPerPage>\n'.encode() +
+                page + b'</feed>\n')
+
+    def _pdf(self, paper_id: str) -> Optional[bytes]:
+        if not self.pdfs:
+            return None
+        return self.pdfs[zlib.crc32(paper_id.encode()) % len(self.pdfs)]
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path.startswith('/api/'):
+                    body, content_type = server._feed_page(parse_qs(parsed.query)), 'application/atom+xml'
+                elif parsed.path.startswith('/pdf/'):
+                    body, content_type = server._pdf(parsed.path[5:]), 'application/pdf'
+                else:
+                    body = None
+
+                if body is None:
+                    self.send_error(404)
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.requests += 1
+                    server.bytes_sent += len(body)
+
+        return Handler
+
+    def start(self) -> 'FixtureServer':
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+
+def generate_openreview_fixtures(fixture_dir: str, venues: Optional[List[str]] = None,
+                                 notes_per_venue: int = 3000, seed: int = 0) -> Dict:
+    """
+    Generate a deterministic OpenReview fixture set of API v2 submission notes
+
+    Args:
+        fixture_dir: Output directory
+        venues: Conference IDs (defaults to ICLR.cc/2024 and NeurIPS.cc/2024)
+        notes_per_venue: Submissions per venue
+        seed: Random seed
+
+    Returns:
+        The fixture manifest
+    """
+    venues = venues or ['ICLR.cc/2024', 'NeurIPS.cc/2024']
+    rng = random.Random(seed)
+    os.makedirs(os.path.join(fixture_dir, 'notes'), exist_ok=True)
+    # Submissions open in early autumn 2023 and are edited over the following months
+    opened = int(datetime(2023, 9, 1).timestamp() * 1000)
+
+    files = {}
+    for venue in venues:
+        notes = []
+        for number in range(1, notes_per_venue + 1):
+            note_id = ''.join(rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789')
+                              for _ in range(10))
+            created = opened + number * 60000 + rng.randint(0, 59999)
+            modified = created + rng.randint(0, 120 * 86400 * 1000)
+            topic, method = rng.choice(TOPICS), rng.choice(METHODS)
+            name = ''.join(rng.choice('ABCDEFGHKLMNPRSTVXZ') for _ in range(5))
+            notes.append({
+                'id': note_id,
+                'forum': note_id,
+                'number': number,
+                'invitations': [f"{venue}/Conference/-/Submission"],
+                'cdate': created, 'tcdate': created, 'odate': created,
+                'mdate': modified, 'tmdate': modified,
+                'content': {
+                    'title': {'value': f"{name}: {method.capitalize()} for {topic.title()}"},
+                    'authors': {'value': [f"Author {rng.randint(1, 5000)}"
+                                          for _ in range(rng.randint(1, 8))]},
+                    'abstract': {'value': _synthetic_abstract(rng, name, topic, method)},
+                    'keywords': {'value': [topic, method]},
+                    'pdf': {'value': f"/pdf/{zlib.crc32(note_id.encode()):08x}.pdf"},
+                    'venue': {'value': f"Submitted to {venue.split('.')[0]} {venue.split('/')[-1]}"},
+                    'venueid': {'value': f"{venue}/Conference/Submission"}
+                }
+            })
+        path = os.path.join('notes', f"{venue.replace('/', '_')}.json")
+        with open(os.path.join(fixture_dir, path), 'w', encoding='utf-8') as f:
+            json.dump(notes, f)
+        files[venue] = path
+
+    manifest = {'venues': files, 'invitation': '{venue}/Conference/-/Submission',
+                'source': 'synthetic', 'seed': seed}
+    write_manifest(fixture_dir, manifest)
+    return manifest
+
+
+def ensure_openreview_fixtures(fixture_dir: str, **kwargs) -> Dict:
+    """Load an OpenReview fixture set, generating the synthetic one if it doesn't exist yet"""
+    if not os.path.exists(os.path.join(fixture_dir, 'manifest.json')):
+        return generate_openreview_fixtures(fixture_dir, **kwargs)
+    return load_manifest(fixture_dir)
+
+
+class NotesServer:
+    """Local HTTP stand-in for the OpenReview notes API"""
+
+    SORT_KEYS = {'tmdate', 'tcdate', 'cdate', 'mdate', 'number'}
+
+    def __init__(self, fixture_dir: str, latency: float = 0.0, port: int = 0):
+        """
+        Initialize the server
+
+        Args:
+            fixture_dir: OpenReview fixture set directory
+            latency: Seconds added to every response to mimic network round trips
+            port: Port to listen on (0 picks a free one)
+        """
+        self.manifest = load_manifest(fixture_dir)
+        self.latency = latency
+        self.requests = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+        # Notes by submission invitation, as the API selects them
+        invitation = self.manifest.get('invitation', '{venue}/Conference/-/Submission')
+        self.notes: Dict[str, List[Dict]] = {}
+        for venue, path in self.manifest['venues'].items():
+            with open(os.path.join(fixture_dir, path), 'r', encoding='utf-8') as f:
+                self.notes[invitation.format(venue=venue)] = json.load(f)
+
+        handler = self._make_handler()
+        self.httpd = http.server.ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.httpd.daemon_threads = True
+        self.api_url = f"http://127.0.0.1:{self.httpd.server_port}/notes"
+        self._thread: Optional[threading.Thread] = None
+
+    def edit(self, count: int, seed: int = 0) -> List[str]:
+        """
+        Mark random notes of every venue as modified now, as reviews and revisions do
+
+        Args:
+            count: Notes edited per venue
+            seed: Random seed
+
+        Returns:
+            Ids of the edited notes
+        """
+        rng = random.Random(seed)
+        now = int(time.time() * 1000)
+        edited = []
+        with self._lock:
+            for notes in self.notes.values():
+                for note in rng.sample(notes, min(count, len(notes))):
+                    now += 1
+                    note['mdate'] = note['tmdate'] = now
+                    edited.append(note['id'])
+        return edited
+
+    def _notes_page(self, query: Dict[str, List[str]]) -> Optional[bytes]:
+        notes = self.notes.get(query.get('invitation', [''])[0])
+        if notes is None:
+            return None
+        offset = int(query.get('offset', ['0'])[0])
+        limit = min(int(query.get('limit', ['1000'])[0]), 1000)
+        key, _, order = query.get('sort', ['number:asc'])[0].partition(':')
+        if key not in self.SORT_KEYS:
+            return None
+
+        with self._lock:
+            ordered = sorted(notes, key=lambda note: note.get(key) or 0, reverse=order == 'desc')
+        return json.dumps({'notes': ordered[offset:offset + limit], 'count': len(ordered)}).encode()
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                body = None
+                if parsed.path == '/notes':
+                    body = server._notes_page(parse_qs(parsed.query))
+                if body is None:
+                    self.send_error(400)
+                    return
+                if server.latency:
+                    time.sleep(server.latency)
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                with server._lock:
+                    server.requests += 1
+                    server.bytes_sent += len(body)
+
+        return Handler
+
+    def start(self) -> 'NotesServer':
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and close the socket"""
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
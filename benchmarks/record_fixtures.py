@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Record benchmark fixtures
+
+Records one day of real arXiv listings (raw Atom entries, exactly as the
+API returned them) and a few of their PDFs into a fixture set for
+bench_pipeline.py, or generates the deterministic synthetic set. With
+--openreview it records the submission notes of OpenReview venues (raw
+JSON) into a fixture set for bench_openreview.py instead.
+
+Usage:
+    python benchmarks/record_fixtures.py --date 2024-10-15 --categories cs.LG cs.CL \\
+        --out benchmarks/fixtures/arxiv-2024-10-15
+    python benchmarks/record_fixtures.py --synthetic --out benchmarks/fixtures/synthetic
+    python benchmarks/record_fixtures.py --openreview ICLR.cc/2024 --out benchmarks/fixtures/openreview
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from fixtures import (ENTRY_PATTERN, FEED_HEADER, generate_openreview_fixtures,
+                      generate_synthetic_fixtures, write_manifest)
+from data_acquisition.arxiv_fetcher import ArxivFetcher
+from data_acquisition.openreview_fetcher import OpenReviewFetcher
+
+
+PUBLISHED_PATTERN = re.compile(rb'<published>(\d{4}-\d{2}-\d{2})')
+PDF_PATTERN = re.compile(rb'<link[^>]*href="([^"]+)"[^>]*type="application/pdf"')
+
+
+def record_category(fetcher: ArxivFetcher, category: str, date: str, page_size: int) -> list:
+    """Raw Atom entries submitted on date, newest first"""
+    target_date = datetime.strptime(date, '%Y-%m-%d').date()
+    entries, start = [], 0
+
+    while True:
+        url = fetcher._build_category_query_url(category, target_date, start, page_size)
+        page = ENTRY_PATTERN.findall(fetcher._get(url, ttl=-1))
+        for entry in page:
+            match = PUBLISHED_PATTERN.search(entry)
+            if match and match.group(1).decode() < date:
+                return entries
+            entries.append(entry)
+        if len(page) < page_size:
+            return entries
+        start += len(page)
+
+
+def record_openreview(out: str, venues: list, api_url: str, invitation: str) -> None:
+    """Record every submission note of each venue, in creation order"""
+    os.makedirs(os.path.join(out, 'notes'), exist_ok=True)
+    fetcher = OpenReviewFetcher(conference_ids=venues, api_url=api_url, invitation=invitation,
+                                requests_per_second=1.0, burst=1)
+    files = {}
+    for venue in venues:
+        notes, offset = [], 0
+        while True:
+            page = fetcher._get_notes(venue, offset, fetcher.page_size, 'tcdate:asc').get('notes', [])
+            notes.extend(page)
+            if len(page) < fetcher.page_size:
+                break
+            offset += len(page)
+        path = os.path.join('notes', f"{venue.replace('/', '_')}.json")
+        with open(os.path.join(out, path), 'w', encoding='utf-8') as f:
+            json.dump(notes, f)
+        files[venue] = path
+        print(f"Recorded {len(notes)} notes for {venue}")
+
+    write_manifest(out, {'venues': files, 'invitation': invitation, 'source': 'recorded'})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--out', required=True, help='Fixture set directory')
+    parser.add_argument('--date', default='2024-10-15', help='Listing date (YYYY-MM-DD)')
+    parser.add_argument('--categories', nargs='+', default=['cs.AI', 'cs.LG', 'cs.CL'])
+    parser.add_argument('--pdfs', type=int, default=4, help='PDFs to record')
+    parser.add_argument('--page-size', type=int, default=200)
+    parser.add_argument('--api-url', default='http://export.arxiv.org/api/query')
+    parser.add_argument('--synthetic', action='store_true',
+                        help='Generate the synthetic fixture set instead of recording')
+    parser.add_argument('--papers-per-category', type=int, default=300,
+                        help='Papers per category for --synthetic')
+    parser.add_argument('--openreview', nargs='+', metavar='VENUE',
+                        help='Record (or with --synthetic, generate) notes of these OpenReview venues')
+    parser.add_argument('--openreview-api-url', default='https://api2.openreview.net/notes')
+    parser.add_argument('--invitation', default='{venue}/Conference/-/Submission',
+                        help='Submission invitation of the OpenReview venues')
+    parser.add_argument('--notes-per-venue', type=int, default=3000,
+                        help='Notes per venue for --synthetic --openreview')
+    args = parser.parse_args()
+
+    if args.openreview:
+        if args.synthetic:
+            generate_openreview_fixtures(args.out, venues=args.openreview,
+                                         notes_per_venue=args.notes_per_venue)
+            print(f"Generated synthetic OpenReview fixtures in {args.out}")
+        else:
+            record_openreview(args.out, args.openreview, args.openreview_api_url, args.invitation)
+        return
+
+    if args.synthetic:
+        manifest = generate_synthetic_fixtures(args.out, date=args.date, categories=args.categories,
+                                               papers_per_category=args.papers_per_category,
+                                               num_pdfs=args.pdfs)
+        print(f"Generated synthetic fixtures in {args.out} ({len(manifest['pdfs'])} PDFs)")
+        return
+
+    os.makedirs(os.path.join(args.out, 'feeds'), exist_ok=True)
+    os.makedirs(os.path.join(args.out, 'pdfs'), exist_ok=True)
+
+    # arXiv asks API clients to wait three seconds between requests
+    fetcher = ArxivFetcher(categories=args.categories, base_url=args.api_url,
+                           requests_per_second=1 / 3)
+    feeds, pdf_urls = {}, []
+    for category in args.categories:
+        entries = record_category(fetcher, category, args.date, args.page_size)
+        path = os.path.join('feeds', f"{category}.xml")
+        with open(os.path.join(args.out, path), 'wb') as f:
+            f.write(FEED_HEADER + b''.join(entry + b'\n' for entry in entries) + b'</feed>\n')
+        feeds[category] = path
+        print(f"Recorded {len(entries)} entries for {category}")
+
+        for entry in entries:
+            match = PDF_PATTERN.search(entry)
+            if match and len(pdf_urls) < args.pdfs:
+                pdf_urls.append(match.group(1).decode())
+
+    pdfs = []
+    for i, url in enumerate(pdf_urls):
+        path = os.path.join('pdfs', f"sample-{i}.pdf")
+        with open(os.path.join(args.out, path), 'wb') as f:
+            f.write(fetcher._get(url, ttl=-1))
+        pdfs.append(path)
+        print(f"Recorded {url}")
+
+    write_manifest(args.out, {'date': args.date, 'categories': args.categories, 'feeds': feeds,
+                              'pdfs': pdfs, 'source': 'recorded'})
+
+
+if __name__ == '__main__':
+    main()
@@ -9,30 +9,39 @@ It supports both CLI and web interfaces.
 import click
 import os
 import sys
-from datetime import datetime
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Add src to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+# Only lightweight modules are imported here so --help and --cli start
+# instantly; subsystems pulling in numpy, requests, faiss or torch are
+# imported by the functions that use them.
 from utils.config_manager import ConfigManager
 from utils.logger import Logger
-from data_acquisition.arxiv_fetcher import ArxivFetcher
-from data_acquisition.openreview_fetcher import OpenReviewFetcher
-from parsing.pdf_parser import PDFParser
-from parsing.text_cleaner import TextCleaner
-from embedding.embedder import Embedder
-from analysis.recommender import Recommender
+from utils.metrics import metrics
 from display.cli_display import CLIDisplay
-from display.web_display import WebDisplay
 
 
 @click.command()
 @click.option('--web', is_flag=True, help='Launch web interface')
 @click.option('--cli', is_flag=True, help='Use command line interface')
+@click.option('--serve', is_flag=True,
+              help='Run as a daemon, fetching on the configured schedule with the model kept loaded')
 @click.option('--config', default='config.json', help='Config file path')
 @click.option('--date', default=None, help='Specific date to fetch papers (YYYY-MM-DD)')
-def main(web, cli, config, date):
+@click.option('--from', 'date_from', default=None, metavar='DATE',
+              help='Backfill papers submitted from DATE (YYYY-MM-DD), resuming where an earlier run stopped')
+@click.option('--to', 'date_to', default=None, metavar='DATE',
+              help='Last date of the backfill (YYYY-MM-DD), yesterday by default')
+@click.option('--search', 'query', default=None, metavar='QUERY',
+              help='Search stored papers and print the matches')
+@click.option('--profile', default=None, metavar='PATH',
+              help='Run under cProfile and write the stats to PATH')
+def main(web, cli, serve, config, date, date_from, date_to, query, profile):
     """Paper Daily - AI Research Paper Tracker"""
     
     # Initialize components
@@ -41,57 +50,874 @@ def main(web, cli, config, date):
     
     logger.log("Starting Paper Daily application", "INFO")
     
-    if web:
-        # Launch web interface
-        logger.log("Launching web interface", "INFO")
-        web_display = WebDisplay()
-        web_display.run()
-    elif cli:
-        # Use CLI interface
-        run_cli_mode(config_manager, logger, date)
-    else:
-        # Default: run daily fetch and recommendation
-        run_daily_pipeline(config_manager, logger, date)
+    with profiling(profile, logger):
+        if web:
+            # Launch web interface
+            logger.log("Launching web interface", "INFO")
+            from display.web_display import WebDisplay
+            web_display = WebDisplay()
+            web_display.run()
+        elif cli:
+            # Use CLI interface
+            run_cli_mode(config_manager, logger, date)
+        elif serve:
+            # Keep the model and index loaded and run on a schedule
+            run_serve_mode(config_manager, logger)
+        elif query:
+            # Search the local archive, falling back to arXiv search
+            run_search(config_manager, logger, query)
+        elif date_from:
+            # Fetch, store and index a historical date range in resumable chunks
+            run_backfill(config_manager, logger, date_from, date_to)
+        else:
+            # Default: run daily fetch and recommendation
+            run_daily_pipeline(config_manager, logger, date)
+
+
+@contextmanager
+def profiling(path, logger):
+    """Profile the enclosed block with cProfile when a stats path is given"""
+    if not path:
+        yield
+        return
+    
+    import cProfile
+    import pstats
+    
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        logger.log(f"Profile written to {path} (view with: python -m pstats {path})", "INFO")
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
 
 
-def run_daily_pipeline(config_manager, logger, date=None):
-    """Run the complete daily paper processing pipeline"""
+class PipelineSession:
+    """
+    Components kept warm across daily pipeline runs
+    
+    A one-off run uses a fresh session. --serve keeps one for the life of
+    the process, so the embedding model, interest profile embeddings and
+    vector index load once, and a repeated run for the same date only
+    cleans, embeds and scores papers the earlier runs have not seen.
+    """
+    
+    def __init__(self, config_manager, keep_days: int = 2):
+        """
+        Initialize the session
+        
+        Args:
+            config_manager: Application config
+            keep_days: Number of most recent dates whose results are kept
+        """
+        self.config_manager = config_manager
+        self.keep_days = keep_days
+        self.embedder = create_embedder(config_manager)
+        self.recommender = create_recommender(config_manager, self.embedder)
+        self.vector_index = None
+        self.search_index = None
+        self.days = {}
+    
+    def day(self, date: str) -> dict:
+        """
+        State carried between runs for one date
+        
+        Holds the date's deduplicator (which remembers every paper it has
+        seen), the ids already saved to the database and a PaperBatch of
+        the papers earlier runs embedded and scored.
+        """
+        from data_acquisition.paper import PaperBatch
+        
+        if date not in self.days:
+            self.days[date] = {
+                'deduplicator': create_deduplicator(self.config_manager),
+                'stored_ids': set(),
+                'results': PaperBatch()
+            }
+            for old_date in sorted(self.days)[:-self.keep_days]:
+                del self.days[old_date]
+        return self.days[date]
+    
+    def discard(self, date: str) -> None:
+        """Forget a date's state, e.g. after a failed run left it half-updated"""
+        self.days.pop(date, None)
+    
+    def get_vector_index(self):
+        """The vector index, loaded from disk on first use"""
+        if self.vector_index is None:
+            self.vector_index = create_vector_index(self.config_manager, self.embedder.embedding_dim)
+        return self.vector_index
+    
+    def get_search_index(self, db_manager):
+        """The BM25 search index, loaded on first use and caught up with the database"""
+        if self.search_index is None:
+            self.search_index = open_search_index(self.config_manager, db_manager)
+        return self.search_index
+    
+    def close(self) -> None:
+        """Release the embedder's worker processes, if any"""
+        self.embedder.close()
+
+
+def run_daily_pipeline(config_manager, logger, date=None, session=None):
+    """
+    Run the complete daily paper processing pipeline
+    
+    Args:
+        config_manager: Application config
+        logger: Application logger
+        date: Date to fetch (YYYY-MM-DD), today by default
+        session: PipelineSession to reuse across runs; a fresh one by default
+    """
     
     if date is None:
         date = datetime.now().strftime('%Y-%m-%d')
     
     logger.log(f"Running daily pipeline for date: {date}", "INFO")
     
+    from data_acquisition.paper import PaperBatch
+    from utils.db_manager import DBManager
+    from utils.pipeline_runner import PipelineRunner
+    
+    metrics.reset()
+    metrics.logger = logger
+    db_manager = DBManager(config_manager.get_config('database.db_path', 'data/db/papers.db'))
+    pdf_parser = None
+    status = 'error'
+    errors = 0
+    run_start = time.perf_counter()
+    
+    owns_session = session is None
+    if owns_session:
+        session = PipelineSession(config_manager)
+    day = session.day(date)
+    
     try:
-        # 1. Fetch papers
-        arxiv_fetcher = ArxivFetcher(['cs.AI', 'cs.LG', 'cs.CL'])
-        papers = arxiv_fetcher.fetch_papers(date)
-        logger.log(f"Fetched {len(papers)} papers from arXiv", "INFO")
+        arxiv_fetcher = create_arxiv_fetcher(config_manager)
+        openreview_fetcher = None
+        if config_manager.get_config('openreview.enabled', False):
+            openreview_fetcher = create_openreview_fetcher(config_manager)
+        embedder = session.embedder
+        # Load the model while the first pages are being fetched
+        embedder.load_in_background()
+        recommender = session.recommender
+        search_index = session.get_search_index(db_manager)
+        indexed = len(search_index)
+        if config_manager.get_config('pdf.enabled', False):
+            pdf_parser = create_pdf_parser(config_manager)
         
-        # 2. Process papers (simplified for warm-up)
-        embedder = Embedder()
-        recommender = Recommender()
+        # 1. Stream papers through fetch -> store -> dedup -> clean -> (pdf) -> embed -> score
+        # Papers seen by earlier runs of this session are dropped at dedup
+        deduplicator = day['deduplicator']
+        stages = build_pipeline_stages(config_manager, date, db_manager, arxiv_fetcher,
+                                       deduplicator, embedder, recommender, pdf_parser,
+                                       stored_ids=day['stored_ids'], search_index=search_index,
+                                       openreview_fetcher=openreview_fetcher)
+        runner = PipelineRunner(stages)
+        sources = list(arxiv_fetcher.categories)
+        if openreview_fetcher is not None:
+            sources.extend(('openreview', venue) for venue in openreview_fetcher.conference_ids)
+        new_batch = collect_results(runner.run(sources), embedder.embedding_dim)
         
-        # 3. Generate recommendations
-        recommendations = recommender.recommend_top_10(papers)
+        # Papers lost to a failed stage must be refetched, so nothing is
+        # recorded as done and the day's state is dropped at the end
+        errors = sum(stage.stats['errors'] for stage in runner.stages)
+        if errors:
+            logger.log(f"{errors} pipeline errors for {date}; the day will be refetched "
+                       f"on the next run", "ERROR")
+        
+        # Venues whose papers all made it through resume from their newest change
+        if openreview_fetcher is not None:
+            for venue, stats in openreview_fetcher.last_fetch_stats.items():
+                if venue not in openreview_fetcher.failed_venues:
+                    db_manager.set_sync_cursor('openreview', venue, stats['cursor'])
+        if len(search_index) != indexed:
+            with metrics.span('pipeline.search_index', log=True):
+                search_index.save()
+        previous = day['results']
+        batch = PaperBatch.concat([previous, new_batch])
+        logger.log(f"Deduplicated to {len(new_batch)} new papers ({len(batch)} for {date})",
+                   "INFO", deduplicator.last_stats)
+        log_pipeline_report(logger, runner)
+        
+        # Recent listings can still change, so only settled days are recorded as done
+        if arxiv_fetcher.is_settled(date) and not errors:
+            for category, stats in arxiv_fetcher.last_fetch_stats.items():
+                if category not in arxiv_fetcher.failed_categories:
+                    db_manager.mark_fetched('arxiv', category, date, stats.get('papers', 0))
+        
+        if len(previous) and not len(new_batch) and not errors:
+            logger.log(f"No new papers for {date} since the last run", "INFO")
+            status = 'ok'
+            return
+        
+        # 2. Add the new papers to the vector index
+        if embedder.model is not None:
+            with metrics.span('pipeline.index', log=True):
+                vector_index = session.get_vector_index()
+                added = vector_index.add(new_batch.embeddings, new_batch.ids)
+                vector_index.save()
+            logger.log(f"Indexed {added} new papers ({len(vector_index)} total)", "INFO")
+        
+        # 3. Generate recommendations, skipping papers recommended on earlier runs
+        already_recommended = db_manager.get_recommended_ids(exclude_date=date)
+        candidates = batch.select([i for i, paper_id in enumerate(batch.ids)
+                                   if paper_id not in already_recommended])
+        recommendations = recommender.select_top_k(candidates)
+        db_manager.save_recommendations(date, recommendations)
+        if errors:
+            session.discard(date)
+        else:
+            day['results'] = batch
         
         # 4. Display results
         cli_display = CLIDisplay()
         cli_display.print_recommendations(recommendations)
         
-        logger.log("Daily pipeline completed successfully", "INFO")
+        if errors:
+            logger.log(f"Daily pipeline completed with {errors} errors", "WARNING")
+            status = 'partial'
+        else:
+            logger.log("Daily pipeline completed successfully", "INFO")
+            status = 'ok'
         
     except Exception as e:
         logger.log(f"Error in daily pipeline: {str(e)}", "ERROR")
+        session.discard(date)
         raise
+    finally:
+        if pdf_parser is not None:
+            pdf_parser.close()
+        if owns_session:
+            session.close()
+        db_manager.close()
+        metrics.record_span('pipeline.run', time.perf_counter() - run_start, date=date)
+        write_run_metrics(config_manager, date=date, status=status, errors=errors)
+
+
+def collect_results(results, embedding_dim):
+    """
+    Gather the pipeline's (paper, embedding, relevance, profile) tuples into a PaperBatch
+    
+    Relevance and profile become columns only when they were scored.
+    """
+    import numpy as np
+    from data_acquisition.paper import PaperBatch
+    
+    embeddings = np.array([embedding for _paper, embedding, _relevance, _profile in results],
+                          dtype=np.float32).reshape(len(results), embedding_dim)
+    columns = {}
+    if results and results[0][2] is not None:
+        columns['relevance'] = np.array([relevance for _paper, _embedding, relevance, _profile
+                                         in results], dtype=np.float32)
+        columns['profile'] = np.array([profile for _paper, _embedding, _relevance, profile
+                                       in results], dtype=np.int64)
+    return PaperBatch([paper for paper, _embedding, _relevance, _profile in results], embeddings,
+                      **columns)
+
+
+def write_run_metrics(config_manager, **run_info):
+    """Log the run's metrics summary and append it to the metrics file"""
+    metrics.log_summary()
+    if not config_manager.get_config('metrics.enabled', True):
+        return
+    path = config_manager.get_config('metrics.file', 'logs/metrics.jsonl')
+    try:
+        metrics.write_jsonl(path, **run_info)
+    except OSError as e:
+        print(f"Error writing metrics to {path}: {e}")
+
+
+def run_backfill(config_manager, logger, date_from, date_to=None):
+    """
+    Fetch, store, embed and index every arXiv paper submitted in a date range
+    
+    The range is processed newest first in chunks of backfill.chunk_days
+    days. Each chunk is one pipeline run in which the categories are
+    harvested concurrently, one date-range query each, with papers saved
+    and embedded in large batches. Once a chunk's papers are stored and
+    indexed, its category-days are written to the fetch log; that is the
+    checkpoint, so rerunning an interrupted backfill resumes at the first
+    unfinished chunk, and days the daily pipeline already fetched are
+    skipped. No recommendations are made.
+    
+    Args:
+        config_manager: Application config
+        logger: Application logger
+        date_from: First date (YYYY-MM-DD)
+        date_to: Last date (YYYY-MM-DD), yesterday by default
+    """
+    from datetime import timedelta
+    from data_acquisition.backfill import BackfillProgress, plan_chunks
+    from utils.db_manager import DBManager
+    from utils.pipeline_runner import PipelineRunner
+    
+    if date_to is None:
+        date_to = (datetime.now() - timedelta(days=1)).strftime('%Y-%m-%d')
+    
+    metrics.reset()
+    metrics.logger = logger
+    db_manager = DBManager(config_manager.get_config('database.db_path', 'data/db/papers.db'))
+    arxiv_fetcher = create_arxiv_fetcher(config_manager)
+    try:
+        chunks = plan_chunks(date_from, date_to, arxiv_fetcher.categories,
+                             db_manager.get_fetched('arxiv', date_from, date_to),
+                             config_manager.get_config('backfill.chunk_days', 7))
+    except ValueError as e:
+        logger.log(f"Invalid backfill range: {e}", "ERROR")
+        db_manager.close()
+        return
+    if not chunks:
+        logger.log(f"Backfill {date_from}..{date_to} is already complete", "INFO")
+        db_manager.close()
+        return
+    
+    total_units = sum(len(days) for chunk in chunks for _category, _first, _last, days in chunk['tasks'])
+    logger.log(f"Backfilling {date_from}..{date_to}: {len(chunks)} chunks, "
+               f"{total_units} category-days to fetch", "INFO")
+    
+    page_size = config_manager.get_config('backfill.page_size', 500)
+    progress = BackfillProgress(total_units,
+                                interval=config_manager.get_config('backfill.progress_seconds', 10),
+                                report=lambda line: logger.log(line, "INFO"))
+    session = PipelineSession(config_manager)
+    status = 'error'
+    
+    try:
+        embedder = session.embedder
+        embedder.load_in_background()
+        search_index = session.get_search_index(db_manager)
+        progress.start()
+        
+        for number, chunk in enumerate(chunks, 1):
+            chunk_start = time.perf_counter()
+            # Per-day paper counts of the tasks fetched in full
+            completed = {}
+            
+            def fetch(tasks):
+                for category, first, last, days in tasks:
+                    counts = dict.fromkeys(days, 0)
+                    try:
+                        for paper in arxiv_fetcher.iter_category_range(category, first, last,
+                                                                       page_size):
+                            day = paper['published_date'][:10]
+                            counts[day] = counts.get(day, 0) + 1
+                            progress.add_papers()
+                            yield paper
+                    except Exception as e:
+                        print(f"Error fetching arXiv {category} {first}..{last}: {e}")
+                        continue
+                    completed[(category, first)] = counts
+                    progress.complete(len(days))
+            
+            indexed = len(search_index)
+            stages = build_pipeline_stages(config_manager, chunk['last'], db_manager, arxiv_fetcher,
+                                           create_deduplicator(config_manager), embedder,
+                                           session.recommender, search_index=search_index,
+                                           fetch_func=fetch, settings='backfill.pipeline')
+            runner = PipelineRunner(stages)
+            new_batch = collect_results(runner.run(chunk['tasks']), embedder.embedding_dim)
+            
+            # Papers lost to a failed stage would be skipped forever once checkpointed
+            errors = sum(stage.stats['errors'] for stage in runner.stages)
+            if errors:
+                logger.log(f"Stopping backfill: {errors} pipeline errors in chunk "
+                           f"{chunk['first']}..{chunk['last']}; rerun to resume", "ERROR")
+                return
+            
+            with metrics.span('backfill.checkpoint'):
+                if embedder.model is not None and len(new_batch):
+                    vector_index = session.get_vector_index()
+                    vector_index.add(new_batch.embeddings, new_batch.ids)
+                    vector_index.save()
+                if len(search_index) != indexed:
+                    search_index.save()
+                # Recent listings can still change, so only settled days are checkpointed
+                db_manager.mark_fetched_many('arxiv', [
+                    (category, day, count)
+                    for (category, _first), counts in completed.items()
+                    for day, count in counts.items() if arxiv_fetcher.is_settled(day)
+                ])
+            
+            metrics.record_span('backfill.chunk', time.perf_counter() - chunk_start,
+                                first=chunk['first'], last=chunk['last'], papers=len(new_batch))
+            logger.log(f"Chunk {number}/{len(chunks)} ({chunk['first']}..{chunk['last']}): "
+                       f"{len(new_batch)} new papers embedded", "INFO")
+            logger.log(progress.format(), "INFO")
+        
+        failed = total_units - progress.units
+        if failed:
+            logger.log(f"Backfill finished with {failed} category-days not fetched; "
+                       f"rerun to retry them", "WARNING")
+        else:
+            logger.log(f"Backfill {date_from}..{date_to} completed", "INFO", progress.summary())
+        status = 'ok'
+        
+    finally:
+        progress.stop()
+        session.close()
+        db_manager.close()
+        write_run_metrics(config_manager, date=f"{date_from}..{date_to}", status=status,
+                          mode='backfill')
+
+
+def build_pipeline_stages(config_manager, date, db_manager, arxiv_fetcher, deduplicator,
+                          embedder, recommender, pdf_parser=None, stored_ids=None,
+                          search_index=None, fetch_func=None, settings='pipeline',
+                          openreview_fetcher=None):
+    """
+    Build the daily pipeline stages
+    
+    The first stage takes arXiv categories and, when openreview_fetcher is
+    given, ('openreview', venue) pairs, each venue synced from its stored
+    cursor and deduplicated against the arXiv papers; the last emits
+    (paper, normalized embedding, relevance, profile) tuples. Relevance and
+    profile are None when no interest profiles are configured, since the
+    centroid fallback needs every paper. Papers already seen by the
+    deduplicator and ids in stored_ids are not processed or saved again.
+    Newly saved papers are added to search_index, if given. A venue whose
+    papers were in a batch that failed in any stage is added to
+    openreview_fetcher.failed_venues, so its cursor isn't advanced.
+    
+    fetch_func replaces the first stage's function (the backfill passes
+    one taking date-range tasks). Stage settings are read from the
+    settings config section, falling back to the pipeline section.
+    """
+    import numpy as np
+    from utils.pipeline_runner import Stage
+    from parsing.text_cleaner import TextCleaner
+    from embedding.similarity import normalize_rows
+    
+    def setting(key, default):
+        return config_manager.get_config(f'{settings}.{key}',
+                                         config_manager.get_config(f'pipeline.{key}', default))
+    
+    queue_size = setting('queue_size', 256)
+    
+    def stage(name, func, workers=1, batch_size=1):
+        return Stage(name, func,
+                     workers=setting(f'{name}.workers', workers),
+                     batch_size=setting(f'{name}.batch_size', batch_size),
+                     queue_size=setting(f'{name}.queue_size', queue_size))
+    
+    arxiv_fetcher.last_fetch_stats = {}
+    arxiv_fetcher.failed_categories = set()
+    if openreview_fetcher is not None:
+        openreview_fetcher.last_fetch_stats = {}
+        openreview_fetcher.failed_venues = set()
+    if stored_ids is None:
+        stored_ids = set()
+    
+    def fetch_venue(venue):
+        try:
+            yield from openreview_fetcher.iter_venue_papers(
+                venue, db_manager.get_sync_cursor('openreview', venue))
+        except Exception as e:
+            openreview_fetcher.failed_venues.add(venue)
+            print(f"Error fetching OpenReview {venue}: {e}")
+        stats = openreview_fetcher.last_fetch_stats.get(venue, {})
+        metrics.record_span('openreview.fetch_venue', stats.get('latency', 0.0), venue=venue,
+                            papers=stats.get('papers', 0))
+    
+    def fetch(categories):
+        for category in categories:
+            if isinstance(category, tuple):
+                _source, venue = category
+                yield from fetch_venue(venue)
+                continue
+            if db_manager.is_fetched('arxiv', category, date):
+                for paper in db_manager.get_papers_by_date(date, source='arxiv', category=category):
+                    stored_ids.add(paper['id'])
+                    yield paper
+                continue
+            
+            start_time = time.perf_counter()
+            count = 0
+            try:
+                for paper in arxiv_fetcher.iter_category_papers(category, date):
+                    count += 1
+                    yield paper
+            except Exception as e:
+                arxiv_fetcher.failed_categories.add(category)
+                print(f"Error fetching arXiv {category}: {e}")
+            latency = time.perf_counter() - start_time
+            arxiv_fetcher.last_fetch_stats[category] = {'latency': latency, 'papers': count}
+            metrics.record_span('arxiv.fetch_category', latency, category=category, papers=count)
+    
+    def store(papers):
+        # Papers from completed days come back from the database unchanged
+        fetched = [paper for paper in papers if paper['id'] not in stored_ids]
+        if fetched:
+            db_manager.save_papers(fetched)
+            stored_ids.update(paper['id'] for paper in fetched)
+            if search_index is not None:
+                search_index.add_papers(fetched)
+        return papers
+    
+    def dedup(papers):
+        return deduplicator.add_many(papers)
+    
+    cleaner = TextCleaner()
+    
+    def clean(papers):
+        # Strip LaTeX and whitespace noise so it doesn't eat into max_seq_length
+        return cleaner.clean_papers(papers)
+    
+    def parse_pdfs(papers):
+        urls = [paper['pdf_url'] for paper in papers if paper.get('pdf_url')]
+        parsed = pdf_parser.parse_pdfs(urls)
+        for paper in papers:
+            result = parsed.get(paper.get('pdf_url'), {})
+            if 'error' in result or not result:
+                continue
+            if not paper.get('abstract'):
+                paper['abstract'] = cleaner.extract_abstract(result['text'])
+            paper['introduction'] = cleaner.clean_text(result['introduction'], dehyphenate=True)
+            paper['conclusion'] = cleaner.clean_text(result['conclusion'], dehyphenate=True)
+            paper['pdf_path'] = result['pdf_path']
+        return papers
+    
+    def embed(papers):
+        _ids, embeddings = embedder.generate_paper_embeddings(papers)
+        return zip(papers, normalize_rows(embeddings))
+    
+    def track_venues(func):
+        # The papers of a failed batch are lost, so their venues must be synced again
+        def run(items):
+            try:
+                return list(func(items) or [])
+            except Exception:
+                for item in items:
+                    paper = item[0] if isinstance(item, tuple) else item
+                    if paper.get('source') == 'openreview':
+                        openreview_fetcher.failed_venues.add(paper.get('conference'))
+                raise
+        return run
+    
+    def score(items):
+        if not recommender.interest_profiles:
+            return [(paper, embedding, None, None) for paper, embedding in items]
+        components = recommender.score_relevance(np.array([embedding for _paper, embedding in items]))
+        return [(paper, embedding, float(relevance), int(profile))
+                for (paper, embedding), relevance, profile
+                in zip(items, components['relevance'], components['profile'])]
+    
+    stages = [
+        stage('fetch', fetch_func or fetch, workers=arxiv_fetcher.max_workers),
+        stage('store', store, batch_size=db_manager.batch_size),
+        stage('dedup', dedup, batch_size=64),
+        stage('clean', clean, workers=2, batch_size=64)
+    ]
+    if pdf_parser is not None:
+        stages.append(stage('pdf', parse_pdfs, batch_size=pdf_parser.max_workers))
+    stages.append(stage('embed', embed, batch_size=embedder.batch_size * 4))
+    stages.append(stage('score', score, batch_size=256))
+    if openreview_fetcher is not None:
+        for downstream in stages[1:]:
+            downstream.func = track_venues(downstream.func)
+    return stages
+
+
+def log_pipeline_report(logger, runner):
+    """Log per-stage throughput and queue depths of a pipeline run"""
+    report = runner.report()
+    for name, stats in report['stages'].items():
+        logger.log_performance(f"pipeline stage '{name}'", stats['wall_seconds'], {
+            'items_in': stats['items_in'],
+            'items_out': stats['items_out'],
+            'items_per_second': stats['items_per_second'],
+            'workers': stats['workers'],
+            'busy_seconds': stats['busy_seconds'],
+            'blocked_seconds': stats['blocked_seconds'],
+            'avg_queue_depth': stats['avg_queue_depth'],
+            'max_queue_depth': stats['max_queue_depth'],
+            'errors': stats['errors']
+        })
+    logger.log_performance("pipeline", report['wall_seconds'], {'papers': report['results']})
+
+
+def create_arxiv_fetcher(config_manager):
+    """Build an ArxivFetcher from the arxiv config section"""
+    from data_acquisition.arxiv_fetcher import ArxivFetcher
+    return ArxivFetcher(
+        categories=config_manager.get_config('arxiv.categories', ['cs.AI', 'cs.LG', 'cs.CL']),
+        max_results=config_manager.get_config('arxiv.max_results', 100),
+        base_url=config_manager.get_config('arxiv.api_url', "http://export.arxiv.org/api/query"),
+        max_workers=config_manager.get_config('arxiv.max_workers', 4),
+        requests_per_second=config_manager.get_config('arxiv.requests_per_second', 0.33),
+        burst=config_manager.get_config('arxiv.burst', 1),
+        response_cache=create_response_cache(config_manager),
+        settle_days=config_manager.get_config('arxiv.settle_days', 3)
+    )
+
+
+def create_openreview_fetcher(config_manager):
+    """Build an OpenReviewFetcher from the openreview config section"""
+    from data_acquisition.openreview_fetcher import OpenReviewFetcher
+    return OpenReviewFetcher(
+        conference_ids=config_manager.get_config('openreview.conference_ids', ['ICLR.cc/2024']),
+        api_url=config_manager.get_config('openreview.api_url', "https://api2.openreview.net/notes"),
+        invitation=config_manager.get_config('openreview.invitation',
+                                             "{venue}/Conference/-/Submission"),
+        site_url=config_manager.get_config('openreview.site_url', "https://openreview.net"),
+        page_size=config_manager.get_config('openreview.page_size', 1000),
+        max_workers=config_manager.get_config('openreview.max_workers', 4),
+        requests_per_second=config_manager.get_config('openreview.requests_per_second', 2.0),
+        burst=config_manager.get_config('openreview.burst', 2)
+    )
+
+
+def create_embedder(config_manager):
+    """Build an Embedder from the embedding config section"""
+    from embedding.embedder import Embedder
+    return Embedder(
+        model_name=config_manager.get_config('embedding.model_name', 'all-MiniLM-L6-v2'),
+        batch_size=config_manager.get_config('embedding.batch_size', 32),
+        max_seq_length=config_manager.get_config('embedding.max_seq_length', 512),
+        cache_dir=config_manager.get_config('embedding.cache_dir', 'data/embeddings'),
+        use_mock=config_manager.get_config('embedding.mock', False),
+        backend=config_manager.get_config('embedding.backend', 'torch'),
+        onnx_dir=config_manager.get_config('embedding.onnx_dir', 'data/models/onnx'),
+        quantize=config_manager.get_config('embedding.quantize', False),
+        num_threads=config_manager.get_config('embedding.num_threads', None),
+        pool_workers=config_manager.get_config('embedding.pool_workers', 0),
+        threads_per_worker=config_manager.get_config('embedding.threads_per_worker', 1)
+    )
+
+
+def create_recommender(config_manager, embedder):
+    """Build a Recommender from the analysis config section"""
+    from analysis.recommender import Recommender
+    return Recommender(
+        top_k=config_manager.get_config('analysis.top_k', 10),
+        embedder=embedder,
+        interest_profiles=config_manager.get_config('analysis.interest_profiles', {}),
+        diversity_weight=config_manager.get_config('analysis.diversity_weight', 0.3),
+        similarity_threshold=config_manager.get_config('analysis.similarity_threshold', 0.7)
+    )
+
+
+def create_vector_index(config_manager, embedding_dim):
+    """Build a VectorIndex from the database and vector_index config sections"""
+    from embedding.vector_index import VectorIndex
+    return VectorIndex(
+        index_path=config_manager.get_config('database.vector_index_path',
+                                             'data/db/vector_index.faiss'),
+        embedding_dim=embedding_dim,
+        index_type=config_manager.get_config('vector_index.index_type', 'flat'),
+        nlist=config_manager.get_config('vector_index.nlist', 1024),
+        nprobe=config_manager.get_config('vector_index.nprobe', 16),
+        hnsw_m=config_manager.get_config('vector_index.hnsw_m', 32),
+        ef_search=config_manager.get_config('vector_index.ef_search', 64)
+    )
+
+
+def open_search_index(config_manager, db_manager):
+    """Load the BM25 index from the search config section and add any unindexed papers"""
+    from analysis.bm25_index import BM25Index
+    from analysis.search_engine import sync_from_db
+    
+    search_index = BM25Index(
+        index_path=config_manager.get_config('search.bm25_path', 'data/db/bm25_index.npz'),
+        k1=config_manager.get_config('search.k1', 1.2),
+        b=config_manager.get_config('search.b', 0.75)
+    )
+    if sync_from_db(search_index, db_manager):
+        search_index.save()
+    return search_index
+
+
+def create_search_engine(config_manager, db_manager, search_index, embedder=None):
+    """Build a HybridSearchEngine from the search config section"""
+    from analysis.search_engine import HybridSearchEngine
+    
+    vector_index = None
+    if embedder is not None and config_manager.get_config('search.semantic', True):
+        vector_index = create_vector_index(config_manager, embedder.embedding_dim)
+    else:
+        embedder = None
+    remote_search = None
+    if config_manager.get_config('search.remote_fallback', True):
+        remote_search = create_arxiv_fetcher(config_manager).search_papers
+    return HybridSearchEngine(
+        db_manager, search_index, embedder=embedder, vector_index=vector_index,
+        remote_search=remote_search,
+        rrf_k=config_manager.get_config('search.rrf_k', 60),
+        candidates=config_manager.get_config('search.candidates', 100),
+        min_similarity=config_manager.get_config('search.min_similarity', 0.3),
+        min_local_hits=config_manager.get_config('search.min_local_hits', 5)
+    )
+
+
+def create_deduplicator(config_manager):
+    """Build a PaperDeduplicator from the dedup config section"""
+    from data_acquisition.deduplicator import PaperDeduplicator
+    return PaperDeduplicator(
+        num_perm=config_manager.get_config('dedup.num_perm', 64),
+        bands=config_manager.get_config('dedup.bands', 16),
+        jaccard_threshold=config_manager.get_config('dedup.jaccard_threshold', 0.7),
+        shingle_size=config_manager.get_config('dedup.shingle_size', 3)
+    )
+
+
+def create_pdf_parser(config_manager):
+    """Build a PDFParser from the pdf config section"""
+    from parsing.pdf_parser import PDFParser
+    return PDFParser(
+        cache_dir=config_manager.get_config('pdf.cache_dir', 'data/pdfs'),
+        max_pages=config_manager.get_config('pdf.max_pages', 30),
+        timeout=config_manager.get_config('pdf.timeout', 60),
+        max_workers=config_manager.get_config('pdf.max_workers', None),
+        download_workers=config_manager.get_config('pdf.download_workers', 4),
+        lazy=config_manager.get_config('pdf.lazy', True),
+        required_sections=config_manager.get_config('pdf.required_sections',
+                                                    ['abstract', 'introduction'])
+    )
+
+
+def create_response_cache(config_manager):
+    """Build the on-disk HTTP response cache, or None when disabled"""
+    if not config_manager.get_config('http_cache.enabled', True):
+        return None
+    from data_acquisition.response_cache import ResponseCache
+    return ResponseCache(
+        cache_dir=config_manager.get_config('http_cache.cache_dir', 'data/cache/http'),
+        default_ttl=config_manager.get_config('http_cache.ttl_seconds', 3600),
+        max_size_mb=config_manager.get_config('http_cache.max_size_mb', 256)
+    )
+
+
+def run_serve_mode(config_manager, logger):
+    """Run the daily pipeline for every unsettled day on the configured schedule until interrupted"""
+    import signal
+    from data_acquisition.scheduler import Scheduler
+    
+    arxiv_fetcher = create_arxiv_fetcher(config_manager)
+    # Each day's dedup state has to outlive the cycles that revisit it
+    session = PipelineSession(config_manager, keep_days=arxiv_fetcher.settle_days + 1)
+    session.embedder.load_in_background()
+    
+    def run_today():
+        # Papers announced or replaced since the last cycle can be on any unsettled day
+        for date in serve_dates(arxiv_fetcher):
+            try:
+                run_daily_pipeline(config_manager, logger, date, session=session)
+            except Exception:
+                continue  # Already logged; the other days still run
+    
+    scheduler = Scheduler()
+    for at in config_manager.get_config('scheduler.daily_times', ['08:00']):
+        scheduler.schedule_daily(run_today, at, name=f"daily pipeline at {at}")
+    interval = config_manager.get_config('scheduler.interval_minutes', 0)
+    if interval:
+        scheduler.schedule_interval(run_today, interval, name=f"pipeline every {interval} min")
+    if not scheduler.jobs:
+        logger.log("No scheduler.daily_times or scheduler.interval_minutes configured", "ERROR")
+        return
+    
+    def shutdown(signum, _frame):
+        logger.log(f"Received signal {signum}, stopping after the current run", "INFO")
+        scheduler.stop()
+    
+    signal.signal(signal.SIGINT, shutdown)
+    signal.signal(signal.SIGTERM, shutdown)
+    
+    logger.log(f"Serving {len(scheduler.jobs)} scheduled jobs, next run at {scheduler.next_run()}",
+               "INFO")
+    try:
+        scheduler.run_forever(run_on_start=config_manager.get_config('scheduler.run_on_start', True))
+    finally:
+        session.close()
+    logger.log("Scheduler stopped", "INFO")
+
+
+def serve_dates(arxiv_fetcher):
+    """
+    Dates each --serve cycle runs the pipeline for, oldest first
+    
+    Every date whose listing can still change, plus the newest settled
+    one, so each day is fetched once more and recorded as done after it
+    settles.
+    """
+    day = datetime.now()
+    dates = [day.strftime('%Y-%m-%d')]
+    while not arxiv_fetcher.is_settled(dates[-1]):
+        day -= timedelta(days=1)
+        dates.append(day.strftime('%Y-%m-%d'))
+    return dates[::-1]
+
+
+class SearchSession:
+    """Search engine opened on the first query and reused for later ones"""
+    
+    def __init__(self, config_manager):
+        self.config_manager = config_manager
+        self.embedder = None
+        if config_manager.get_config('search.semantic', True):
+            self.embedder = create_embedder(config_manager)
+        self.db_manager = None
+        self.engine = None
+    
+    def open(self):
+        """Open the database, search index and vector index"""
+        if self.engine is None:
+            from utils.db_manager import DBManager
+            self.db_manager = DBManager(self.config_manager.get_config('database.db_path',
+                                                                       'data/db/papers.db'))
+            search_index = open_search_index(self.config_manager, self.db_manager)
+            self.engine = create_search_engine(self.config_manager, self.db_manager, search_index,
+                                               self.embedder)
+        return self.engine
+    
+    def search(self, query):
+        """Papers matching query, best first"""
+        engine = self.open()
+        indexed = len(engine.bm25_index)
+        results = engine.search(query, self.config_manager.get_config('search.top_k', 10))
+        # Papers found by the remote fallback were stored and indexed
+        if len(engine.bm25_index) != indexed:
+            engine.bm25_index.save()
+        return results
+    
+    def close(self):
+        """Release the database and the embedder"""
+        if self.embedder is not None:
+            self.embedder.close()
+        if self.db_manager is not None:
+            self.db_manager.close()
+
+
+def run_search(config_manager, logger, query):
+    """Search stored papers once and print the results"""
+    logger.log(f"Searching for: {query}", "INFO")
+    
+    session = SearchSession(config_manager)
+    try:
+        session.open()
+        start = time.perf_counter()
+        results = session.search(query)
+        CLIDisplay().print_search_results(query, results, time.perf_counter() - start)
+    finally:
+        session.close()
 
 
 def run_cli_mode(config_manager, logger, date=None):
     """Run in CLI interactive mode"""
     logger.log("Starting CLI mode", "INFO")
     
+    # The model loads while the user types the first command
+    session = SearchSession(config_manager)
+    if session.embedder is not None:
+        session.embedder.load_in_background()
+    
     cli_display = CLIDisplay()
-    cli_display.run_interactive_mode()
+    try:
+        cli_display.run_interactive_mode(search=session.search)
+    finally:
+        session.close()
 
 
 if __name__ == '__main__':
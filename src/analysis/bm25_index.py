@@ -0,0 +1,241 @@
+"""
+BM25 Index for Paper Daily
+
+Inverted index over paper titles and abstracts, scored with Okapi BM25.
+Papers are added incrementally as they arrive; each term's postings are
+growable int32 arrays that numpy scores in place, so a query touches only
+the documents containing its terms.
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from array import array
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset("""
+a an and are as at be been but by can do does for from has have in into is it its
+more most no not of on or our over such than that the their then there these they
+this those to under up via was we were what when where which while who will with
+""".split())
+
+_stems: Dict[str, str] = {}
+
+
+def stem(token: str) -> str:
+    """
+    Conflate plural forms with the S-stemmer (Harman, 1991)
+
+    Only -ies, -es and -s endings are rewritten, which keeps the index
+    readable while still matching "transformers" to "transformer".
+    """
+    stemmed = _stems.get(token)
+    if stemmed is None:
+        stemmed = token
+        if len(token) > 3:
+            if token.endswith('ies') and not token.endswith(('eies', 'aies')):
+                stemmed = token[:-3] + 'y'
+            elif token.endswith('es') and not token.endswith(('aes', 'ees', 'oes')):
+                stemmed = token[:-1]
+            elif token.endswith('s') and not token.endswith(('us', 'ss')):
+                stemmed = token[:-1]
+        _stems[token] = stemmed
+    return stemmed
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split on non-alphanumerics, drop stopwords and stem"""
+    return [stem(token) for token in TOKEN_PATTERN.findall(text.lower())
+            if token not in STOPWORDS and len(token) > 1]
+
+
+class BM25Index:
+    """Incremental inverted index with BM25 scoring"""
+
+    def __init__(self, index_path: str = None, k1: float = 1.2, b: float = 0.75,
+                 title_weight: int = 2):
+        """
+        Initialize the index, loading it from disk if it exists
+
+        Args:
+            index_path: .npz file the index is saved to (None keeps it in memory)
+            k1: Term frequency saturation
+            b: Document length normalization
+            title_weight: Times title terms are counted relative to abstract terms
+        """
+        self.index_path = index_path
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+
+        self.doc_ids: List[str] = []
+        self._doc_index: Dict[str, int] = {}
+        self._doc_lengths = array('f')
+        self._postings: Dict[str, Tuple[array, array]] = {}
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+        if index_path and os.path.exists(index_path):
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._doc_index
+
+    def add(self, doc_id: str, title: str, text: str = '') -> bool:
+        """
+        Index one document
+
+        Args:
+            doc_id: Document id (papers already indexed are skipped)
+            title: Title text, weighted by title_weight
+            text: Body text (e.g., the abstract)
+
+        Returns:
+            True if the document was added
+        """
+        counts: Dict[str, int] = {}
+        for token in tokenize(title):
+            counts[token] = counts.get(token, 0) + self.title_weight
+        for token in tokenize(text):
+            counts[token] = counts.get(token, 0) + 1
+
+        with self._lock:
+            if doc_id in self._doc_index:
+                return False
+            index = len(self.doc_ids)
+            self.doc_ids.append(doc_id)
+            self._doc_index[doc_id] = index
+
+            length = sum(counts.values())
+            self._doc_lengths.append(length)
+            self._total_length += length
+
+            for token, count in counts.items():
+                postings = self._postings.get(token)
+                if postings is None:
+                    postings = self._postings[token] = (array('i'), array('i'))
+                postings[0].append(index)
+                postings[1].append(count)
+        return True
+
+    def add_papers(self, papers: Iterable[Dict]) -> int:
+        """
+        Index papers by title and abstract
+
+        Args:
+            papers: Paper dictionaries with 'id', 'title' and 'abstract'
+
+        Returns:
+            Number of papers added
+        """
+        return sum(self.add(paper['id'], paper.get('title') or '', paper.get('abstract') or '')
+                   for paper in papers if paper.get('id'))
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Find the documents scoring highest for a query
+
+        Args:
+            query: Free-text query
+            k: Number of results
+
+        Returns:
+            (doc id, BM25 score) pairs, best first; only documents matching a term
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            num_docs = len(self.doc_ids)
+            if not terms or not num_docs:
+                return []
+
+            lengths = np.frombuffer(self._doc_lengths, dtype=np.float32)
+            avg_length = self._total_length / num_docs
+            scores = np.zeros(num_docs, dtype=np.float32)
+
+            for term in terms:
+                postings = self._postings.get(term)
+                if postings is None:
+                    continue
+                docs = np.frombuffer(postings[0], dtype=np.int32)
+                tf = np.frombuffer(postings[1], dtype=np.int32).astype(np.float32)
+                idf = math.log(1 + (num_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                norm = self.k1 * (1 - self.b + self.b * lengths[docs] / avg_length)
+                # Each document appears once per term, so fancy-index += is safe
+                scores[docs] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            matched = np.flatnonzero(scores)
+            if len(matched) > k:
+                matched = matched[np.argpartition(-scores[matched], k - 1)[:k]]
+            matched = matched[np.argsort(-scores[matched], kind='stable')]
+            return [(self.doc_ids[i], float(scores[i])) for i in matched]
+
+    def save(self) -> None:
+        """Atomically write the index to index_path"""
+        if not self.index_path:
+            return
+
+        with self._lock:
+            terms = list(self._postings)
+            sizes = np.array([len(self._postings[term][0]) for term in terms], dtype=np.int64)
+            offsets = np.concatenate(([0], np.cumsum(sizes)))
+            docs = np.empty(offsets[-1], dtype=np.int32)
+            tfs = np.empty(offsets[-1], dtype=np.int32)
+            for term, start, end in zip(terms, offsets[:-1], offsets[1:]):
+                postings = self._postings[term]
+                docs[start:end] = np.frombuffer(postings[0], dtype=np.int32)
+                tfs[start:end] = np.frombuffer(postings[1], dtype=np.int32)
+            doc_lengths = np.frombuffer(self._doc_lengths, dtype=np.float32).copy()
+            doc_ids = json.dumps(self.doc_ids)
+
+        index_dir = os.path.dirname(self.index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            np.savez(f, terms=np.array(terms, dtype=str), offsets=offsets, docs=docs, tfs=tfs,
+                     doc_lengths=doc_lengths, doc_ids=np.array(doc_ids))
+        os.replace(tmp_path, self.index_path)
+
+    def load(self) -> None:
+        """Load the index from index_path"""
+        try:
+            with np.load(self.index_path) as data:
+                terms, offsets = data['terms'].tolist(), data['offsets']
+                docs, tfs = data['docs'], data['tfs']
+                doc_lengths = data['doc_lengths']
+                doc_ids = json.loads(str(data['doc_ids']))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error loading BM25 index {self.index_path}: {e}")
+            return
+
+        postings = {}
+        for term, start, end in zip(terms, offsets[:-1], offsets[1:]):
+            term_docs, term_tfs = array('i'), array('i')
+            term_docs.frombytes(docs[start:end].tobytes())
+            term_tfs.frombytes(tfs[start:end].tobytes())
+            postings[term] = (term_docs, term_tfs)
+
+        with self._lock:
+            self.doc_ids = doc_ids
+            self._doc_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+            self._doc_lengths = array('f')
+            self._doc_lengths.frombytes(doc_lengths.astype(np.float32).tobytes())
+            self._total_length = int(doc_lengths.sum())
+            self._postings = postings
+
+    def get_info(self) -> Dict:
+        """Index statistics"""
+        return {
+            'index_path': self.index_path,
+            'documents': len(self.doc_ids),
+            'terms': len(self._postings),
+            'avg_length': self._total_length / len(self.doc_ids) if self.doc_ids else 0.0
+        }
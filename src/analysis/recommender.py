@@ -1,32 +1,215 @@
-"""
-Recommender for Paper Daily
-"""
-
-import random
-from typing import List, Dict
-
-
-class Recommender:
-    """Generates paper recommendations"""
-    
-    def __init__(self, top_k: int = 10):
-        self.top_k = top_k
-        
-    def recommend_top_10(self, papers: List[Dict]) -> List[Dict]:
-        """Generate top 10 paper recommendations"""
-        if not papers:
-            return []
-        
-        # Simple scoring for warm-up
-        scored_papers = []
-        for paper in papers:
-            score = random.random()  # Mock scoring
-            paper_copy = paper.copy()
-            paper_copy['score'] = score
-            paper_copy['reasons'] = ['Mock reason']
-            scored_papers.append(paper_copy)
-        
-        # Sort by score
-        scored_papers.sort(key=lambda x: x['score'], reverse=True)
-        
-        return scored_papers[:self.top_k] 
\ No newline at end of file
+"""
+Recommender for Paper Daily
+
+Scores papers by embedding similarity to interest profiles and selects a
+diverse Top-K with maximal marginal relevance.
+"""
+
+import heapq
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from data_acquisition.paper import PaperBatch
+from embedding.similarity import cosine_similarity_matrix, normalize_rows
+from utils.metrics import metrics
+
+
+class Recommender:
+    """Generates paper recommendations"""
+
+    def __init__(self, top_k: int = 10, embedder=None,
+                 interest_profiles: Optional[Dict[str, str]] = None,
+                 diversity_weight: float = 0.3, similarity_threshold: float = 0.7,
+                 candidate_pool_factor: int = 5):
+        """
+        Initialize the recommender
+
+        Args:
+            top_k: Number of papers to recommend
+            embedder: Embedder used for papers and interest profiles
+            interest_profiles: Mapping of profile name to a description of the interest
+            diversity_weight: Weight of redundancy against relevance in MMR (0 = relevance only)
+            similarity_threshold: Similarity above which a paper duplicates an earlier pick
+            candidate_pool_factor: Candidates kept for re-ranking, as a multiple of top_k
+        """
+        self.top_k = top_k
+        self.embedder = embedder
+        self.interest_profiles = interest_profiles or {}
+        self.diversity_weight = diversity_weight
+        self.similarity_threshold = similarity_threshold
+        self.candidate_pool_factor = max(1, candidate_pool_factor)
+        self._profile_embeddings = None
+
+    def _get_profile_embeddings(self) -> Optional[np.ndarray]:
+        """
+        Embed interest profile descriptions once per recommender
+
+        Encoding errors propagate, so a failure fails the batch being scored
+        rather than leaving random profiles in place for later batches.
+        """
+        if self._profile_embeddings is None and self.interest_profiles and self.embedder:
+            texts = list(self.interest_profiles.values())
+            self._profile_embeddings = normalize_rows(
+                self.embedder.generate_embeddings_batch(texts, fallback=False))
+        return self._profile_embeddings
+
+    def score_relevance(self, embeddings: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Score papers against the interest profiles
+
+        Falls back to similarity with the batch centroid when no profiles are
+        configured, favouring papers central to the day's topics.
+
+        Args:
+            embeddings: Paper embedding matrix
+
+        Returns:
+            Dictionary with 'relevance' scores and the best matching 'profile' index
+        """
+        metrics.increment('recommender.scored', len(embeddings))
+        profile_embeddings = self._get_profile_embeddings()
+        if profile_embeddings is not None:
+            similarities = cosine_similarity_matrix(embeddings, profile_embeddings,
+                                                    normalized=True)
+            return {
+                'relevance': similarities.max(axis=1),
+                'profile': similarities.argmax(axis=1)
+            }
+
+        centroid = normalize_rows(embeddings.mean(axis=0))
+        relevance = cosine_similarity_matrix(embeddings, centroid, normalized=True)[:, 0]
+        return {'relevance': relevance, 'profile': np.full(len(embeddings), -1)}
+
+    def recommend_top_10(self, papers: Union[PaperBatch, List[Dict]],
+                         embeddings: np.ndarray = None) -> List[Dict]:
+        """
+        Generate top-k paper recommendations
+
+        Args:
+            papers: Candidate PaperBatch, or Paper records / dictionaries
+            embeddings: Paper embeddings aligned with papers (a batch's own
+                embeddings by default, computed if neither is given)
+
+        Returns:
+            Copies of the selected papers with 'score' and 'reasons' added
+        """
+        if not len(papers):
+            return []
+
+        if embeddings is None and isinstance(papers, PaperBatch):
+            embeddings = papers.embeddings
+        if embeddings is None:
+            if self.embedder is None:
+                raise ValueError("Recommender needs embeddings or an embedder")
+            _ids, embeddings = self.embedder.generate_paper_embeddings(papers)
+
+        return self.select_top_k(papers, normalize_rows(embeddings))
+
+    @metrics.timed('recommender.select_top_k')
+    def select_top_k(self, papers: Union[PaperBatch, List[Dict]], embeddings: np.ndarray = None,
+                     components: Optional[Dict[str, np.ndarray]] = None) -> List[Dict]:
+        """
+        Select the top-k papers from already embedded candidates
+
+        Lets a streaming pipeline score relevance batch by batch and only run
+        the final selection once every candidate has arrived. Only the
+        selected records are copied.
+
+        Args:
+            papers: Candidate PaperBatch, or Paper records / dictionaries
+            embeddings: Normalized paper embeddings aligned with papers (a
+                batch's own embeddings by default)
+            components: Output of score_relevance() for these papers (a batch's
+                'relevance' and 'profile' columns by default, computed if absent)
+
+        Returns:
+            Copies of the selected papers with 'score' and 'reasons' added
+        """
+        if not len(papers):
+            return []
+
+        if isinstance(papers, PaperBatch):
+            if embeddings is None:
+                embeddings = papers.embeddings
+            if components is None and {'relevance', 'profile'} <= set(papers.columns):
+                components = {name: papers[name] for name in ('relevance', 'profile')}
+            papers = papers.papers
+
+        if components is None:
+            components = self.score_relevance(embeddings)
+        relevance = components['relevance']
+
+        # Partial top-k keeps the cost near-linear in the number of papers
+        pool_size = self.top_k * self.candidate_pool_factor
+        pool = heapq.nlargest(pool_size, range(len(papers)), key=relevance.__getitem__)
+
+        selected = self._select_mmr(pool, relevance, embeddings)
+
+        recommendations = []
+        for index, mmr_score, redundancy in selected:
+            recommendation = papers[index].copy()
+            recommendation['score'] = mmr_score
+            recommendation['relevance'] = float(relevance[index])
+            recommendation['reasons'] = self._build_reasons(
+                papers[index], float(relevance[index]), int(components['profile'][index]),
+                redundancy
+            )
+            recommendations.append(recommendation)
+
+        return recommendations
+
+    @metrics.timed('recommender.mmr')
+    def _select_mmr(self, pool: List[int], relevance: np.ndarray, embeddings: np.ndarray) -> List:
+        """
+        Greedy maximal marginal relevance selection over the candidate pool
+
+        Returns:
+            List of (paper index, MMR score, max similarity to earlier picks)
+        """
+        pool = np.array(pool)
+        pool_relevance = relevance[pool]
+        pool_similarity = cosine_similarity_matrix(embeddings[pool], normalized=True)
+
+        # Highest similarity of each candidate to anything already selected
+        redundancy = np.zeros(len(pool), dtype=np.float32)
+        available = np.ones(len(pool), dtype=bool)
+        weight = self.diversity_weight
+        selected = []
+
+        while len(selected) < self.top_k and available.any():
+            mmr = (1 - weight) * pool_relevance - weight * redundancy
+            mmr[~available] = -np.inf
+            best = int(np.argmax(mmr))
+
+            selected.append((int(pool[best]), float(mmr[best]), float(redundancy[best])))
+            available[best] = False
+            redundancy = np.maximum(redundancy, pool_similarity[best])
+
+            # Near-duplicates of a pick are never recommended alongside it
+            available &= redundancy < self.similarity_threshold
+
+        return selected
+
+    def _build_reasons(self, paper: Dict, relevance: float, profile: int,
+                       redundancy: float) -> List[str]:
+        """Explain a recommendation from its score components"""
+        reasons = []
+
+        if profile >= 0:
+            profile_name = list(self.interest_profiles)[profile]
+            reasons.append(f"Matches interest '{profile_name}' ({relevance:.2f})")
+        else:
+            reasons.append(f"Central to today's topics ({relevance:.2f})")
+
+        if redundancy == 0:
+            reasons.append("Top relevance pick")
+        elif redundancy < self.similarity_threshold / 2:
+            reasons.append(f"Adds a distinct topic (max overlap {redundancy:.2f})")
+        else:
+            reasons.append(f"Related to other picks (max overlap {redundancy:.2f})")
+
+        if paper.get('primary_category'):
+            reasons.append(f"Category: {paper['primary_category']}")
+
+        return reasons
@@ -0,0 +1,141 @@
+"""
+Search Engine for Paper Daily
+
+Searches stored papers locally by combining BM25 keyword ranking with
+embedding similarity, fused by reciprocal rank. The remote arXiv search is
+only queried when the local archive has too few matches.
+"""
+
+import time
+from typing import Callable, Dict, List, Optional
+
+from data_acquisition.deduplicator import normalize_paper_id
+from embedding.similarity import normalize_rows
+from utils.metrics import metrics
+
+from .bm25_index import BM25Index
+
+
+def sync_from_db(index: BM25Index, db_manager) -> int:
+    """
+    Index stored papers the BM25 index doesn't have yet
+
+    Args:
+        index: BM25 index
+        db_manager: Database holding the papers
+
+    Returns:
+        Number of papers added
+    """
+    missing = [paper_id for paper_id in db_manager.get_paper_ids() if paper_id not in index]
+    added = 0
+    chunk_size = 5000
+    for i in range(0, len(missing), chunk_size):
+        added += index.add_papers(db_manager.get_papers(missing[i:i + chunk_size]))
+    return added
+
+
+class HybridSearchEngine:
+    """Keyword + semantic search over the local paper archive"""
+
+    def __init__(self, db_manager, bm25_index: BM25Index, embedder=None, vector_index=None,
+                 remote_search: Optional[Callable[[str, int], List[Dict]]] = None,
+                 rrf_k: int = 60, candidates: int = 100, min_similarity: float = 0.3,
+                 min_local_hits: int = 5):
+        """
+        Initialize the search engine
+
+        Args:
+            db_manager: Database the papers are loaded from
+            bm25_index: Keyword index over stored papers
+            embedder: Embedder for query vectors (None disables semantic search)
+            vector_index: VectorIndex over stored paper embeddings
+            remote_search: Fallback search, called as remote_search(query, max_results)
+            rrf_k: Reciprocal rank fusion constant
+            candidates: Hits taken from each ranking before fusion
+            min_similarity: Lowest cosine similarity counted as a semantic hit
+            min_local_hits: Query remote_search when fewer local results are found
+        """
+        self.db_manager = db_manager
+        self.bm25_index = bm25_index
+        self.embedder = embedder
+        self.vector_index = vector_index
+        self.remote_search = remote_search
+        self.rrf_k = rrf_k
+        self.candidates = candidates
+        self.min_similarity = min_similarity
+        self.min_local_hits = min_local_hits
+
+    def keyword_hits(self, query: str) -> List[str]:
+        """Paper ids ranked by BM25"""
+        return [paper_id for paper_id, _score in self.bm25_index.search(query, self.candidates)]
+
+    def semantic_hits(self, query: str) -> Dict[str, float]:
+        """Paper ids mapped to cosine similarity, most similar first"""
+        if (self.embedder is None or self.vector_index is None or not len(self.vector_index)
+                or self.embedder.model is None):
+            return {}
+
+        query_embedding = normalize_rows(self.embedder.generate_embedding(query))
+        scores, ids = self.vector_index.search(query_embedding, self.candidates)
+        return {paper_id: float(score) for paper_id, score in zip(ids[0], scores[0])
+                if score >= self.min_similarity}
+
+    def search(self, query: str, k: int = 10) -> List[Dict]:
+        """
+        Search papers
+
+        Each ranking contributes 1 / (rrf_k + rank) to a paper's score, so
+        papers found by both keyword and semantic search rise to the top
+        without having to calibrate BM25 scores against cosine similarities.
+
+        Args:
+            query: Free-text query
+            k: Number of results
+
+        Returns:
+            Paper dictionaries with 'score' and 'reasons', best first
+        """
+        start = time.perf_counter()
+        keyword = self.keyword_hits(query)
+        semantic = self.semantic_hits(query)
+
+        fused: Dict[str, float] = {}
+        reasons: Dict[str, List[str]] = {}
+        for rank, paper_id in enumerate(keyword, 1):
+            fused[paper_id] = fused.get(paper_id, 0.0) + 1.0 / (self.rrf_k + rank)
+            reasons.setdefault(paper_id, []).append(f"keyword rank {rank}")
+        for rank, (paper_id, similarity) in enumerate(semantic.items(), 1):
+            fused[paper_id] = fused.get(paper_id, 0.0) + 1.0 / (self.rrf_k + rank)
+            reasons.setdefault(paper_id, []).append(f"semantic rank {rank} ({similarity:.2f})")
+
+        ranked = sorted(fused, key=fused.get, reverse=True)[:k]
+        results = self.db_manager.get_papers(ranked)
+        for paper in results:
+            paper['score'] = fused[paper['id']]
+            paper['reasons'] = reasons[paper['id']]
+
+        remote = 0
+        if len(results) < min(k, self.min_local_hits) and self.remote_search is not None:
+            remote = self._add_remote_results(query, results, k)
+
+        metrics.record_span('search.query', time.perf_counter() - start, keyword=len(keyword),
+                            semantic=len(semantic), results=len(results), remote=remote)
+        return results
+
+    def _add_remote_results(self, query: str, results: List[Dict], k: int) -> int:
+        """Fill results up to k from the remote search, storing and indexing new papers"""
+        seen = {normalize_paper_id(paper['id']) for paper in results}
+        papers = [paper for paper in self.remote_search(query, k)
+                  if paper and normalize_paper_id(paper['id']) not in seen]
+        papers = papers[:k - len(results)]
+        if not papers:
+            return 0
+
+        self.db_manager.save_papers(papers)
+        self.bm25_index.add_papers(papers)
+        for rank, paper in enumerate(papers, 1):
+            paper['score'] = 0.0
+            paper['reasons'] = [f"arXiv search rank {rank}"]
+        results.extend(papers)
+        return len(papers)
@@ -7,102 +7,360 @@ Fetches latest AI papers from arXiv using its API.
 import requests
 import feedparser
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import Dict, Iterator, List, Optional
 from urllib.parse import urlencode
 
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import metrics
+
+from .atom_parser import LXML_AVAILABLE, AtomParseError, iter_atom_papers, published_day
+from .deduplicator import normalize_paper_id
+from .paper import Paper, PaperBatch
+from .rate_limiter import TokenBucketRateLimiter
+from .response_cache import ResponseCache
+
 
 class ArxivFetcher:
     """Fetches papers from arXiv API"""
     
-    def __init__(self, categories: List[str] = None):
+    def __init__(self, categories: List[str] = None, max_results: int = 100,
+                 base_url: str = "http://export.arxiv.org/api/query",
+                 max_workers: int = 4, requests_per_second: float = 0.33,
+                 burst: int = 1, response_cache: Optional[ResponseCache] = None,
+                 settle_days: int = 3):
         """
         Initialize the arXiv fetcher
         
         Args:
             categories: List of arXiv categories to search (e.g., ['cs.AI', 'cs.LG'])
+            max_results: Default maximum number of results per category
+            base_url: arXiv API query endpoint
+            max_workers: Number of categories fetched concurrently (1 = serial)
+            requests_per_second: Global request rate shared by all workers (arXiv's
+                terms of use allow one request every 3 seconds)
+            burst: Number of requests allowed back-to-back before throttling
+            response_cache: Optional on-disk cache for API responses
+            settle_days: Days after which a day's listing is treated as final;
+                late announcements and replacements can change it until then
         """
         self.categories = categories or ['cs.AI', 'cs.LG', 'cs.CL']
-        self.base_url = "http://export.arxiv.org/api/query"
-        self.max_results = 100
+        self.base_url = base_url
+        self.max_results = max_results
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = TokenBucketRateLimiter(requests_per_second, burst)
+        self.session = self._create_session()
+        self.response_cache = response_cache
+        self.settle_days = max(1, settle_days)
+        self.last_fetch_stats: Dict[str, Dict] = {}
+        self.failed_categories = set()
+    
+    def is_settled(self, date: str) -> bool:
+        """
+        Whether a day's listing is old enough that it will no longer change
+        
+        Args:
+            date: Date in YYYY-MM-DD format
+            
+        Returns:
+            True if the date is at least settle_days before today
+        """
+        return date <= (datetime.now() - timedelta(days=self.settle_days)).strftime('%Y-%m-%d')
+        
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session sized for the worker count"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers,
+                              pool_maxsize=self.max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _get(self, url: str, ttl: float = None) -> bytes:
+        """
+        Issue a rate-limited GET through the shared session
         
-    def fetch_papers(self, date: str = None, max_results: int = None) -> List[Dict]:
+        Fresh cached responses are returned without touching the network;
+        stale ones are revalidated with ETag/Last-Modified when available.
+        
+        Args:
+            url: Request URL
+            ttl: Cache lifetime in seconds (None = cache default, negative = forever)
+            
+        Returns:
+            Response body
+        """
+        cached = self.response_cache.get(url) if self.response_cache else None
+        if cached and cached['fresh']:
+            metrics.increment('arxiv.cache_hits')
+            return cached['content']
+        
+        headers = {}
+        if cached:
+            if cached['etag']:
+                headers['If-None-Match'] = cached['etag']
+            if cached['last_modified']:
+                headers['If-Modified-Since'] = cached['last_modified']
+        
+        metrics.observe('arxiv.rate_limit_wait', self.rate_limiter.acquire())
+        with metrics.span('arxiv.request'):
+            response = self.session.get(url, headers=headers, timeout=30)
+        metrics.increment('arxiv.requests')
+        
+        if cached and response.status_code == 304:
+            metrics.increment('arxiv.revalidated')
+            self.response_cache.refresh(url, ttl)
+            return cached['content']
+        
+        response.raise_for_status()
+        metrics.observe('arxiv.response_bytes', len(response.content))
+        if self.response_cache:
+            self.response_cache.put(url, response.content,
+                                    etag=response.headers.get('ETag'),
+                                    last_modified=response.headers.get('Last-Modified'),
+                                    ttl=ttl)
+        return response.content
+        
+    def fetch_papers(self, date: str = None, max_results: int = None,
+                     categories: List[str] = None) -> List[Paper]:
         """
         Fetch papers from arXiv for a specific date
         
         Args:
             date: Date in YYYY-MM-DD format (defaults to today)
-            max_results: Maximum number of results to fetch
-            
+            max_results: Number of entries requested per API page
+            categories: Subset of categories to fetch (defaults to all configured)
+        
         Returns:
-            List of paper dictionaries with metadata
+            List of Paper records with metadata
         """
         if date is None:
             date = datetime.now().strftime('%Y-%m-%d')
-            
+        
         if max_results is None:
             max_results = self.max_results
-            
-        papers = []
         
-        for category in self.categories:
-            try:
-                category_papers = self._fetch_category_papers(category, date, max_results)
-                papers.extend(category_papers)
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                print(f"Error fetching papers for category {category}: {e}")
-                continue
+        if categories is None:
+            categories = self.categories
+        
+        papers_by_category: Dict[str, List[Paper]] = {}
+        self.last_fetch_stats = {}
+        self.failed_categories = set()
+        if not categories:
+            return []
+        start_time = time.perf_counter()
+        
+        workers = min(self.max_workers, len(categories))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self._timed_fetch_category, category, date, max_results): category
+                for category in categories
+            }
+            for future in as_completed(futures):
+                category = futures[future]
+                try:
+                    papers_by_category[category] = future.result()
+                except Exception as e:
+                    self.failed_categories.add(category)
+                    print(f"Error fetching papers for category {category}: {e}")
+        
+        total_time = time.perf_counter() - start_time
+        metrics.observe('arxiv.fetch_papers.seconds', total_time)
+        self._report_fetch_stats(total_time)
+        
+        # Keep configured category order so duplicates resolve deterministically
+        papers = []
+        for category in categories:
+            papers.extend(papers_by_category.get(category, []))
         
         # Remove duplicates based on arXiv ID
         unique_papers = self._remove_duplicates(papers)
         
         return unique_papers
     
-    def _fetch_category_papers(self, category: str, date: str, max_results: int) -> List[Dict]:
-        """Fetch papers for a specific category"""
+    def fetch_batch(self, date: str = None, categories: List[str] = None) -> PaperBatch:
+        """
+        Fetch papers from arXiv for a specific date as a columnar batch
         
-        # Build search query
-        query_params = {
-            'search_query': f'cat:{category}',
-            'start': 0,
-            'max_results': max_results,
-            'sortBy': 'submittedDate',
-            'sortOrder': 'descending'
-        }
+        Args:
+            date: Date in YYYY-MM-DD format (defaults to today)
+            categories: Subset of categories to fetch (defaults to all configured)
         
-        url = f"{self.base_url}?{urlencode(query_params)}"
+        Returns:
+            PaperBatch of the unique papers
+        """
+        return PaperBatch(self.fetch_papers(date, categories=categories))
+    
+    def _timed_fetch_category(self, category: str, date: str, max_results: int) -> List[Paper]:
+        """Fetch a category and record its latency in last_fetch_stats"""
+        start_time = time.perf_counter()
+        papers = self._fetch_category_papers(category, date, max_results)
+        self.last_fetch_stats[category] = {
+            'latency': time.perf_counter() - start_time,
+            'papers': len(papers)
+        }
+        return papers
+    
+    def _report_fetch_stats(self, total_time: float) -> None:
+        """Print per-category latency against total wall time"""
+        serial_time = sum(stats['latency'] for stats in self.last_fetch_stats.values())
+        for category, stats in self.last_fetch_stats.items():
+            print(f"arXiv {category}: {stats['papers']} papers in {stats['latency']:.2f}s")
+        print(f"arXiv fetch: {total_time:.2f}s wall time "
+              f"({serial_time:.2f}s summed category latency, {self.max_workers} workers)")
+    
+    def _fetch_category_papers(self, category: str, date: str, max_results: int) -> List[Paper]:
+        """Fetch all papers for a specific category, keeping partial results on error"""
+        papers = []
         
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            # Parse the Atom feed
-            feed = feedparser.parse(response.content)
-            
-            papers = []
-            target_date = datetime.strptime(date, '%Y-%m-%d').date()
-            
-            for entry in feed.entries:
-                # Parse submission date
-                submitted_date = datetime.strptime(entry.published, '%Y-%m-%dT%H:%M:%SZ').date()
+            for paper in self.iter_category_papers(category, date, max_results):
+                papers.append(paper)
                 
-                # Filter by date (papers from the target date)
-                if submitted_date == target_date:
-                    paper = self._parse_paper_entry(entry, category)
-                    papers.append(paper)
-            
-            return papers
-            
         except requests.RequestException as e:
+            self.failed_categories.add(category)
             print(f"Network error fetching arXiv papers: {e}")
-            return []
         except Exception as e:
+            self.failed_categories.add(category)
             print(f"Error parsing arXiv response: {e}")
-            return []
+        
+        return papers
     
-    def _parse_paper_entry(self, entry, category: str) -> Dict:
+    def iter_category_papers(self, category: str, date: str,
+                             page_size: int = None) -> Iterator[Paper]:
+        """
+        Lazily harvest papers submitted on a date, one API page at a time
+        
+        Pages are requested newest first and parsed as they arrive; harvesting
+        stops as soon as an entry older than the target date is seen, so busy
+        days are complete and back-dated runs don't over-fetch.
+        
+        Args:
+            category: arXiv category to harvest (e.g., 'cs.LG')
+            date: Date in YYYY-MM-DD format
+            page_size: Number of entries requested per page
+            
+        Yields:
+            Paper records for the target date
+        """
+        yield from self.iter_category_range(category, date, date, page_size)
+    
+    def iter_category_range(self, category: str, first_date: str, last_date: str,
+                            page_size: int = None) -> Iterator[Paper]:
+        """
+        Lazily harvest papers submitted between two dates, newest first
+        
+        One query covers the whole range, so a multi-day backfill fills
+        every page instead of paying a partial last page per day.
+        
+        Args:
+            category: arXiv category to harvest (e.g., 'cs.LG')
+            first_date: First date in YYYY-MM-DD format
+            last_date: Last date in YYYY-MM-DD format (inclusive)
+            page_size: Number of entries requested per page
+            
+        Yields:
+            Paper records submitted within the range
+        """
+        if page_size is None:
+            page_size = self.max_results
+            
+        first_day = datetime.strptime(first_date, '%Y-%m-%d').date()
+        last_day = datetime.strptime(last_date, '%Y-%m-%d').date()
+        start = 0
+        
+        # Settled listings no longer change, so cache them indefinitely; recent
+        # ones get the normal lifetime and are revalidated once stale
+        ttl = -1 if self.is_settled(last_date) else None
+        
+        while True:
+            url = self._build_category_query_url(category, first_day, start, page_size, last_day)
+            content = self._get(url, ttl)
+            
+            # Entries are parsed as they are consumed; only parser time is recorded
+            feed_info = {}
+            papers = self._iter_feed_papers(content, category, feed_info)
+            entries = 0
+            parse_seconds = 0.0
+            try:
+                while True:
+                    parse_start = time.perf_counter()
+                    paper = next(papers, None)
+                    parse_seconds += time.perf_counter() - parse_start
+                    if paper is None:
+                        break
+                    entries += 1
+                    
+                    submitted_date = published_day(paper.published_date)
+                    if submitted_date > last_day:
+                        continue
+                    if submitted_date < first_day:
+                        return
+                    
+                    metrics.increment('arxiv.papers')
+                    yield paper
+            finally:
+                metrics.record_span('arxiv.parse_page', parse_seconds, category=category)
+            
+            if not entries:
+                return
+            start += entries
+            total_results = feed_info.get('total_results', 0)
+            if entries < page_size or (total_results and start >= total_results):
+                return
+    
+    def _iter_feed_papers(self, content: bytes, category: str,
+                          feed_info: Optional[Dict] = None) -> Iterator[Paper]:
+        """
+        Parse an API response into papers, in document order
+        
+        Streams with lxml when it is installed. Documents lxml rejects are
+        re-read with feedparser, continuing after the entries already
+        yielded.
+        
+        Args:
+            content: Atom document
+            category: Primary category to record on each paper
+            feed_info: Filled with 'total_results' from the feed header, if given
+            
+        Yields:
+            Paper records
+        """
+        parsed = 0
+        if LXML_AVAILABLE:
+            try:
+                for paper in iter_atom_papers(content, category, feed_info):
+                    parsed += 1
+                    yield paper
+                return
+            except AtomParseError as e:
+                metrics.increment('arxiv.parse_fallbacks')
+                print(f"Malformed arXiv response, parsing with feedparser after {parsed} entries: {e}")
+        
+        feed = feedparser.parse(content)
+        if feed_info is not None:
+            feed_info['total_results'] = int(feed.feed.get('opensearch_totalresults', 0) or 0)
+        for entry in feed.entries[parsed:]:
+            yield self._parse_paper_entry(entry, category)
+    
+    def _build_category_query_url(self, category: str, target_date, start: int,
+                                  page_size: int, last_date=None) -> str:
+        """Build a query URL restricted to one day of submissions, or target_date..last_date"""
+        first_day = target_date.strftime('%Y%m%d')
+        last_day = (last_date or target_date).strftime('%Y%m%d')
+        query_params = {
+            'search_query': f'cat:{category} AND submittedDate:[{first_day}0000 TO {last_day}2359]',
+            'start': start,
+            'max_results': page_size,
+            'sortBy': 'submittedDate',
+            'sortOrder': 'descending'
+        }
+        
+        return f"{self.base_url}?{urlencode(query_params)}"
+    
+    def _parse_paper_entry(self, entry, category: str) -> Paper:
         """Parse a single paper entry from arXiv feed"""
         
         # Extract arXiv ID
@@ -128,35 +386,36 @@ class ArxivFetcher:
         if hasattr(entry, 'tags'):
             categories = [tag.term for tag in entry.tags]
         
-        paper = {
-            'id': arxiv_id,
-            'title': entry.title,
-            'authors': authors,
-            'abstract': entry.summary,
-            'published_date': entry.published,
-            'updated_date': entry.updated if hasattr(entry, 'updated') else entry.published,
-            'categories': categories,
-            'primary_category': category,
-            'pdf_url': pdf_url,
-            'arxiv_url': entry.link,
-            'source': 'arxiv'
-        }
+        paper = Paper(
+            id=arxiv_id,
+            title=entry.title,
+            authors=authors,
+            abstract=entry.summary,
+            published_date=entry.published,
+            updated_date=entry.updated if hasattr(entry, 'updated') else entry.published,
+            categories=categories,
+            primary_category=category,
+            pdf_url=pdf_url,
+            arxiv_url=entry.link,
+            source='arxiv'
+        )
         
         return paper
     
-    def _remove_duplicates(self, papers: List[Dict]) -> List[Dict]:
-        """Remove duplicate papers based on arXiv ID"""
+    def _remove_duplicates(self, papers: List[Paper]) -> List[Paper]:
+        """Remove duplicate papers based on version-less arXiv ID"""
         seen_ids = set()
         unique_papers = []
         
         for paper in papers:
-            if paper['id'] not in seen_ids:
-                seen_ids.add(paper['id'])
+            paper_id = normalize_paper_id(paper['id'])
+            if paper_id not in seen_ids:
+                seen_ids.add(paper_id)
                 unique_papers.append(paper)
         
         return unique_papers
     
-    def search_papers(self, query: str, max_results: int = 50) -> List[Dict]:
+    def search_papers(self, query: str, max_results: int = 50) -> List[Paper]:
         """
         Search papers by query string
         
@@ -167,6 +426,10 @@ class ArxivFetcher:
         Returns:
             List of matching papers
         """
+        # Plain keywords are ANDed across all fields; field queries pass through
+        if ':' not in query:
+            query = ' AND '.join(f'all:{term}' for term in query.split())
+        
         query_params = {
             'search_query': query,
             'start': 0,
@@ -178,17 +441,15 @@ class ArxivFetcher:
         url = f"{self.base_url}?{urlencode(query_params)}"
         
         try:
-            response = requests.get(url, timeout=30)
-            response.raise_for_status()
-            
-            feed = feedparser.parse(response.content)
+            content = self._get(url)
             
             papers = []
-            for entry in feed.entries:
-                paper = self._parse_paper_entry(entry, 'search')
+            for paper in self._iter_feed_papers(content, 'search'):
+                if paper and paper['categories']:
+                    paper['primary_category'] = paper['categories'][0]
                 papers.append(paper)
             
-            return papers
+            return self._remove_duplicates([paper for paper in papers if paper])
             
         except Exception as e:
             print(f"Error searching arXiv papers: {e}")
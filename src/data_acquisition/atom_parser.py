@@ -0,0 +1,157 @@
+"""
+Atom Parser for Paper Daily
+
+Streams the entries of an arXiv API response with lxml's iterparse and
+builds Paper records from just the elements the fetcher uses. Each entry
+is cleared once read, so memory stays flat however large the page is.
+ArxivFetcher falls back to feedparser for documents lxml rejects and on
+hosts without lxml.
+"""
+
+import io
+from datetime import date
+from typing import Dict, Iterator, Optional
+
+from utils.lazy_import import import_optional, is_available
+
+from .paper import Paper
+
+LXML_AVAILABLE = is_available('lxml')
+
+ATOM = '{http://www.w3.org/2005/Atom}'
+OPENSEARCH = '{http://a9.com/-/spec/opensearch/1.1/}'
+ENTRY = ATOM + 'entry'
+ID = ATOM + 'id'
+TITLE = ATOM + 'title'
+SUMMARY = ATOM + 'summary'
+PUBLISHED = ATOM + 'published'
+UPDATED = ATOM + 'updated'
+AUTHOR = ATOM + 'author'
+NAME = ATOM + 'name'
+LINK = ATOM + 'link'
+CATEGORY = ATOM + 'category'
+TOTAL_RESULTS = OPENSEARCH + 'totalResults'
+
+
+class AtomParseError(Exception):
+    """The document is not well-formed XML"""
+
+
+def published_day(published: str) -> date:
+    """
+    Date part of an Atom timestamp
+
+    Args:
+        published: Timestamp such as '2024-10-15T17:59:59Z'
+
+    Returns:
+        The date (2024-10-15)
+    """
+    try:
+        return date(int(published[:4]), int(published[5:7]), int(published[8:10]))
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid Atom timestamp: {published!r}") from None
+
+
+def _text(element) -> str:
+    return (element.text or '').strip()
+
+
+def entry_to_paper(entry, category: str) -> Paper:
+    """
+    Build a Paper from an <entry> element in one pass over its children
+
+    Matches ArxivFetcher._parse_paper_entry on feedparser output: text is
+    stripped, the first alternate link is the arXiv URL and the first PDF
+    link the PDF URL.
+
+    Args:
+        entry: lxml <entry> element
+        category: Primary category to record
+
+    Returns:
+        The paper
+    """
+    entry_id = title = abstract = published = updated = arxiv_url = pdf_url = None
+    authors, categories = [], []
+
+    for child in entry:
+        tag = child.tag
+        if tag == AUTHOR:
+            name = child.findtext(NAME)
+            if name:
+                authors.append(name.strip())
+        elif tag == CATEGORY:
+            term = child.get('term')
+            if term:
+                categories.append(term)
+        elif tag == LINK:
+            if child.get('type') == 'application/pdf':
+                pdf_url = pdf_url or child.get('href')
+            elif arxiv_url is None and child.get('rel', 'alternate') == 'alternate':
+                arxiv_url = child.get('href')
+        elif tag == ID:
+            entry_id = _text(child)
+        elif tag == TITLE:
+            title = _text(child)
+        elif tag == SUMMARY:
+            abstract = _text(child)
+        elif tag == PUBLISHED:
+            published = _text(child)
+        elif tag == UPDATED:
+            updated = _text(child)
+
+    return Paper(
+        id=(entry_id or '').split('/')[-1],
+        title=title or '',
+        authors=authors,
+        abstract=abstract or '',
+        published_date=published,
+        updated_date=updated or published,
+        categories=categories,
+        primary_category=category,
+        pdf_url=pdf_url,
+        arxiv_url=arxiv_url,
+        source='arxiv'
+    )
+
+
+def iter_atom_papers(content: bytes, category: str,
+                     feed_info: Optional[Dict] = None) -> Iterator[Paper]:
+    """
+    Stream the papers of an arXiv API response in document order
+
+    Args:
+        content: Atom document
+        category: Primary category to record on each paper
+        feed_info: Filled with 'total_results' from the feed header, if given
+
+    Yields:
+        Paper records
+
+    Raises:
+        AtomParseError: The document is malformed (papers before the error
+            have already been yielded)
+    """
+    etree = import_optional('lxml.etree')
+    if etree is None:
+        raise ImportError("Streaming Atom parsing needs lxml")
+
+    events = etree.iterparse(io.BytesIO(content), events=('end',), tag=(ENTRY, TOTAL_RESULTS),
+                             resolve_entities=False, no_network=True, huge_tree=True)
+    try:
+        for _event, element in events:
+            if element.tag == TOTAL_RESULTS:
+                if feed_info is not None:
+                    feed_info['total_results'] = int(_text(element) or 0)
+                continue
+
+            paper = entry_to_paper(element, category)
+            element.clear(keep_tail=False)
+            # Earlier siblings (the feed header and past entries) are no longer needed
+            parent = element.getparent()
+            while element.getprevious() is not None:
+                del parent[0]
+            yield paper
+    except etree.XMLSyntaxError as e:
+        raise AtomParseError(str(e)) from e
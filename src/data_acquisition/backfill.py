@@ -0,0 +1,173 @@
+"""
+Backfill Planning for Paper Daily
+
+Splits a historical date range into chunks of consecutive days for
+`main.py --from/--to`. Category-days the fetch log records as complete are
+left out, so a backfill interrupted part way resumes at the first
+unfinished chunk. BackfillProgress reports throughput and an ETA while
+the chunks are processed.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+def date_range(date_from: str, date_to: str) -> List[str]:
+    """
+    Every date from date_from to date_to
+
+    Args:
+        date_from: First date in YYYY-MM-DD format
+        date_to: Last date in YYYY-MM-DD format (inclusive)
+
+    Returns:
+        Dates in YYYY-MM-DD format, oldest first
+
+    Raises:
+        ValueError: A date is malformed or the range is reversed
+    """
+    first = datetime.strptime(date_from, '%Y-%m-%d').date()
+    last = datetime.strptime(date_to, '%Y-%m-%d').date()
+    if first > last:
+        raise ValueError(f"Backfill range ends ({date_to}) before it starts ({date_from})")
+    return [(first + timedelta(days=offset)).isoformat() for offset in range((last - first).days + 1)]
+
+
+def _runs(days: List[str]) -> List[List[str]]:
+    """Split sorted dates into runs of consecutive days"""
+    runs: List[List[str]] = []
+    previous = None
+    for day in days:
+        current = datetime.strptime(day, '%Y-%m-%d').date()
+        if previous is not None and current - previous == timedelta(days=1):
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+        previous = current
+    return runs
+
+
+def plan_chunks(date_from: str, date_to: str, categories: Iterable[str],
+                fetched: Set[Tuple[str, str]], chunk_days: int = 7) -> List[Dict]:
+    """
+    Chunks of a backfill that still need fetching, newest first
+
+    Each chunk has one fetch task per category and run of consecutive
+    unfetched days, so a chunk whose days were all fetched before is
+    dropped and a partly fetched one only requests what is missing.
+
+    Args:
+        date_from: First date in YYYY-MM-DD format
+        date_to: Last date in YYYY-MM-DD format (inclusive)
+        categories: Categories to fetch
+        fetched: (category, date) pairs already fetched
+        chunk_days: Days per chunk
+
+    Returns:
+        Chunk dictionaries with 'first', 'last' and 'tasks', a list of
+        (category, first date, last date, dates) tuples
+    """
+    days = date_range(date_from, date_to)
+    chunk_days = max(1, chunk_days)
+    chunks = []
+
+    # Newest first, so the part of the archive most likely to be searched lands first
+    for end in range(len(days), 0, -chunk_days):
+        chunk = days[max(0, end - chunk_days):end]
+        tasks = []
+        for category in categories:
+            pending = [day for day in chunk if (category, day) not in fetched]
+            for run in _runs(pending):
+                tasks.append((category, run[0], run[-1], run))
+        if tasks:
+            chunks.append({'first': chunk[0], 'last': chunk[-1], 'tasks': tasks})
+    return chunks
+
+
+class BackfillProgress:
+    """Papers fetched and category-days completed, reported with rate and ETA"""
+
+    def __init__(self, total_units: int, interval: float = 10.0,
+                 report: Optional[Callable[[str], None]] = None):
+        """
+        Initialize progress tracking
+
+        Args:
+            total_units: Category-days the backfill will fetch
+            interval: Seconds between periodic reports (0 disables them)
+            report: Called with each progress line (print by default)
+        """
+        self.total_units = total_units
+        self.interval = interval
+        self.report = report or print
+        self.papers = 0
+        self.units = 0
+        self.start_time = time.perf_counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_papers(self, count: int = 1) -> None:
+        """Count fetched papers"""
+        with self._lock:
+            self.papers += count
+
+    def complete(self, units: int) -> None:
+        """Count category-days fetched in full"""
+        with self._lock:
+            self.units += units
+
+    def summary(self) -> Dict:
+        """
+        Current totals
+
+        Returns:
+            Dictionary with papers, completed and total units, elapsed seconds,
+            papers per second and the estimated seconds remaining (None until
+            a unit has completed)
+        """
+        with self._lock:
+            papers, units = self.papers, self.units
+        elapsed = time.perf_counter() - self.start_time
+        eta = None
+        if units:
+            eta = elapsed / units * (self.total_units - units)
+        return {
+            'papers': papers,
+            'units': units,
+            'total_units': self.total_units,
+            'seconds': round(elapsed, 1),
+            'papers_per_second': round(papers / elapsed, 1) if elapsed > 0 else 0.0,
+            'eta_seconds': round(eta, 1) if eta is not None else None
+        }
+
+    def format(self) -> str:
+        """One-line progress report"""
+        stats = self.summary()
+        percent = 100.0 * stats['units'] / stats['total_units'] if stats['total_units'] else 100.0
+        eta = 'unknown'
+        if stats['eta_seconds'] is not None:
+            eta = str(timedelta(seconds=int(stats['eta_seconds'])))
+        return (f"Backfill: {stats['units']}/{stats['total_units']} category-days ({percent:.1f}%), "
+                f"{stats['papers']} papers, {stats['papers_per_second']} papers/s, ETA {eta}")
+
+    def start(self) -> None:
+        """Report every interval seconds from a background thread until stop()"""
+        if self.interval <= 0 or self._thread is not None:
+            return
+
+        def run():
+            while not self._stop.wait(self.interval):
+                self.report(self.format())
+
+        self._thread = threading.Thread(target=run, name='backfill-progress', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop periodic reports"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
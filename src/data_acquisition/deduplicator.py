@@ -0,0 +1,336 @@
+"""
+Paper Deduplicator for Paper Daily
+
+Merges versioned arXiv ids and near-duplicate papers across sources
+(e.g., the same work on arXiv and OpenReview) using MinHash signatures
+and locality-sensitive hashing, so duplicates are found in roughly
+linear time instead of comparing every pair.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+# New-style (2405.12345) and old-style (hep-th/9901001) arXiv ids with an optional version;
+# the fetchers keep only the last path segment of old-style ids (9901001)
+ARXIV_ID_PATTERN = re.compile(r'^(\d{4}\.\d{4,5}|(?:[a-z][a-z.-]*/)?\d{7})(?:v(\d+))?$',
+                              re.IGNORECASE)
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+# Mersenne prime used for the universal hash family
+_PRIME = (1 << 61) - 1
+
+
+def normalize_paper_id(paper_id: str) -> str:
+    """
+    Strip the version suffix from an arXiv id (e.g., '2405.12345v2' -> '2405.12345')
+
+    Other ids (e.g., OpenReview's) are returned unchanged, even if they
+    happen to end in 'v' and digits.
+
+    Args:
+        paper_id: Paper id
+
+    Returns:
+        Version-less id
+    """
+    match = ARXIV_ID_PATTERN.match(paper_id or '')
+    return match.group(1) if match else (paper_id or '')
+
+
+def _id_version(paper_id: str) -> int:
+    """Version number of an arXiv id, 0 if unversioned or not an arXiv id"""
+    match = ARXIV_ID_PATTERN.match(paper_id or '')
+    return int(match.group(2)) if match and match.group(2) else 0
+
+
+class PaperDeduplicator:
+    """Finds and merges duplicate papers with MinHash LSH"""
+
+    def __init__(self, num_perm: int = 64, bands: int = 16, jaccard_threshold: float = 0.7,
+                 shingle_size: int = 3, embedding_threshold: float = 0.9, seed: int = 1):
+        """
+        Initialize the deduplicator
+
+        Args:
+            num_perm: Number of MinHash permutations per signature
+            bands: Number of LSH bands (num_perm must be divisible by bands)
+            jaccard_threshold: Minimum estimated Jaccard similarity of word shingles
+            shingle_size: Number of words per shingle
+            embedding_threshold: Minimum cosine similarity when embeddings are supplied
+            seed: Seed for the hash permutations
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows_per_band = num_perm // bands
+        self.jaccard_threshold = jaccard_threshold
+        self.shingle_size = shingle_size
+        self.embedding_threshold = embedding_threshold
+        self.last_stats: Dict[str, int] = {}
+
+        rng = np.random.RandomState(seed)
+        self._hash_a = rng.randint(1, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+        self._hash_b = rng.randint(0, 1 << 31, size=num_perm, dtype=np.int64).astype(np.uint64)
+
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the papers seen by add() and start a new stream"""
+        # Each distinct paper gets a slot; ids and signatures map to slots
+        self._seen_by_id: Dict[str, int] = {}
+        self._seen_slots: List[int] = []
+        self._seen_signatures: List[np.ndarray] = []
+        self._slots = 0
+        self._band_buckets = [defaultdict(list) for _ in range(self.bands)]
+        self.last_stats = {'input': 0, 'version_duplicates': 0,
+                           'near_duplicates': 0, 'output': 0}
+
+    def _shingles(self, paper: Dict) -> np.ndarray:
+        """Hash word shingles of the normalized title and abstract"""
+        text = f"{paper.get('title', '')} {paper.get('abstract', '')}".lower()
+        tokens = TOKEN_PATTERN.findall(text)
+        size = self.shingle_size
+        if len(tokens) < size:
+            shingles = {' '.join(tokens)}
+        else:
+            shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+        return np.array([zlib.crc32(s.encode('utf-8')) for s in shingles], dtype=np.uint64)
+
+    def minhash(self, paper: Dict) -> np.ndarray:
+        """
+        Compute the MinHash signature of a paper
+
+        Args:
+            paper: Paper dictionary with 'title' and 'abstract'
+
+        Returns:
+            Signature of num_perm uint64 values
+        """
+        shingles = self._shingles(paper)
+        # (a * x + b) mod p for every permutation and shingle at once
+        hashed = (np.outer(self._hash_a, shingles) + self._hash_b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+    def find_duplicate_groups(self, papers: List[Dict],
+                              embeddings: Optional[np.ndarray] = None) -> List[List[int]]:
+        """
+        Group papers that are versions or near-duplicates of each other
+
+        Args:
+            papers: Paper dictionaries
+            embeddings: Optional embeddings aligned with papers used to confirm matches
+
+        Returns:
+            Groups of paper indices; singletons are included
+        """
+        parent = list(range(len(papers)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        def union(i: int, j: int) -> None:
+            root_i, root_j = find(i), find(j)
+            if root_i != root_j:
+                parent[max(root_i, root_j)] = min(root_i, root_j)
+
+        # Versioned ids of the same arXiv paper
+        by_id: Dict[str, int] = {}
+        version_merges = 0
+        for i, paper in enumerate(papers):
+            key = normalize_paper_id(paper.get('id', ''))
+            if key in by_id:
+                union(by_id[key], i)
+                version_merges += 1
+            else:
+                by_id[key] = i
+
+        # Near-duplicate content via banded LSH buckets
+        signatures = np.array([self.minhash(paper) for paper in papers]).reshape(len(papers), -1)
+        candidates = set()
+        for band in range(self.bands):
+            buckets = defaultdict(list)
+            band_rows = signatures[:, band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            for i, row in enumerate(band_rows):
+                buckets[row.tobytes()].append(i)
+            for members in buckets.values():
+                for a in range(len(members)):
+                    for b in range(a + 1, len(members)):
+                        candidates.add((members[a], members[b]))
+
+        if embeddings is not None:
+            norms = np.linalg.norm(embeddings, axis=1)
+            norms[norms == 0] = 1.0
+
+        near_merges = 0
+        for i, j in candidates:
+            if find(i) == find(j):
+                continue
+            jaccard = float(np.mean(signatures[i] == signatures[j]))
+            if jaccard < self.jaccard_threshold:
+                continue
+            if embeddings is not None:
+                cosine = float(embeddings[i] @ embeddings[j]) / (norms[i] * norms[j])
+                if cosine < self.embedding_threshold:
+                    continue
+            union(i, j)
+            near_merges += 1
+
+        groups = defaultdict(list)
+        for i in range(len(papers)):
+            groups[find(i)].append(i)
+
+        self.last_stats = {
+            'input': len(papers),
+            'version_duplicates': version_merges,
+            'near_duplicates': near_merges,
+            'output': len(groups)
+        }
+        return list(groups.values())
+
+    def add(self, paper: Dict) -> Optional[Dict]:
+        """
+        Check one paper against those seen since the last reset()
+
+        Args:
+            paper: Paper dictionary
+
+        Returns:
+            The paper if it is new, None if it duplicates an earlier one
+        """
+        new = self.add_many([paper])
+        return new[0] if new else None
+
+    def add_many(self, papers: List[Dict]) -> List[Dict]:
+        """
+        Check a batch of papers against those seen since the last reset()
+
+        Streaming counterpart of deduplicate() for papers that arrive in
+        batches. Duplicates within the batch are merged with merge_records()
+        before anything is returned, so the latest arXiv version wins and
+        fills the fields it lacks from the others. Records returned by an
+        earlier call are never modified; later duplicates of them are
+        dropped. Not thread-safe.
+
+        Args:
+            papers: Paper dictionaries
+
+        Returns:
+            Merged records of the papers not seen in earlier calls, in first-seen order
+        """
+        stats = self.last_stats
+        pending: Dict[int, List[Dict]] = {}
+
+        for paper in papers:
+            stats['input'] += 1
+            key = normalize_paper_id(paper.get('id', ''))
+            slot = self._seen_by_id.get(key)
+            if slot is not None:
+                stats['version_duplicates'] += 1
+            else:
+                slot = self._match(paper)
+                self._seen_by_id[key] = slot
+
+            if slot in pending:
+                pending[slot].append(paper)
+            elif slot == self._slots:
+                self._slots += 1
+                pending[slot] = [paper]
+
+        stats['output'] += len(pending)
+        return [self.merge_records(records) for records in pending.values()]
+
+    def _match(self, paper: Dict) -> int:
+        """Slot of the first seen paper similar to this one, or a new slot"""
+        signature = self.minhash(paper)
+        band_keys = [signature[band * self.rows_per_band:(band + 1) * self.rows_per_band].tobytes()
+                     for band in range(self.bands)]
+
+        candidates = set()
+        for buckets, band_key in zip(self._band_buckets, band_keys):
+            candidates.update(buckets.get(band_key, ()))
+
+        slot = self._slots
+        for index in sorted(candidates):
+            if float(np.mean(self._seen_signatures[index] == signature)) >= self.jaccard_threshold:
+                slot = self._seen_slots[index]
+                self.last_stats['near_duplicates'] += 1
+                break
+
+        # Duplicates stay indexed under their slot, so matches chain the
+        # same way as the union-find in find_duplicate_groups()
+        index = len(self._seen_slots)
+        self._seen_slots.append(slot)
+        self._seen_signatures.append(signature)
+        for buckets, band_key in zip(self._band_buckets, band_keys):
+            buckets[band_key].append(index)
+        return slot
+
+    def deduplicate(self, papers: List[Dict],
+                    embeddings: Optional[np.ndarray] = None) -> List[Dict]:
+        """
+        Collapse duplicate papers into single merged records
+
+        Args:
+            papers: Paper dictionaries from one or more sources
+            embeddings: Optional embeddings aligned with papers used to confirm matches
+
+        Returns:
+            Deduplicated papers in first-seen order
+        """
+        if not papers:
+            self.last_stats = {'input': 0, 'version_duplicates': 0,
+                               'near_duplicates': 0, 'output': 0}
+            return []
+
+        groups = self.find_duplicate_groups(papers, embeddings)
+        groups.sort(key=lambda group: group[0])
+        return [self.merge_records([papers[i] for i in group]) for group in groups]
+
+    def merge_records(self, records: List[Dict]) -> Dict:
+        """
+        Merge duplicate records into one, preferring the latest arXiv version
+
+        Missing fields are filled from the other records, categories are
+        unioned, and the ids and sources of every record are kept.
+
+        Args:
+            records: Duplicate paper dictionaries
+
+        Returns:
+            Merged paper dictionary
+        """
+        if len(records) == 1:
+            return records[0]
+
+        ranked = sorted(records, key=lambda r: (r.get('source') == 'arxiv',
+                                                _id_version(r.get('id', '')),
+                                                r.get('updated_date') or ''),
+                        reverse=True)
+        # Paper records and dictionaries both copy shallowly, keeping their type
+        merged = ranked[0].copy()
+
+        for record in ranked[1:]:
+            for key, value in record.items():
+                if value and not merged.get(key):
+                    merged[key] = value
+
+        categories = []
+        for record in ranked:
+            for category in record.get('categories') or []:
+                if category not in categories:
+                    categories.append(category)
+        merged['categories'] = categories
+
+        merged['sources'] = sorted({r.get('source', 'unknown') for r in records})
+        merged['alternate_ids'] = [r['id'] for r in ranked[1:] if r.get('id') != merged.get('id')]
+        return merged
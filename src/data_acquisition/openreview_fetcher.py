@@ -1,52 +1,276 @@
 """
 OpenReview Fetcher for Paper Daily
 
-Fetches new submissions from OpenReview using its API.
+Fetches conference submissions from the OpenReview notes API. Venues are
+paged concurrently over one pooled HTTP session, and syncs are
+incremental: given the latest modification time (tmdate) seen by the
+previous run, only notes changed since then are requested, newest first,
+stopping at the first older note. The caller persists the cursor once the
+papers are stored.
 """
 
-import requests
 import time
-from datetime import datetime
-from typing import List, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Union
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import metrics
+
+from .paper import Paper
+from .rate_limiter import TokenBucketRateLimiter
+
+
+def _value(content: Dict, key: str):
+    """A note content field; API v2 wraps every value as {'value': ...}"""
+    field = content.get(key)
+    if isinstance(field, dict):
+        return field.get('value')
+    return field
+
+
+def _timestamp(milliseconds: Optional[int]) -> Optional[str]:
+    """OpenReview epoch milliseconds as an ISO 8601 UTC timestamp"""
+    if not milliseconds:
+        return None
+    return datetime.fromtimestamp(milliseconds / 1000, tz=timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
 class OpenReviewFetcher:
     """Fetches papers from OpenReview API"""
     
-    def __init__(self, conference_ids: List[str] = None):
+    def __init__(self, conference_ids: List[str] = None,
+                 api_url: str = "https://api2.openreview.net/notes",
+                 invitation: str = "{venue}/Conference/-/Submission",
+                 site_url: str = "https://openreview.net", page_size: int = 1000,
+                 max_workers: int = 4, requests_per_second: float = 2.0, burst: int = 2):
         """
         Initialize the OpenReview fetcher
         
         Args:
             conference_ids: List of conference IDs (e.g., ['ICLR.cc/2024'])
+            api_url: Notes API endpoint
+            invitation: Submission invitation, with {venue} replaced by the conference ID
+            site_url: Site that forum and PDF links point to
+            page_size: Notes requested per page (the API allows up to 1000)
+            max_workers: Concurrent requests (venues, or pages of a full sync)
+            requests_per_second: Global request rate shared by all workers
+            burst: Number of requests allowed back-to-back before throttling
         """
         self.conference_ids = conference_ids or ['ICLR.cc/2024']
-        self.base_url = "https://api.openreview.net"
+        self.api_url = api_url
+        self.invitation = invitation
+        self.site_url = site_url.rstrip('/')
+        self.page_size = max(1, page_size)
+        self.max_workers = max(1, max_workers)
+        self.rate_limiter = TokenBucketRateLimiter(requests_per_second, burst)
+        self.session = self._create_session()
+        self.last_fetch_stats: Dict[str, Dict] = {}
+        self.failed_venues = set()
+    
+    def _create_session(self) -> requests.Session:
+        """Create a pooled HTTP session; workers wait for a free connection rather than opening more"""
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers,
+                              pool_block=True)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _get_notes(self, venue: str, offset: int, limit: int, sort: str) -> Dict:
+        """
+        Request one page of a venue's submissions
+        
+        Args:
+            venue: Conference ID
+            offset: Index of the first note
+            limit: Number of notes
+            sort: Sort order (e.g., 'tmdate:desc')
         
-    def fetch_submissions(self, date: str = None) -> List[Dict]:
+        Returns:
+            The API response with 'notes' and, when the API reports it, 'count'
+        """
+        query_params = {
+            'invitation': self.invitation.format(venue=venue),
+            'offset': offset,
+            'limit': limit,
+            'sort': sort
+        }
+        metrics.observe('openreview.rate_limit_wait', self.rate_limiter.acquire())
+        with metrics.span('openreview.request'):
+            response = self.session.get(f"{self.api_url}?{urlencode(query_params)}", timeout=30)
+        metrics.increment('openreview.requests')
+        response.raise_for_status()
+        metrics.observe('openreview.response_bytes', len(response.content))
+        return response.json()
+    
+    def note_to_paper(self, note: Dict, venue: str) -> Paper:
         """
-        Fetch submissions for a specific date
+        Build a Paper from a submission note (API v1 or v2)
         
         Args:
-            date: Date in YYYY-MM-DD format
-            
+            note: Note as returned by the notes API
+            venue: Conference ID recorded as the paper's category
+        
         Returns:
-            List of paper dictionaries
-        """
-        # Placeholder implementation
-        # Real implementation would use OpenReview's GraphQL API
-        
-        print(f"OpenReview fetcher: Would fetch papers for date {date}")
-        
-        # Return mock data for now
-        return [
-            {
-                'id': 'openreview_001',
-                'title': 'Mock OpenReview Paper',
-                'authors': ['Author A', 'Author B'],
-                'abstract': 'This is a mock abstract from OpenReview.',
-                'source': 'openreview',
-                'conference': self.conference_ids[0] if self.conference_ids else 'unknown',
-                'published_date': date or datetime.now().strftime('%Y-%m-%d')
+            The paper, with id 'openreview_<note id>'
+        """
+        content = note.get('content') or {}
+        pdf = _value(content, 'pdf')
+        if pdf and pdf.startswith('/'):
+            pdf = self.site_url + pdf
+        
+        paper = Paper(
+            id=f"openreview_{note['id']}",
+            title=(_value(content, 'title') or '').strip(),
+            authors=_value(content, 'authors') or [],
+            abstract=(_value(content, 'abstract') or '').strip(),
+            published_date=_timestamp(note.get('pdate') or note.get('odate') or note.get('cdate')
+                                      or note.get('tcdate')),
+            updated_date=_timestamp(note.get('tmdate') or note.get('mdate')),
+            categories=[venue],
+            primary_category=venue,
+            pdf_url=pdf,
+            arxiv_url=f"{self.site_url}/forum?id={note.get('forum') or note['id']}",
+            source='openreview',
+            conference=venue
+        )
+        venue_name = _value(content, 'venue')
+        if venue_name:
+            paper['venue'] = venue_name
+        return paper
+    
+    def iter_venue_papers(self, venue: str, since: int = 0) -> Iterator[Paper]:
+        """
+        Lazily fetch a venue's submissions modified after a cursor
+        
+        An incremental sync pages newest modification first and stops at
+        the first note not newer than since, so a daily run costs one
+        request per venue. A full sync (since=0) reads the newest tmdate
+        first, then requests every page in creation order concurrently;
+        creation order doesn't shift when notes are edited mid-sync, and
+        edits after the first read are newer than the cursor, so the next
+        sync picks them up. The new cursor is left in
+        last_fetch_stats[venue]['cursor'].
+        
+        Args:
+            venue: Conference ID (e.g., 'ICLR.cc/2024')
+            since: tmdate (epoch milliseconds) of the previous sync
+        
+        Yields:
+            Paper records
+        """
+        start_time = time.perf_counter()
+        stats = {'latency': 0.0, 'papers': 0, 'cursor': since}
+        self.last_fetch_stats[venue] = stats
+        
+        try:
+            if since:
+                pages = self._iter_changed_pages(venue, since, stats)
+            else:
+                pages = self._iter_all_pages(venue, stats)
+            for notes in pages:
+                for note in notes:
+                    stats['papers'] += 1
+                    metrics.increment('openreview.papers')
+                    yield self.note_to_paper(note, venue)
+        finally:
+            stats['latency'] = time.perf_counter() - start_time
+    
+    def _iter_changed_pages(self, venue: str, since: int, stats: Dict) -> Iterator[List[Dict]]:
+        """Pages of notes modified after since, newest first"""
+        offset = 0
+        while True:
+            notes = self._get_notes(venue, offset, self.page_size, 'tmdate:desc').get('notes', [])
+            if notes and offset == 0:
+                stats['cursor'] = max(since, notes[0].get('tmdate') or 0)
+            changed = [note for note in notes if (note.get('tmdate') or 0) > since]
+            if changed:
+                yield changed
+            if len(changed) < len(notes) or len(notes) < self.page_size:
+                return
+            offset += len(notes)
+    
+    def _iter_all_pages(self, venue: str, stats: Dict) -> Iterator[List[Dict]]:
+        """Every page of a venue's notes in creation order, requested concurrently"""
+        head = self._get_notes(venue, 0, 1, 'tmdate:desc')
+        if head.get('notes'):
+            stats['cursor'] = head['notes'][0].get('tmdate') or 0
+        count = head.get('count')
+        
+        if count is None:
+            # Without a total the pages can only be requested one after another
+            offset = 0
+            while True:
+                notes = self._get_notes(venue, offset, self.page_size, 'tcdate:asc').get('notes', [])
+                if notes:
+                    yield notes
+                if len(notes) < self.page_size:
+                    return
+                offset += len(notes)
+        
+        offsets = range(0, count, self.page_size)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(offsets) or 1)) as executor:
+            pages = executor.map(
+                lambda offset: self._get_notes(venue, offset, self.page_size, 'tcdate:asc'), offsets)
+            seen = set()
+            for page in pages:
+                # Notes created mid-sync shift later pages, repeating a note at the boundary
+                notes = [note for note in page.get('notes', []) if note['id'] not in seen]
+                seen.update(note['id'] for note in notes)
+                if notes:
+                    yield notes
+    
+    def fetch_submissions(self, cursors: Union[Dict[str, int], str] = None,
+                          venues: List[str] = None) -> List[Paper]:
+        """
+        Fetch submissions changed since the given cursors, venues concurrently
+        
+        Args:
+            cursors: Venue -> tmdate of its previous sync (missing venues are
+                synced in full), or a date in YYYY-MM-DD format to fetch every
+                venue's submissions changed since the start of that day (UTC)
+            venues: Subset of venues to fetch (defaults to all configured)
+        
+        Returns:
+            List of Paper records; each venue's new cursor is in
+            last_fetch_stats[venue]['cursor'] unless it is in failed_venues
+        """
+        if venues is None:
+            venues = self.conference_ids
+        if isinstance(cursors, str):
+            since = datetime.strptime(cursors, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+            cursors = {venue: int(since.timestamp() * 1000) for venue in venues}
+        cursors = cursors or {}
+        
+        papers_by_venue: Dict[str, List[Paper]] = {}
+        self.last_fetch_stats = {}
+        self.failed_venues = set()
+        if not venues:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(venues))) as executor:
+            futures = {
+                executor.submit(lambda venue: list(self.iter_venue_papers(venue, cursors.get(venue, 0))),
+                                venue): venue
+                for venue in venues
             }
-        ] 
\ No newline at end of file
+            for future in as_completed(futures):
+                venue = futures[future]
+                try:
+                    papers_by_venue[venue] = future.result()
+                except Exception as e:
+                    self.failed_venues.add(venue)
+                    print(f"Error fetching OpenReview submissions for {venue}: {e}")
+        
+        for venue, stats in self.last_fetch_stats.items():
+            print(f"OpenReview {venue}: {stats['papers']} papers in {stats['latency']:.2f}s")
+        
+        # Keep configured venue order so the output is deterministic
+        papers = []
+        for venue in venues:
+            papers.extend(papers_by_venue.get(venue, []))
+        return papers
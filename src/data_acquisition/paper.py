@@ -0,0 +1,283 @@
+"""
+Paper Records for Paper Daily
+
+Paper is a __slots__ record for one paper's metadata that also behaves as
+a mutable mapping, so code written against paper dictionaries keeps
+working while each record costs a fraction of a dict. Fields outside the
+fixed set (e.g., 'sources' or 'introduction') go to a small overflow dict
+created on first use. Author names and categories are interned, so the
+strings repeated across a large archive are stored once.
+
+PaperBatch holds many papers column-wise: ids, publication times,
+category codes and embeddings as numpy arrays next to the records, for
+bulk filtering and scoring without touching each record.
+"""
+
+import sys
+from collections.abc import MutableMapping
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Union
+
+import numpy as np
+
+FIELDS = ('id', 'title', 'authors', 'abstract', 'published_date', 'updated_date',
+          'categories', 'primary_category', 'pdf_url', 'arxiv_url', 'source')
+_FIELD_SET = frozenset(FIELDS)
+
+# Category combinations recur across papers, so equal tuples are shared
+_category_tuples: Dict[tuple, tuple] = {}
+MAX_SHARED_TUPLES = 100000
+
+
+def intern_all(values: Optional[Iterable[str]]) -> tuple:
+    """Intern each string and share the tuple with earlier papers having the same values"""
+    if not values:
+        return ()
+    values = tuple(sys.intern(value) if isinstance(value, str) else value for value in values)
+    shared = _category_tuples.get(values)
+    if shared is not None:
+        return shared
+    if len(_category_tuples) < MAX_SHARED_TUPLES:
+        _category_tuples[values] = values
+    return values
+
+
+class Paper(MutableMapping):
+    """Metadata of one paper"""
+
+    __slots__ = FIELDS + ('extra',)
+
+    def __init__(self, id: str = None, title: str = '', authors: Iterable[str] = (),
+                 abstract: str = '', published_date: str = None, updated_date: str = None,
+                 categories: Iterable[str] = (), primary_category: str = None,
+                 pdf_url: str = None, arxiv_url: str = None, source: str = 'unknown',
+                 **extra):
+        """
+        Initialize the record
+
+        Args:
+            id: Paper id (e.g., '2405.12345v2')
+            title: Title
+            authors: Author names
+            abstract: Abstract
+            published_date: First publication time (ISO 8601)
+            updated_date: Last update time (ISO 8601)
+            categories: Subject categories
+            primary_category: Main category
+            pdf_url: Link to the PDF
+            arxiv_url: Link to the abstract page
+            source: Where the paper came from ('arxiv', 'openreview', ...)
+            **extra: Any other fields
+        """
+        self.id = id
+        self.title = title
+        self.authors = [sys.intern(author) for author in authors or ()]
+        self.abstract = abstract
+        self.published_date = published_date
+        self.updated_date = updated_date
+        self.categories = intern_all(categories)
+        self.primary_category = sys.intern(primary_category) if primary_category else primary_category
+        self.pdf_url = pdf_url
+        self.arxiv_url = arxiv_url
+        self.source = sys.intern(source) if source else source
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, paper: Union['Paper', Dict]) -> 'Paper':
+        """Build a record from a paper dictionary (records are returned as is)"""
+        if isinstance(paper, Paper):
+            return paper
+        return cls(**paper)
+
+    def __getitem__(self, key: str):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value) -> None:
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        elif self.extra is None:
+            self.extra = {key: value}
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        if key in _FIELD_SET:
+            raise KeyError(f"Can't delete paper field '{key}'")
+        if self.extra is None or key not in self.extra:
+            raise KeyError(key)
+        del self.extra[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from FIELDS
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self) -> int:
+        return len(FIELDS) + len(self.extra or ())
+
+    def __contains__(self, key) -> bool:
+        return key in _FIELD_SET or (self.extra is not None and key in self.extra)
+
+    def get(self, key: str, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key)
+        if self.extra is not None:
+            return self.extra.get(key, default)
+        return default
+
+    def copy(self) -> 'Paper':
+        """Shallow copy; the overflow dict is copied so extra fields can be set independently"""
+        paper = Paper.__new__(Paper)
+        for field in FIELDS:
+            setattr(paper, field, getattr(self, field))
+        paper.extra = dict(self.extra) if self.extra else None
+        return paper
+
+    def to_dict(self) -> Dict:
+        """Plain dictionary with every field, for display and serialization"""
+        paper = {field: getattr(self, field) for field in FIELDS}
+        paper['authors'] = list(self.authors or [])
+        paper['categories'] = list(self.categories or [])
+        if self.extra:
+            paper.update(self.extra)
+        return paper
+
+    def __repr__(self) -> str:
+        return f"Paper(id={self.id!r}, title={self.title!r})"
+
+
+def parse_timestamps(dates: Sequence[Optional[str]]) -> np.ndarray:
+    """ISO 8601 dates as datetime64[s], NaT where missing or malformed"""
+    try:
+        return np.array([(date or 'NaT')[:19] for date in dates], dtype='datetime64[s]')
+    except ValueError:
+        timestamps = np.full(len(dates), np.datetime64('NaT'), dtype='datetime64[s]')
+        for i, date in enumerate(dates):
+            try:
+                timestamps[i] = np.datetime64((date or 'NaT')[:19], 's')
+            except ValueError:
+                pass
+        return timestamps
+
+
+class PaperBatch:
+    """Column-wise collection of papers"""
+
+    def __init__(self, papers: Iterable[Union[Paper, Dict]] = (),
+                 embeddings: Optional[np.ndarray] = None, category_names: List[str] = None,
+                 **columns: np.ndarray):
+        """
+        Initialize the batch
+
+        Args:
+            papers: Paper records or dictionaries (dictionaries are converted)
+            embeddings: Embedding matrix with one row per paper
+            category_names: Category vocabulary to extend (shared with the batch it came from)
+            **columns: Extra per-paper arrays (e.g., relevance=..., profile=...)
+        """
+        self.papers: List[Paper] = [Paper.from_dict(paper) for paper in papers]
+        self.ids: List[str] = [paper.id for paper in self.papers]
+        self.published = parse_timestamps([paper.published_date for paper in self.papers])
+
+        self.category_names: List[str] = category_names if category_names is not None else []
+        codes = {name: code for code, name in enumerate(self.category_names)}
+        category_codes = np.empty(len(self.papers), dtype=np.int32)
+        for i, paper in enumerate(self.papers):
+            category = paper.primary_category
+            if category is None:
+                category_codes[i] = -1
+                continue
+            code = codes.get(category)
+            if code is None:
+                code = codes[category] = len(self.category_names)
+                self.category_names.append(category)
+            category_codes[i] = code
+        self.category_codes = category_codes
+
+        if embeddings is not None and len(embeddings) != len(self.papers):
+            raise ValueError(f"{len(embeddings)} embeddings for {len(self.papers)} papers")
+        self.embeddings = embeddings
+        self.columns: Dict[str, np.ndarray] = {}
+        for name, values in columns.items():
+            self[name] = values
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def __iter__(self) -> Iterator[Paper]:
+        return iter(self.papers)
+
+    def __getitem__(self, key: Union[int, str]):
+        """A paper by position, or an extra column by name"""
+        if isinstance(key, str):
+            return self.columns[key]
+        return self.papers[key]
+
+    def __setitem__(self, name: str, values: np.ndarray) -> None:
+        """Add or replace an extra column"""
+        values = np.asarray(values)
+        if len(values) != len(self.papers):
+            raise ValueError(f"Column '{name}' has {len(values)} values for {len(self.papers)} papers")
+        self.columns[name] = values
+
+    def category(self, index: int) -> Optional[str]:
+        """Primary category of the paper at index"""
+        code = self.category_codes[index]
+        return self.category_names[code] if code >= 0 else None
+
+    def select(self, indices: Union[Sequence[int], np.ndarray, slice]) -> 'PaperBatch':
+        """
+        Subset of the batch, sharing the paper records and category vocabulary
+
+        Args:
+            indices: Positions, a boolean mask or a slice
+
+        Returns:
+            A new batch with the selected rows of every column
+        """
+        if isinstance(indices, slice):
+            positions = np.arange(len(self.papers))[indices]
+        else:
+            positions = np.asarray(indices)
+            if positions.dtype == bool:
+                positions = np.flatnonzero(positions)
+        positions = positions.astype(np.int64, copy=False)
+
+        batch = PaperBatch.__new__(PaperBatch)
+        batch.papers = [self.papers[i] for i in positions]
+        batch.ids = [self.ids[i] for i in positions]
+        batch.published = self.published[positions]
+        batch.category_names = self.category_names
+        batch.category_codes = self.category_codes[positions]
+        batch.embeddings = self.embeddings[positions] if self.embeddings is not None else None
+        batch.columns = {name: values[positions] for name, values in self.columns.items()}
+        return batch
+
+    @classmethod
+    def concat(cls, batches: Sequence['PaperBatch']) -> 'PaperBatch':
+        """
+        Join batches end to end
+
+        Embeddings and columns are kept only when every batch has them.
+        """
+        batches = [batch for batch in batches if len(batch)]
+        if not batches:
+            return cls()
+        if len(batches) == 1:
+            return batches[0]
+
+        embeddings = None
+        if all(batch.embeddings is not None for batch in batches):
+            embeddings = np.concatenate([batch.embeddings for batch in batches])
+        names = set.intersection(*(set(batch.columns) for batch in batches))
+        columns = {name: np.concatenate([batch.columns[name] for batch in batches])
+                   for name in names}
+        return cls([paper for batch in batches for paper in batch.papers], embeddings,
+                   category_names=list(batches[0].category_names), **columns)
+
+    def to_dicts(self) -> List[Dict]:
+        """Plain paper dictionaries, for display and serialization"""
+        return [paper.to_dict() for paper in self.papers]
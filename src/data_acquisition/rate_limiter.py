@@ -0,0 +1,58 @@
+"""
+Rate Limiter for Paper Daily
+
+Token-bucket rate limiter shared by all requests a fetcher issues, so
+concurrent workers respect the upstream API policy globally.
+"""
+
+import threading
+import time
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket limiting requests across workers"""
+
+    def __init__(self, requests_per_second: float = 1.0, burst: int = 1):
+        """
+        Initialize the rate limiter
+
+        Args:
+            requests_per_second: Rate at which tokens are refilled
+            burst: Maximum number of tokens that can accumulate
+        """
+        if requests_per_second <= 0:
+            raise ValueError("requests_per_second must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+
+        self.rate = float(requests_per_second)
+        self.capacity = float(burst)
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last refill (caller holds the lock)"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self) -> float:
+        """
+        Block until a token is available and consume it
+
+        Returns:
+            Time spent waiting in seconds
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                wait_time = (1.0 - self._tokens) / self.rate
+
+            time.sleep(wait_time)
+            waited += wait_time
@@ -0,0 +1,178 @@
+"""
+Response Cache for Paper Daily
+
+On-disk HTTP response cache keyed by normalized URL, with TTLs,
+ETag/Last-Modified revalidation and size-bounded LRU eviction.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    content BLOB NOT NULL,
+    etag TEXT,
+    last_modified TEXT,
+    stored_at REAL NOT NULL,
+    expires_at REAL,
+    last_access REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_access ON responses (last_access);
+"""
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalize a URL so equivalent queries share a cache entry
+
+    Scheme and host are lower-cased and query parameters sorted.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+
+class ResponseCache:
+    """Size-bounded on-disk cache of HTTP response bodies"""
+
+    def __init__(self, cache_dir: str = "data/cache/http", default_ttl: float = 3600,
+                 max_size_mb: float = 256):
+        """
+        Initialize the response cache
+
+        Args:
+            cache_dir: Directory holding the cache database
+            default_ttl: Seconds a response stays fresh when no TTL is given
+            max_size_mb: Total body size kept before least recently used entries are evicted
+        """
+        self.cache_dir = cache_dir
+        self.default_ttl = default_ttl
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'evictions': 0}
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'responses.db'),
+                                    check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()
+
+    def get(self, url: str) -> Optional[Dict]:
+        """
+        Look up a cached response, fresh or stale
+
+        Args:
+            url: Request URL
+
+        Returns:
+            Dictionary with 'content', 'etag', 'last_modified' and 'fresh',
+            or None if the URL is not cached
+        """
+        now = time.time()
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT content, etag, last_modified, expires_at FROM responses WHERE key = ?",
+                (self._key(url),)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            with self.conn:
+                self.conn.execute("UPDATE responses SET last_access = ? WHERE key = ?",
+                                  (now, self._key(url)))
+
+        fresh = row['expires_at'] is None or row['expires_at'] > now
+        if fresh:
+            self.stats['hits'] += 1
+        else:
+            self.stats['misses'] += 1
+
+        return {
+            'content': row['content'],
+            'etag': row['etag'],
+            'last_modified': row['last_modified'],
+            'fresh': fresh
+        }
+
+    def _expiry(self, ttl: Optional[float], now: float) -> Optional[float]:
+        """Convert a TTL to an absolute expiry; a negative TTL never expires"""
+        if ttl is None:
+            ttl = self.default_ttl
+        return None if ttl < 0 else now + ttl
+
+    def put(self, url: str, content: bytes, etag: str = None, last_modified: str = None,
+            ttl: float = None) -> None:
+        """
+        Store a response body
+
+        Args:
+            url: Request URL
+            content: Response body
+            etag: ETag header, if the server sent one
+            last_modified: Last-Modified header, if the server sent one
+            ttl: Freshness lifetime in seconds (None = default, negative = forever)
+        """
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self._key(url), normalize_url(url), content, etag, last_modified,
+                     now, self._expiry(ttl, now), now, len(content))
+                )
+                self._evict()
+
+    def refresh(self, url: str, ttl: float = None) -> None:
+        """Extend the lifetime of an entry after a 304 Not Modified"""
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?",
+                    (self._expiry(ttl, now), now, self._key(url))
+                )
+        self.stats['revalidated'] += 1
+
+    def _evict(self) -> None:
+        """Drop least recently used entries until under the size bound (caller holds the lock)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        cursor = self.conn.execute("SELECT key, size FROM responses ORDER BY last_access")
+        evicted = []
+        for row in cursor:
+            if total <= self.max_size_bytes:
+                break
+            evicted.append((row['key'],))
+            total -= row['size']
+
+        self.conn.executemany("DELETE FROM responses WHERE key = ?", evicted)
+        self.stats['evictions'] += len(evicted)
+
+    def clear(self) -> None:
+        """Remove every cached response"""
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM responses")
+
+    def close(self) -> None:
+        """Close the cache database"""
+        with self._lock:
+            self.conn.close()
@@ -0,0 +1,131 @@
+"""
+Scheduler for Paper Daily
+
+Runs tasks at fixed times of day or at a fixed interval inside one
+long-lived process, so state such as the embedding model stays loaded
+between runs instead of being rebuilt by every cron invocation.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+
+
+class Scheduler:
+    """Runs scheduled tasks one at a time on the calling thread"""
+
+    def __init__(self, clock: Callable[[], datetime] = datetime.now, max_sleep: float = 60.0):
+        """
+        Initialize the scheduler
+
+        Args:
+            clock: Returns the current local time
+            max_sleep: Longest single wait in seconds, so clock changes are noticed
+        """
+        self.clock = clock
+        self.max_sleep = max_sleep
+        self.jobs: List[Dict] = []
+        self._stop = threading.Event()
+
+    def schedule_daily(self, task: Callable[[], object], time: str, name: str = None) -> Dict:
+        """
+        Run a task every day at a given local time
+
+        Args:
+            task: Callable taking no arguments
+            time: Time of day as HH:MM
+            name: Name used in log messages
+
+        Returns:
+            The job dictionary
+        """
+        at = datetime.strptime(time, '%H:%M').time()
+        job = {'name': name or f"daily at {time}", 'task': task, 'at': at, 'interval': None}
+        job['next_run'] = self._next_daily(at, self.clock())
+        self.jobs.append(job)
+        return job
+
+    def schedule_interval(self, task: Callable[[], object], minutes: float, name: str = None) -> Dict:
+        """
+        Run a task repeatedly, a fixed number of minutes after the last run started
+
+        Args:
+            task: Callable taking no arguments
+            minutes: Interval between runs
+            name: Name used in log messages
+
+        Returns:
+            The job dictionary
+        """
+        if minutes <= 0:
+            raise ValueError("minutes must be positive")
+        interval = timedelta(minutes=minutes)
+        job = {'name': name or f"every {minutes:g} min", 'task': task, 'at': None,
+               'interval': interval, 'next_run': self.clock() + interval}
+        self.jobs.append(job)
+        return job
+
+    @staticmethod
+    def _next_daily(at, now: datetime) -> datetime:
+        """First occurrence of time of day at strictly after now"""
+        run = datetime.combine(now.date(), at)
+        return run if run > now else run + timedelta(days=1)
+
+    def next_run(self) -> Optional[datetime]:
+        """Time the next job is due, or None if nothing is scheduled"""
+        return min((job['next_run'] for job in self.jobs), default=None)
+
+    def run_job(self, job: Dict) -> None:
+        """Run one job now and schedule its next run"""
+        started = self.clock()
+        try:
+            job['task']()
+        except Exception as e:
+            print(f"Error in scheduled job '{job['name']}': {e}")
+
+        # Runs missed while the task was busy are skipped, not queued up
+        now = self.clock()
+        if job['interval'] is not None:
+            job['next_run'] = max(started + job['interval'], now)
+        else:
+            job['next_run'] = self._next_daily(job['at'], now)
+
+    def run_pending(self) -> int:
+        """
+        Run every job that is due
+
+        Returns:
+            Number of jobs run
+        """
+        now = self.clock()
+        due = sorted((job for job in self.jobs if job['next_run'] <= now),
+                     key=lambda job: job['next_run'])
+        for job in due:
+            if self._stop.is_set():
+                break
+            self.run_job(job)
+        return len(due)
+
+    def run_forever(self, run_on_start: bool = False) -> None:
+        """
+        Run jobs as they come due until stop() is called
+
+        Args:
+            run_on_start: Run the earliest job once immediately
+        """
+        self._stop.clear()
+        if run_on_start and self.jobs:
+            self.run_job(min(self.jobs, key=lambda job: job['next_run']))
+
+        while not self._stop.is_set():
+            self.run_pending()
+            next_run = self.next_run()
+            if next_run is None:
+                wait = self.max_sleep
+            else:
+                wait = min(max((next_run - self.clock()).total_seconds(), 0.0), self.max_sleep)
+            self._stop.wait(wait)
+
+    def stop(self) -> None:
+        """Stop run_forever() after the job in progress finishes"""
+        self._stop.set()
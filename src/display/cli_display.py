@@ -4,7 +4,8 @@ CLI Display for Paper Daily
 Provides command-line interface for displaying papers and recommendations.
 """
 
-from typing import List, Dict
+import time
+from typing import Callable, List, Dict
 from datetime import datetime
 
 
@@ -39,8 +40,35 @@ class CLIDisplay:
         print("="*self.width)
         print("🔗 Happy reading! 📖\n")
     
-    def _print_paper(self, paper: Dict, rank: int) -> None:
-        """Print a single paper"""
+    def print_search_results(self, query: str, results: List[Dict], seconds: float = None) -> None:
+        """
+        Print search results to console
+        
+        Args:
+            query: The search query
+            results: Matching papers with scores
+            seconds: Time the search took
+        """
+        timing = f" in {seconds * 1000:.0f} ms" if seconds is not None else ""
+        if not results:
+            print(f"No papers found for '{query}'{timing}.")
+            return
+        
+        print("\n" + "="*self.width)
+        print(f"🔍 {len(results)} RESULTS FOR '{query}'{timing}")
+        print("="*self.width)
+        
+        for i, paper in enumerate(results, 1):
+            self._print_paper(paper, i, reasons_label="Matched by")
+            if i < len(results):
+                print("-" * self.width)
+        
+        print("="*self.width)
+    
+    def _print_paper(self, paper: Dict, rank: int, reasons_label: str = "Why recommended") -> None:
+        """Print a single paper (a Paper record or dictionary)"""
+        if hasattr(paper, 'to_dict'):
+            paper = paper.to_dict()
         title = paper.get('title', 'No title')
         authors = paper.get('authors', [])
         abstract = paper.get('abstract', 'No abstract')
@@ -65,12 +93,13 @@ class CLIDisplay:
         # Print recommendation reasons if available
         reasons = paper.get('reasons', [])
         if reasons:
-            print(f"   Why recommended: {', '.join(reasons)}")
+            print(f"   {reasons_label}: {', '.join(reasons)}")
         
         # Print URLs if available
         urls = []
         if paper.get('arxiv_url'):
-            urls.append(f"arXiv: {paper['arxiv_url']}")
+            site = 'OpenReview' if paper.get('source') == 'openreview' else 'arXiv'
+            urls.append(f"{site}: {paper['arxiv_url']}")
         if paper.get('pdf_url'):
             urls.append(f"PDF: {paper['pdf_url']}")
         
@@ -93,14 +122,20 @@ class CLIDisplay:
             avg_score = sum(p.get('score', 0) for p in recommendations) / len(recommendations)
             print(f"Average recommendation score: {avg_score:.3f}")
     
-    def run_interactive_mode(self) -> None:
-        """Run interactive CLI mode"""
+    def run_interactive_mode(self, search: Callable[[str], List[Dict]] = None) -> None:
+        """
+        Run interactive CLI mode
+        
+        Args:
+            search: Returns the papers matching a query (None disables search)
+        """
         print("\n🤖 Paper Daily - Interactive Mode")
         print("Commands: 'help', 'fetch', 'recommend', 'search <query>', 'quit'")
         
         while True:
             try:
-                command = input("\npaper-daily> ").strip().lower()
+                line = input("\npaper-daily> ").strip()
+                command = line.lower()
                 
                 if command == 'quit' or command == 'exit':
                     print("Goodbye! 👋")
@@ -110,8 +145,13 @@ class CLIDisplay:
                 elif command == 'fetch':
                     print("Fetching latest papers... (not implemented in warm-up)")
                 elif command.startswith('search '):
-                    query = command[7:]
-                    print(f"Searching for: '{query}' (not implemented in warm-up)")
+                    query = line[7:].strip()
+                    if search is None:
+                        print("Search is not available.")
+                        continue
+                    start = time.perf_counter()
+                    results = search(query)
+                    self.print_search_results(query, results, time.perf_counter() - start)
                 elif command == 'recommend':
                     print("Generating recommendations... (not implemented in warm-up)")
                 else:
@@ -131,7 +171,7 @@ Available commands:
   help                 - Show this help message
   fetch               - Fetch latest papers from arXiv and OpenReview
   recommend           - Generate Top 10 recommendations
-  search <query>      - Search papers by keyword
+  search <query>      - Search stored papers (keywords + meaning)
   quit/exit           - Exit the program
 
 Example usage:
@@ -1,44 +1,206 @@
 """
 Embedder for Paper Daily
 
-Generates semantic embeddings for paper text using sentence transformers.
+Generates semantic embeddings for paper text using sentence transformers,
+run either through PyTorch or, exported to ONNX, through ONNX Runtime.
+sentence-transformers (and torch) are only imported when a model is first
+needed, and each model is loaded once per process.
 """
 
 import numpy as np
-from typing import List, Dict, Union
+from typing import List, Dict, Optional, Tuple, Union
 import os
+import threading
 
-try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+from data_acquisition.paper import PaperBatch
+from utils.lazy_import import import_optional, is_available
+from utils.metrics import metrics
+
+from .embedding_cache import EmbeddingCache
+from .embedding_pool import EmbeddingPool
+from .onnx_encoder import ONNXRUNTIME_AVAILABLE, load_onnx_encoder
+from .similarity import cosine_similarity_matrix, top_k_similar
+
+SENTENCE_TRANSFORMERS_AVAILABLE = is_available('sentence_transformers')
+if not SENTENCE_TRANSFORMERS_AVAILABLE:
     print("Warning: sentence-transformers not available. Using mock embeddings.")
 
+BACKENDS = ('torch', 'onnx')
+
+class EmbeddingError(Exception):
+    """The model failed to encode texts"""
+
+
+_shared_models: Dict[tuple, object] = {}
+_shared_models_lock = threading.Lock()
+
+
+def get_shared_model(model_name: str, backend: str = 'torch', onnx_dir: str = 'data/models/onnx',
+                     quantize: bool = False, num_threads: int = None,
+                     max_seq_length: Optional[int] = None):
+    """
+    Get a sentence-transformers model, loading it once per process
+    
+    The first call imports sentence-transformers and torch (or, for the
+    onnx backend, onnxruntime, exporting the model first if needed); every
+    later call, from any Embedder or thread, with the same settings returns
+    the same model object. A token limit is part of those settings, so
+    setting it never changes the model another Embedder is using.
+    
+    Args:
+        model_name: Name of the sentence transformer model
+        backend: 'torch' or 'onnx'
+        onnx_dir: Directory holding exported ONNX models
+        quantize: Use the int8 quantized ONNX model
+        num_threads: Intra-op threads for ONNX Runtime
+        max_seq_length: Token limit applied to each text (None = the model's own)
+        
+    Returns:
+        The model, or None if the backend's dependencies can't be imported
+    """
+    key = (model_name, backend, quantize, max_seq_length)
+    with _shared_models_lock:
+        model = _shared_models.get(key)
+        if model is None:
+            with metrics.span('embedder.load_model', log=True, model=model_name, backend=backend):
+                if backend == 'onnx':
+                    model = load_onnx_encoder(model_name, onnx_dir, quantize, num_threads)
+                else:
+                    module = import_optional('sentence_transformers')
+                    if module is None:
+                        return None
+                    model = module.SentenceTransformer(model_name)
+                if max_seq_length:
+                    # Never raise the model's own positional limit
+                    model.max_seq_length = min(model.max_seq_length or max_seq_length,
+                                               max_seq_length)
+            print(f"Loaded embedding model: {model_name} ({backend}{', int8' if quantize else ''})")
+            _shared_models[key] = model
+        return model
+
 
 class Embedder:
     """Generates semantic embeddings for text"""
     
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", batch_size: int = 32,
+                 max_seq_length: int = 512, cache_dir: Optional[str] = None,
+                 use_mock: bool = False, backend: str = 'torch',
+                 onnx_dir: str = 'data/models/onnx', quantize: bool = False,
+                 num_threads: int = None, pool_workers: int = 0,
+                 threads_per_worker: int = 1):
         """
         Initialize the embedder
         
         Args:
             model_name: Name of the sentence transformer model
+            batch_size: Number of texts encoded per forward pass
+            max_seq_length: Token limit applied to each text
+            cache_dir: Directory for the persistent embedding cache (None disables it)
+            use_mock: Skip loading the model and always return mock embeddings
+            backend: 'torch' runs the model with PyTorch, 'onnx' with ONNX Runtime
+            onnx_dir: Directory the model is exported to for the onnx backend
+            quantize: Use int8 dynamic quantization (onnx backend only)
+            num_threads: Intra-op threads for ONNX Runtime (None lets it decide)
+            pool_workers: Encode in this many worker processes, each with its own
+                model (0 = in this process)
+            threads_per_worker: Intra-op threads each pool worker may use
         """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown embedding backend: {backend}")
+        
         self.model_name = model_name
-        self.model = None
-        self.embedding_dim = 384  # Default for all-MiniLM-L6-v2
+        self.backend = backend
+        self.onnx_dir = onnx_dir
+        self.quantize = quantize and backend == 'onnx'
+        self.num_threads = num_threads
+        self.pool_workers = max(0, pool_workers or 0)
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.batch_size = max(1, batch_size)
+        self.max_seq_length = max_seq_length
+        self.cache_dir = cache_dir
+        self.cache = None
+        
+        # The model is loaded on first use, see the model property
+        self._model = None
+        self._embedding_dim = 384  # Default for all-MiniLM-L6-v2
+        backend_available = (ONNXRUNTIME_AVAILABLE if backend == 'onnx'
+                             else SENTENCE_TRANSFORMERS_AVAILABLE)
+        if backend == 'onnx' and not ONNXRUNTIME_AVAILABLE and not use_mock:
+            print("Warning: onnxruntime or tokenizers not available. Using mock embeddings.")
+        self._load_attempted = use_mock or not backend_available
+        self._load_lock = threading.Lock()
         
-        if SENTENCE_TRANSFORMERS_AVAILABLE:
+    @property
+    def model(self):
+        """The sentence transformer, loaded on first access (None means mock embeddings)"""
+        if not self._load_attempted:
+            self._load_model()
+        return self._model
+    
+    @property
+    def embedding_dim(self) -> int:
+        """Embedding dimension of the model (loads it if needed)"""
+        if not self._load_attempted:
+            self._load_model()
+        return self._embedding_dim
+    
+    def _load_model(self) -> None:
+        """Attach the shared model and open the embedding cache"""
+        with self._load_lock:
+            if self._load_attempted:
+                return
             try:
-                self.model = SentenceTransformer(model_name)
-                self.embedding_dim = self.model.get_sentence_embedding_dimension()
-                print(f"Loaded embedding model: {model_name}")
+                if self.pool_workers:
+                    with metrics.span('embedder.start_pool', log=True, workers=self.pool_workers):
+                        model = EmbeddingPool(self.model_name, self.pool_workers,
+                                              self.threads_per_worker, self.backend,
+                                              self.onnx_dir, self.quantize, self.max_seq_length)
+                else:
+                    model = get_shared_model(self.model_name, self.backend, self.onnx_dir,
+                                             self.quantize, self.num_threads, self.max_seq_length)
+                if model is not None:
+                    self._embedding_dim = model.get_sentence_embedding_dimension()
+                    
+                    # Mock embeddings are random, so only cache real model output
+                    if self.cache_dir:
+                        self.cache = EmbeddingCache(self.cache_dir, self.cache_name,
+                                                    self._embedding_dim)
+                    self._model = model
             except Exception as e:
-                print(f"Error loading model {model_name}: {e}")
-                self.model = None
+                print(f"Error loading model {self.model_name}: {e}")
+            finally:
+                self._load_attempted = True
+    
+    @property
+    def cache_name(self) -> str:
+        """
+        Embedding cache namespace
+        
+        ONNX output differs slightly, so it isn't shared, and the token
+        limit decides how much of each text is embedded.
+        """
+        backend = '' if self.backend == 'torch' else f"-onnx{'-int8' if self.quantize else ''}"
+        return f"{self.model_name}{backend}-len{self.max_seq_length}"
+    
+    def load_in_background(self) -> threading.Thread:
+        """
+        Start loading the model on a daemon thread
+        
+        Lets the model load overlap other startup work such as fetching.
+        
+        Returns:
+            The loading thread
+        """
+        thread = threading.Thread(target=self._load_model, name='embedder-load', daemon=True)
+        thread.start()
+        return thread
         
+    def close(self) -> None:
+        """Shut down the worker processes of pool mode"""
+        if isinstance(self._model, EmbeddingPool):
+            self._model.close()
+            self._model = None
+    
     def generate_embedding(self, text: str) -> np.ndarray:
         """
         Generate embedding for a single text
@@ -51,33 +213,149 @@ class Embedder:
         """
         if self.model is not None:
             try:
-                embedding = self.model.encode(text, convert_to_numpy=True)
-                return embedding
-            except Exception as e:
+                return self._encode(text)
+            except EmbeddingError as e:
                 print(f"Error generating embedding: {e}")
                 return self._generate_mock_embedding()
         else:
             return self._generate_mock_embedding()
     
-    def generate_embeddings_batch(self, texts: List[str]) -> np.ndarray:
+    def _encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """
+        Encode with the model
+        
+        Raises:
+            EmbeddingError: The model failed (e.g., ran out of memory)
+        """
+        try:
+            with metrics.span('embedder.encode'):
+                return self.model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+        except Exception as e:
+            metrics.increment('embedder.encode_errors')
+            raise EmbeddingError(str(e)) from e
+    
+    def generate_embeddings_batch(self, texts: List[str], fallback: bool = True) -> np.ndarray:
         """
         Generate embeddings for a batch of texts
         
+        Mock embeddings stand in when no model is loaded or, unless fallback
+        is off, when encoding fails; paper embeddings, which are cached and
+        indexed, go through generate_paper_embeddings instead, which never
+        falls back.
+        
         Args:
             texts: List of input texts
+            fallback: Return mock embeddings if encoding fails
             
         Returns:
             Numpy array of embeddings
+            
+        Raises:
+            EmbeddingError: Encoding failed and fallback is off
         """
+        metrics.observe('embedder.batch_size', len(texts))
+        metrics.increment('embedder.texts', len(texts))
         if self.model is not None:
             try:
-                embeddings = self.model.encode(texts, convert_to_numpy=True)
-                return embeddings
-            except Exception as e:
+                return self._encode(texts)
+            except EmbeddingError as e:
+                if not fallback:
+                    raise
                 print(f"Error generating batch embeddings: {e}")
-                return np.array([self._generate_mock_embedding() for _ in texts])
+                return self._generate_mock_embeddings(len(texts))
         else:
-            return np.array([self._generate_mock_embedding() for _ in texts])
+            return self._generate_mock_embeddings(len(texts))
+    
+    def generate_paper_embeddings(self, papers: Union[PaperBatch, List[Dict]]
+                                  ) -> Tuple[List[str], np.ndarray]:
+        """
+        Generate embeddings for many papers in length-bucketed batches
+        
+        Papers already in the embedding cache are served from it; the rest are
+        sorted by token length so each batch holds texts of similar size
+        (minimizing padding), encoded batch_size at a time (batch_size per
+        worker in pool mode), and written back in input order. A PaperBatch
+        also gets the matrix as its embeddings column. Without a model the
+        rows are mock embeddings.
+        
+        Args:
+            papers: PaperBatch, or Paper records / dictionaries with 'id', 'title' and 'abstract'
+            
+        Returns:
+            Tuple of (paper ids, contiguous float32 matrix with one row per paper)
+        
+        Raises:
+            EmbeddingError: A batch failed to encode; the batches that succeeded
+                are cached, nothing is returned for the papers
+        """
+        batch = papers if isinstance(papers, PaperBatch) else None
+        if batch is not None:
+            papers = batch.papers
+            paper_ids = list(batch.ids)
+        else:
+            paper_ids = [paper.get('id') for paper in papers]
+        embeddings = np.empty((len(papers), self.embedding_dim), dtype=np.float32)
+        if batch is not None:
+            batch.embeddings = embeddings
+        if not papers:
+            return paper_ids, embeddings
+        
+        texts = [self._paper_text(paper) for paper in papers]
+        pending = np.arange(len(papers))
+        
+        if self.cache is not None:
+            text_hashes = [EmbeddingCache.text_hash(text) for text in texts]
+            hit_positions, cached = self.cache.get_many(text_hashes)
+            embeddings[hit_positions] = cached
+            pending = np.setdiff1d(pending, hit_positions)
+            metrics.increment('embedder.cache_hits', len(hit_positions))
+            metrics.increment('embedder.cache_misses', len(pending))
+        
+        if len(pending):
+            lengths = self._token_lengths([texts[i] for i in pending])
+            order = pending[np.argsort(lengths, kind='stable')]
+            
+            step = self.batch_size * max(1, self.pool_workers)
+            encoded = []
+            error = None
+            for start in range(0, len(order), step):
+                batch_idx = order[start:start + step]
+                if self.model is None:
+                    embeddings[batch_idx] = self.generate_embeddings_batch([texts[i] for i in batch_idx])
+                    continue
+                metrics.observe('embedder.batch_size', len(batch_idx))
+                metrics.increment('embedder.texts', len(batch_idx))
+                try:
+                    embeddings[batch_idx] = self._encode([texts[i] for i in batch_idx])
+                except EmbeddingError as e:
+                    error = e
+                    break
+                encoded.append(batch_idx)
+            
+            # Only rows the model produced are cached
+            if self.cache is not None and encoded:
+                done = np.concatenate(encoded)
+                self.cache.put_many([text_hashes[i] for i in done], embeddings[done],
+                                    [paper_ids[i] for i in done])
+            if error is not None:
+                if batch is not None:
+                    batch.embeddings = None
+                raise error
+        
+        return paper_ids, embeddings
+    
+    def _token_lengths(self, texts: List[str]) -> np.ndarray:
+        """Token counts (capped at max_seq_length) used to bucket texts by size"""
+        tokenizer = getattr(self.model, 'tokenizer', None)
+        if tokenizer is not None:
+            try:
+                encoded = tokenizer(texts, add_special_tokens=False, truncation=True,
+                                    max_length=self.max_seq_length)
+                return np.array([len(ids) for ids in encoded['input_ids']])
+            except Exception as e:
+                print(f"Error tokenizing texts, falling back to word counts: {e}")
+        
+        return np.array([min(len(text.split()), self.max_seq_length) for text in texts])
     
     def generate_paper_embedding(self, paper: Dict) -> np.ndarray:
         """
@@ -89,19 +367,36 @@ class Embedder:
         Returns:
             Numpy array representing the paper embedding
         """
-        # Combine title and abstract
+        text = self._paper_text(paper)
+        if self.model is None or self.cache is None:
+            return self.generate_embedding(text)
+        
+        text_hash = EmbeddingCache.text_hash(text)
+        cached = self.cache.get(text_hash)
+        if cached is not None:
+            return cached
+        
+        # Raises EmbeddingError rather than caching a mock embedding
+        embedding = self._encode(text)
+        self.cache.put(text_hash, embedding, paper.get('id'))
+        return embedding
+    
+    def _paper_text(self, paper: Dict) -> str:
+        """Combine title and abstract into the text that is embedded"""
         title = paper.get('title', '')
         abstract = paper.get('abstract', '')
         
         # Create combined text with more weight on title
-        combined_text = f"{title}. {abstract}"
-        
-        return self.generate_embedding(combined_text)
+        return f"{title}. {abstract}"
     
     def _generate_mock_embedding(self) -> np.ndarray:
         """Generate a mock embedding for testing purposes"""
-        # Generate a random embedding with the expected dimension
-        return np.random.rand(self.embedding_dim).astype(np.float32)
+        # Zero-mean so unrelated mock papers are not all near-duplicates
+        return np.random.randn(self.embedding_dim).astype(np.float32)
+    
+    def _generate_mock_embeddings(self, count: int) -> np.ndarray:
+        """Generate a matrix of mock embeddings for testing purposes"""
+        return np.random.randn(count, self.embedding_dim).astype(np.float32)
     
     def compute_similarity(self, embedding1: np.ndarray, embedding2: np.ndarray) -> float:
         """
@@ -130,6 +425,35 @@ class Embedder:
             print(f"Error computing similarity: {e}")
             return 0.0
     
+    def compute_similarity_matrix(self, queries: np.ndarray,
+                                  corpus: np.ndarray = None) -> np.ndarray:
+        """
+        Compute cosine similarities between every query and corpus embedding
+        
+        Args:
+            queries: Query embedding or matrix of query embeddings
+            corpus: Corpus embedding matrix (defaults to the queries themselves)
+            
+        Returns:
+            Similarity matrix of shape (n_queries, n_corpus)
+        """
+        return cosine_similarity_matrix(queries, corpus)
+    
+    def find_most_similar(self, queries: np.ndarray, corpus: np.ndarray,
+                          k: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar corpus embeddings for each query
+        
+        Args:
+            queries: Query embedding or matrix of query embeddings
+            corpus: Corpus embedding matrix
+            k: Number of neighbours per query
+            
+        Returns:
+            Tuple of (similarity scores, corpus row indices), best first
+        """
+        return top_k_similar(queries, corpus, k)
+    
     def get_model_info(self) -> Dict:
         """
         Get information about the loaded model
@@ -139,7 +463,15 @@ class Embedder:
         """
         return {
             'model_name': self.model_name,
-            'embedding_dimension': self.embedding_dim,
-            'model_loaded': self.model is not None,
-            'sentence_transformers_available': SENTENCE_TRANSFORMERS_AVAILABLE
+            'backend': self.backend,
+            'quantized': self.quantize,
+            'pool_workers': self.pool_workers,
+            'threads_per_worker': self.threads_per_worker,
+            'embedding_dimension': self._embedding_dim,
+            'model_loaded': self._model is not None,
+            'batch_size': self.batch_size,
+            'max_seq_length': self.max_seq_length,
+            'cache': dict(self.cache.stats, size=len(self.cache)) if self.cache else None,
+            'sentence_transformers_available': SENTENCE_TRANSFORMERS_AVAILABLE,
+            'onnxruntime_available': ONNXRUNTIME_AVAILABLE
         } 
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Embedding Cache for Paper Daily
+
+Content-addressed store of paper embeddings keyed by model name and text hash,
+so only new or revised papers need to be encoded.
+"""
+
+import hashlib
+import os
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Append-only, memory-mapped float32 embedding store"""
+
+    def __init__(self, cache_dir: str = "data/embeddings", model_name: str = "all-MiniLM-L6-v2",
+                 embedding_dim: int = 384):
+        """
+        Initialize the embedding cache
+
+        Args:
+            cache_dir: Root directory for cached embeddings
+            model_name: Model the embeddings were produced with (one store per model)
+            embedding_dim: Embedding dimension of the model
+        """
+        self.model_name = model_name
+        self.embedding_dim = embedding_dim
+        self.cache_dir = os.path.join(cache_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+        self.vectors_path = os.path.join(self.cache_dir, 'vectors.f32')
+        self.index_path = os.path.join(self.cache_dir, 'index.tsv')
+        self.stats = {'hits': 0, 'misses': 0}
+
+        self._lock = threading.Lock()
+        self._offsets: Dict[str, int] = {}
+        self._vectors: Optional[np.memmap] = None
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Hash the exact text that is embedded"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def _load_index(self) -> None:
+        """Read the hash -> row offset index, ignoring rows past the vectors file"""
+        row_bytes = self.embedding_dim * 4
+        rows_on_disk = 0
+        if os.path.exists(self.vectors_path):
+            size = os.path.getsize(self.vectors_path)
+            rows_on_disk = size // row_bytes
+            if size % row_bytes:
+                # Drop a partially written trailing row so appends stay aligned
+                with open(self.vectors_path, 'r+b') as f:
+                    f.truncate(rows_on_disk * row_bytes)
+
+        if os.path.exists(self.index_path):
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    parts = line.rstrip('\n').split('\t')
+                    if len(parts) != 3:
+                        continue
+                    text_hash, _paper_id, offset = parts
+                    if int(offset) < rows_on_disk:
+                        self._offsets[text_hash] = int(offset)
+
+        self._rows = rows_on_disk
+
+    def _mapped_vectors(self) -> np.memmap:
+        """Memory-map the vectors file, remapping after it grows"""
+        if self._vectors is None or self._vectors.shape[0] != self._rows:
+            self._vectors = np.memmap(self.vectors_path, dtype=np.float32, mode='r',
+                                      shape=(self._rows, self.embedding_dim))
+        return self._vectors
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, text_hash: str) -> bool:
+        return text_hash in self._offsets
+
+    def get(self, text_hash: str) -> Optional[np.ndarray]:
+        """
+        Look up one embedding
+
+        Args:
+            text_hash: Hash returned by text_hash()
+
+        Returns:
+            Read-only view into the memory-mapped store, or None on a miss
+        """
+        with self._lock:
+            offset = self._offsets.get(text_hash)
+            if offset is None:
+                self.stats['misses'] += 1
+                return None
+            self.stats['hits'] += 1
+            return self._mapped_vectors()[offset]
+
+    def get_many(self, text_hashes: List[str]) -> Tuple[List[int], np.ndarray]:
+        """
+        Look up many embeddings at once
+
+        Args:
+            text_hashes: Hashes returned by text_hash()
+
+        Returns:
+            Tuple of (positions in text_hashes that hit, matrix of their embeddings)
+        """
+        with self._lock:
+            positions = []
+            offsets = []
+            for i, text_hash in enumerate(text_hashes):
+                offset = self._offsets.get(text_hash)
+                if offset is not None:
+                    positions.append(i)
+                    offsets.append(offset)
+
+            self.stats['hits'] += len(positions)
+            self.stats['misses'] += len(text_hashes) - len(positions)
+
+            if not offsets:
+                return positions, np.empty((0, self.embedding_dim), dtype=np.float32)
+            return positions, self._mapped_vectors()[offsets]
+
+    def put_many(self, text_hashes: List[str], embeddings: np.ndarray,
+                 paper_ids: List[str] = None) -> None:
+        """
+        Append embeddings for hashes not yet stored
+
+        Args:
+            text_hashes: Hashes returned by text_hash()
+            embeddings: Matrix with one row per hash
+            paper_ids: Optional paper ids recorded alongside each hash
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.embedding_dim)
+        if paper_ids is None:
+            paper_ids = [''] * len(text_hashes)
+
+        with self._lock:
+            new_rows = []
+            index_lines = []
+            seen = set()
+            for i, text_hash in enumerate(text_hashes):
+                if text_hash in self._offsets or text_hash in seen:
+                    continue
+                seen.add(text_hash)
+                index_lines.append(f"{text_hash}\t{paper_ids[i] or ''}\t{self._rows + len(new_rows)}\n")
+                new_rows.append(i)
+
+            if not new_rows:
+                return
+
+            # Vectors are written before the index so a crash never indexes missing rows
+            with open(self.vectors_path, 'ab') as f:
+                f.write(np.ascontiguousarray(embeddings[new_rows]).tobytes())
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.writelines(index_lines)
+
+            for line in index_lines:
+                text_hash, _paper_id, offset = line.rstrip('\n').split('\t')
+                self._offsets[text_hash] = int(offset)
+            self._rows += len(new_rows)
+
+    def put(self, text_hash: str, embedding: np.ndarray, paper_id: str = None) -> None:
+        """Store a single embedding"""
+        self.put_many([text_hash], embedding, [paper_id])
@@ -0,0 +1,165 @@
+"""
+Embedding Pool for Paper Daily
+
+Shards embedding work across worker processes, each holding its own copy
+of the model with a fixed number of intra-op threads, so one host's cores
+are used by several independent forward passes instead of one. Workers
+write their rows straight into a shared-memory output matrix, so only the
+input texts are pickled.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+
+# Model loaded by _init_worker in each worker process
+_worker_model = None
+
+
+def _init_worker(model_name: str, backend: str, onnx_dir: str, quantize: bool,
+                 threads: int, max_seq_length: int) -> None:
+    """Load the model once in a fresh worker process, limited to `threads` threads"""
+    global _worker_model
+    for variable in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[variable] = str(threads)
+
+    from utils.lazy_import import import_optional
+    from .embedder import get_shared_model
+
+    if backend == 'torch':
+        torch = import_optional('torch')
+        if torch is not None:
+            torch.set_num_threads(threads)
+            try:
+                torch.set_num_interop_threads(1)
+            except RuntimeError:
+                pass  # Already set once parallel work ran
+
+    try:
+        _worker_model = get_shared_model(model_name, backend, onnx_dir, quantize, threads,
+                                         max_seq_length)
+    except Exception as e:
+        print(f"Error loading model {model_name} in embedding worker {os.getpid()}: {e}")
+        _worker_model = None
+
+
+def _worker_dimension() -> Optional[int]:
+    """Embedding dimension of the worker's model (None if it failed to load)"""
+    if _worker_model is None:
+        return None
+    return _worker_model.get_sentence_embedding_dimension()
+
+
+def _encode_shard(shm_name: str, shape: Tuple[int, int], start: int, texts: List[str]) -> int:
+    """Encode texts into rows start.. of the shared output matrix"""
+    if _worker_model is None:
+        raise RuntimeError(f"Embedding worker {os.getpid()} has no model")
+
+    embeddings = _worker_model.encode(texts, batch_size=len(texts), convert_to_numpy=True)
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        output = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+        output[start:start + len(texts)] = embeddings
+        del output
+    finally:
+        shm.close()
+    return len(texts)
+
+
+class EmbeddingPool:
+    """
+    Process pool that encodes like a single SentenceTransformer
+
+    Exposes encode(), get_sentence_embedding_dimension() and max_seq_length,
+    so the Embedder can use it in place of an in-process model.
+    """
+
+    def __init__(self, model_name: str, workers: int = None, threads_per_worker: int = 1,
+                 backend: str = 'torch', onnx_dir: str = 'data/models/onnx',
+                 quantize: bool = False, max_seq_length: int = 512):
+        """
+        Start the worker processes and load the model in each
+
+        Args:
+            model_name: Name of the sentence transformer model
+            workers: Number of worker processes (defaults to CPU count / threads_per_worker)
+            threads_per_worker: Intra-op threads each worker's model may use
+            backend: 'torch' or 'onnx'
+            onnx_dir: Directory holding exported ONNX models
+            quantize: Use the int8 quantized ONNX model
+            max_seq_length: Token limit applied to each text
+        """
+        self.model_name = model_name
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.workers = workers or max(1, (os.cpu_count() or 1) // self.threads_per_worker)
+        self.max_seq_length = max_seq_length
+
+        # Forking a process that already runs torch or OpenMP threads can deadlock
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(model_name, backend, onnx_dir, quantize, self.threads_per_worker,
+                      max_seq_length))
+
+        # Start every worker now so the first batch doesn't wait for model loads
+        dimensions = [future.result() for future in
+                      [self._executor.submit(_worker_dimension) for _ in range(self.workers)]]
+        if None in dimensions:
+            self.close()
+            raise RuntimeError(f"Embedding workers could not load {model_name}")
+        self._embedding_dim = dimensions[0]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._embedding_dim
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               convert_to_numpy: bool = True, **_kwargs) -> np.ndarray:
+        """
+        Encode sentences across the workers
+
+        Consecutive shards of at most batch_size sentences are handed to
+        whichever worker is free; results land in input order. Small inputs
+        are split into smaller shards so every worker gets one.
+
+        Args:
+            sentences: A sentence or list of sentences
+            batch_size: Maximum sentences per shard
+            convert_to_numpy: Accepted for SentenceTransformer compatibility
+
+        Returns:
+            float32 array, one row per sentence (1-D for a single sentence)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+        shape = (len(texts), self._embedding_dim)
+        if not texts:
+            return np.empty(shape, dtype=np.float32)
+
+        shard_size = max(1, min(batch_size, -(-len(texts) // self.workers)))
+        shm = shared_memory.SharedMemory(create=True, size=shape[0] * shape[1] * 4)
+        try:
+            futures = [self._executor.submit(_encode_shard, shm.name, shape, start,
+                                             texts[start:start + shard_size])
+                       for start in range(0, len(texts), shard_size)]
+            # Let every shard finish before the block is unlinked, even on errors
+            wait(futures)
+            for future in futures:
+                future.result()
+            output = np.ndarray(shape, dtype=np.float32, buffer=shm.buf)
+            embeddings = output.copy()
+            del output
+        finally:
+            shm.close()
+            shm.unlink()
+
+        return embeddings[0] if single else embeddings
+
+    def close(self) -> None:
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
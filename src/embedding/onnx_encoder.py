@@ -0,0 +1,259 @@
+"""
+ONNX Runtime Encoder for Paper Daily
+
+Runs a sentence-transformers model exported to ONNX on CPU, optionally
+with int8 dynamic quantization, without importing torch. The export is done
+once per model with export_onnx_model() (which does need
+sentence-transformers and torch); OnnxSentenceEncoder then serves it through
+the part of the SentenceTransformer interface the Embedder uses.
+"""
+
+import json
+import os
+import re
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+from utils.lazy_import import import_optional, is_available
+
+ONNXRUNTIME_AVAILABLE = is_available('onnxruntime') and is_available('tokenizers')
+
+MODEL_FILE = 'model.onnx'
+QUANTIZED_MODEL_FILE = 'model.int8.onnx'
+CONFIG_FILE = 'encoder_config.json'
+TOKENIZER_FILE = 'tokenizer.json'
+
+SUPPORTED_MODULES = {'Transformer', 'Pooling', 'Normalize'}
+
+
+def model_dir_for(onnx_dir: str, model_name: str) -> str:
+    """Directory holding the export of one model"""
+    return os.path.join(onnx_dir, re.sub(r'[^A-Za-z0-9_.-]', '_', model_name))
+
+
+def export_onnx_model(model_name: str, model_dir: str, opset: int = 17) -> str:
+    """
+    Export a sentence-transformers model to ONNX
+
+    The transformer is exported with dynamic batch and sequence axes; pooling
+    and normalization are recorded in the encoder config and applied in
+    numpy, so the exported graph stays a plain encoder. Attention is exported
+    in its eager form, which ONNX Runtime runs faster than the traced SDPA
+    graph.
+
+    Args:
+        model_name: Name or path of the sentence transformer model
+        model_dir: Output directory
+        opset: ONNX opset version
+
+    Returns:
+        Path of the exported model
+    """
+    sentence_transformers = import_optional('sentence_transformers')
+    torch = import_optional('torch')
+    if sentence_transformers is None or torch is None:
+        raise ImportError("Exporting to ONNX needs sentence-transformers and torch")
+
+    model = sentence_transformers.SentenceTransformer(model_name, device='cpu')
+    module_types = [type(module).__name__ for module in model]
+    if not set(module_types) <= SUPPORTED_MODULES:
+        raise ValueError(f"Can't export {model_name}: unsupported modules {module_types}")
+
+    transformer = model[0]
+    if hasattr(transformer.auto_model, 'set_attn_implementation'):
+        transformer.auto_model.set_attn_implementation('eager')
+    pooling = next((module for module in model if hasattr(module, 'get_pooling_mode_str')), None)
+    tokenizer = transformer.tokenizer
+    sample = tokenizer(['An example sentence.', 'Another one'], padding=True, return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids')
+                   if name in sample]
+
+    class TokenEmbeddings(torch.nn.Module):
+        def __init__(self, auto_model):
+            super().__init__()
+            self.auto_model = auto_model
+
+        def forward(self, *inputs):
+            return self.auto_model(**dict(zip(input_names, inputs)), return_dict=False)[0]
+
+    os.makedirs(model_dir, exist_ok=True)
+    path = os.path.join(model_dir, MODEL_FILE)
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names + ['token_embeddings']}
+    with torch.no_grad():
+        torch.onnx.export(TokenEmbeddings(transformer.auto_model.eval()),
+                          tuple(sample[name] for name in input_names), path,
+                          input_names=input_names, output_names=['token_embeddings'],
+                          dynamic_axes=dynamic_axes, opset_version=opset, dynamo=False)
+
+    tokenizer.save_pretrained(model_dir)
+    config = {
+        'model_name': model_name,
+        'input_names': input_names,
+        'pooling': pooling.get_pooling_mode_str() if pooling is not None else 'mean',
+        'normalize': 'Normalize' in module_types,
+        'max_seq_length': model.max_seq_length,
+        'dimension': model.get_sentence_embedding_dimension(),
+        'pad_token_id': tokenizer.pad_token_id or 0,
+        'pad_token': tokenizer.pad_token or '[PAD]'
+    }
+    with open(os.path.join(model_dir, CONFIG_FILE), 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2)
+
+    print(f"Exported {model_name} to {path}")
+    return path
+
+
+def quantize_onnx_model(model_dir: str) -> str:
+    """
+    Write an int8 dynamically quantized copy of an exported model
+
+    Weights of MatMul/Gemm nodes are stored as int8 and activations are
+    quantized on the fly, which roughly halves CPU inference time for
+    MiniLM-sized models at a small accuracy cost.
+
+    Args:
+        model_dir: Directory written by export_onnx_model()
+
+    Returns:
+        Path of the quantized model
+    """
+    quantization = import_optional('onnxruntime.quantization')
+    if quantization is None:
+        raise ImportError("Quantizing needs onnxruntime (and onnx)")
+
+    path = os.path.join(model_dir, QUANTIZED_MODEL_FILE)
+    quantization.quantize_dynamic(os.path.join(model_dir, MODEL_FILE), path,
+                                  weight_type=quantization.QuantType.QInt8)
+    print(f"Quantized {model_dir} to int8")
+    return path
+
+
+class FastTokenizer:
+    """Adapts a tokenizers.Tokenizer to the transformers call used for length bucketing"""
+
+    def __init__(self, tokenizer):
+        self.tokenizer = tokenizer
+        self.tokenizer.no_padding()
+
+    def __call__(self, texts: List[str], add_special_tokens: bool = True,
+                 truncation: bool = True, max_length: Optional[int] = None) -> Dict:
+        if truncation and max_length:
+            self.tokenizer.enable_truncation(max_length)
+        else:
+            self.tokenizer.no_truncation()
+        encodings = self.tokenizer.encode_batch(texts, add_special_tokens=add_special_tokens)
+        return {'input_ids': [encoding.ids for encoding in encodings]}
+
+
+class OnnxSentenceEncoder:
+    """Encodes sentences with an exported model on ONNX Runtime"""
+
+    def __init__(self, model_dir: str, quantized: bool = False, num_threads: int = None):
+        """
+        Load an exported model
+
+        Args:
+            model_dir: Directory written by export_onnx_model()
+            quantized: Use the int8 model written by quantize_onnx_model()
+            num_threads: Intra-op threads for ONNX Runtime (None lets it decide)
+        """
+        onnxruntime = import_optional('onnxruntime')
+        tokenizers = import_optional('tokenizers')
+        if onnxruntime is None or tokenizers is None:
+            raise ImportError("The ONNX backend needs onnxruntime and tokenizers")
+
+        with open(os.path.join(model_dir, CONFIG_FILE), 'r', encoding='utf-8') as f:
+            self.config = json.load(f)
+        self.model_dir = model_dir
+        self.quantized = quantized
+        self.max_seq_length = self.config['max_seq_length']
+
+        self._tokenizer = tokenizers.Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer = FastTokenizer(tokenizers.Tokenizer.from_file(
+            os.path.join(model_dir, TOKENIZER_FILE)))
+
+        options = onnxruntime.SessionOptions()
+        options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        model_file = QUANTIZED_MODEL_FILE if quantized else MODEL_FILE
+        self.session = onnxruntime.InferenceSession(os.path.join(model_dir, model_file), options,
+                                                    providers=['CPUExecutionProvider'])
+        self.input_names = [node.name for node in self.session.get_inputs()]
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.config['dimension']
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               convert_to_numpy: bool = True, **_kwargs) -> np.ndarray:
+        """
+        Encode sentences into embeddings
+
+        Args:
+            sentences: A sentence or list of sentences
+            batch_size: Sentences per inference call
+            convert_to_numpy: Accepted for SentenceTransformer compatibility
+
+        Returns:
+            float32 array, one row per sentence (1-D for a single sentence)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        tokenizer = self._tokenizer
+        tokenizer.enable_truncation(self.max_seq_length)
+        tokenizer.enable_padding(pad_id=self.config['pad_token_id'],
+                                 pad_token=self.config['pad_token'])
+
+        embeddings = np.empty((len(texts), self.get_sentence_embedding_dimension()),
+                              dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            encodings = tokenizer.encode_batch(texts[start:start + batch_size])
+            inputs = {
+                'input_ids': np.array([e.ids for e in encodings], dtype=np.int64),
+                'attention_mask': np.array([e.attention_mask for e in encodings], dtype=np.int64),
+                'token_type_ids': np.array([e.type_ids for e in encodings], dtype=np.int64)
+            }
+            token_embeddings = self.session.run(
+                None, {name: inputs[name] for name in self.input_names})[0]
+            embeddings[start:start + len(encodings)] = self._pool(token_embeddings,
+                                                                  inputs['attention_mask'])
+
+        if self.config['normalize']:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        return embeddings[0] if single else embeddings
+
+    def _pool(self, token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+        """Reduce token embeddings to one vector per sentence like the Pooling module"""
+        mode = self.config['pooling']
+        mask = attention_mask[:, :, None].astype(np.float32)
+        if mode == 'cls':
+            return token_embeddings[:, 0]
+        if mode == 'max':
+            return np.where(mask > 0, token_embeddings, -1e9).max(axis=1)
+        summed = (token_embeddings * mask).sum(axis=1)
+        return summed / np.maximum(mask.sum(axis=1), 1e-9)
+
+
+def load_onnx_encoder(model_name: str, onnx_dir: str, quantize: bool = False,
+                      num_threads: int = None) -> OnnxSentenceEncoder:
+    """
+    Load a model for the ONNX backend, exporting and quantizing it first if needed
+
+    Args:
+        model_name: Name of the sentence transformer model
+        onnx_dir: Directory holding exported models
+        quantize: Use the int8 quantized model
+        num_threads: Intra-op threads for ONNX Runtime
+
+    Returns:
+        The encoder
+    """
+    model_dir = model_dir_for(onnx_dir, model_name)
+    if not os.path.exists(os.path.join(model_dir, MODEL_FILE)):
+        export_onnx_model(model_name, model_dir)
+    if quantize and not os.path.exists(os.path.join(model_dir, QUANTIZED_MODEL_FILE)):
+        quantize_onnx_model(model_dir)
+    return OnnxSentenceEncoder(model_dir, quantized=quantize, num_threads=num_threads)
@@ -0,0 +1,171 @@
+"""
+Similarity utilities for Paper Daily
+
+Vectorized cosine similarity over embedding matrices. Matrices are
+L2-normalized once, compared in blocks of query rows sized so each
+block of similarities fits a fixed memory budget whatever the corpus
+size, and top-k results are selected with argpartition.
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+DEFAULT_BLOCK_BYTES = 32 * 1024 * 1024
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """
+    L2-normalize each row of an embedding matrix
+
+    Args:
+        embeddings: Vector or matrix of embeddings
+
+    Returns:
+        float32 matrix with unit-length rows (zero rows stay zero)
+    """
+    embeddings = np.array(embeddings, dtype=np.float32, ndmin=2)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return embeddings / norms
+
+
+def cosine_similarity_matrix(queries: np.ndarray, corpus: np.ndarray = None,
+                             normalized: bool = False) -> np.ndarray:
+    """
+    Compute the full cosine similarity matrix between queries and a corpus
+
+    Args:
+        queries: Query vector or matrix
+        corpus: Corpus matrix (defaults to the queries themselves)
+        normalized: Whether the inputs already have unit-length rows
+
+    Returns:
+        Matrix of shape (n_queries, n_corpus)
+    """
+    if not normalized:
+        queries = normalize_rows(queries)
+        corpus = queries if corpus is None else normalize_rows(corpus)
+    elif corpus is None:
+        corpus = queries
+    return np.array(queries, ndmin=2) @ np.array(corpus, ndmin=2).T
+
+
+def block_rows(corpus_size: int, block_bytes: int = DEFAULT_BLOCK_BYTES) -> int:
+    """
+    Number of query rows whose float32 similarities to a corpus fit in block_bytes
+
+    Never less than one row, so a single row of a corpus larger than the
+    budget still exceeds it.
+    """
+    return max(1, block_bytes // (4 * max(1, corpus_size)))
+
+
+def iter_similarity_blocks(queries: np.ndarray, corpus: np.ndarray = None,
+                           block_size: Optional[int] = None, normalized: bool = False,
+                           block_bytes: int = DEFAULT_BLOCK_BYTES
+                           ) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yield the similarity matrix in row blocks of about block_bytes each
+
+    Args:
+        queries: Query matrix
+        corpus: Corpus matrix (defaults to the queries themselves)
+        block_size: Number of query rows per block (derived from block_bytes by default)
+        normalized: Whether the inputs already have unit-length rows
+        block_bytes: Memory budget of one block when block_size isn't given
+
+    Yields:
+        Tuples of (first query row in the block, block similarity matrix)
+    """
+    if not normalized:
+        queries = normalize_rows(queries)
+        corpus = queries if corpus is None else normalize_rows(corpus)
+    elif corpus is None:
+        corpus = queries
+
+    if block_size is None:
+        block_size = block_rows(len(corpus), block_bytes)
+    corpus_t = np.ascontiguousarray(corpus.T)
+    for start in range(0, len(queries), block_size):
+        yield start, queries[start:start + block_size] @ corpus_t
+
+
+def top_k_similar(queries: np.ndarray, corpus: np.ndarray, k: int = 10,
+                  block_size: Optional[int] = None, normalized: bool = False,
+                  exclude_self: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Find the k most similar corpus rows for every query
+
+    Selecting the top k of a block needs a few temporaries of the block's
+    size, so peak memory is a small multiple of DEFAULT_BLOCK_BYTES.
+
+    Args:
+        queries: Query vector or matrix
+        corpus: Corpus matrix
+        k: Number of neighbours per query
+        block_size: Number of query rows compared per block (sized to
+            DEFAULT_BLOCK_BYTES by default)
+        normalized: Whether the inputs already have unit-length rows
+        exclude_self: Skip the diagonal when queries and corpus are the same matrix
+
+    Returns:
+        Tuple of (similarity scores, corpus indices), both shaped (n_queries, k)
+        and sorted by decreasing similarity
+    """
+    if not normalized:
+        queries = normalize_rows(queries)
+        corpus = normalize_rows(corpus)
+    queries = np.array(queries, ndmin=2)
+
+    k = min(k, len(corpus) - (1 if exclude_self else 0))
+    if k <= 0:
+        empty = np.empty((len(queries), 0))
+        return empty.astype(np.float32), empty.astype(np.int64)
+
+    scores = np.empty((len(queries), k), dtype=np.float32)
+    indices = np.empty((len(queries), k), dtype=np.int64)
+
+    for start, block in iter_similarity_blocks(queries, corpus, block_size, normalized=True):
+        if exclude_self:
+            rows = np.arange(len(block))
+            block[rows, rows + start] = -np.inf
+
+        # argpartition is O(n) per row; only the k survivors are sorted
+        part = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        part_scores = np.take_along_axis(block, part, axis=1)
+        order = np.argsort(-part_scores, axis=1)
+
+        scores[start:start + len(block)] = np.take_along_axis(part_scores, order, axis=1)
+        indices[start:start + len(block)] = np.take_along_axis(part, order, axis=1)
+
+    return scores, indices
+
+
+def similar_pairs(embeddings: np.ndarray, threshold: float,
+                  block_size: Optional[int] = None,
+                  normalized: bool = False) -> List[Tuple[int, int, float]]:
+    """
+    Find all pairs of rows whose cosine similarity reaches a threshold
+
+    Args:
+        embeddings: Embedding matrix
+        threshold: Minimum cosine similarity
+        block_size: Number of rows compared per block (sized to DEFAULT_BLOCK_BYTES by default)
+        normalized: Whether the input already has unit-length rows
+
+    Returns:
+        List of (i, j, similarity) with i < j
+    """
+    if not normalized:
+        embeddings = normalize_rows(embeddings)
+
+    pairs = []
+    for start, block in iter_similarity_blocks(embeddings, block_size=block_size, normalized=True):
+        rows, cols = np.nonzero(block >= threshold)
+        rows = rows + start
+        upper = rows < cols
+        for i, j in zip(rows[upper], cols[upper]):
+            pairs.append((int(i), int(j), float(block[i - start, j])))
+    return pairs
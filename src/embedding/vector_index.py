@@ -0,0 +1,254 @@
+"""
+Vector Index for Paper Daily
+
+Stores paper embeddings for similarity search using FAISS, with exact
+(flat) and approximate (IVF, HNSW) index types and on-disk persistence.
+"""
+
+import json
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from utils.lazy_import import import_optional, is_available
+
+from .similarity import normalize_rows, top_k_similar
+
+# faiss is imported when the first index is created
+FAISS_AVAILABLE = is_available('faiss')
+if not FAISS_AVAILABLE:
+    print("Warning: faiss not available. Using brute-force numpy search.")
+
+
+INDEX_TYPES = ('flat', 'ivf', 'hnsw')
+
+
+class VectorIndex:
+    """Cosine-similarity index over paper embeddings"""
+
+    def __init__(self, index_path: str = "data/db/vector_index.faiss", embedding_dim: int = 384,
+                 index_type: str = "flat", nlist: int = 1024, nprobe: int = 16,
+                 hnsw_m: int = 32, ef_search: int = 64):
+        """
+        Initialize the vector index, loading it from disk if present
+
+        Args:
+            index_path: Path of the persisted index
+            embedding_dim: Embedding dimension
+            index_type: 'flat' (exact), 'ivf' or 'hnsw' (approximate)
+            nlist: Number of IVF clusters
+            nprobe: Number of IVF clusters visited per query
+            hnsw_m: Neighbours per HNSW node
+            ef_search: HNSW search beam width
+        """
+        if index_type not in INDEX_TYPES:
+            raise ValueError(f"index_type must be one of {INDEX_TYPES}, got '{index_type}'")
+
+        self.index_path = index_path
+        self.ids_path = f"{index_path}.ids.json"
+        self.embedding_dim = embedding_dim
+        self.index_type = index_type
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.hnsw_m = hnsw_m
+        self.ef_search = ef_search
+
+        self.paper_ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.empty((0, embedding_dim), dtype=np.float32)  # numpy fallback only
+        self._faiss = import_optional('faiss') if FAISS_AVAILABLE else None
+        self.index = self._create_index() if self._faiss is not None else None
+
+        if os.path.exists(self.index_path) and os.path.exists(self.ids_path):
+            self.load()
+
+    def _create_index(self):
+        """Create an empty FAISS index of the configured type"""
+        faiss = self._faiss
+        if self.index_type == 'hnsw':
+            index = faiss.IndexHNSWFlat(self.embedding_dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = self.ef_search
+            return index
+
+        # IVF starts flat and is rebuilt once there is enough data to train on
+        return faiss.IndexFlatIP(self.embedding_dim)
+
+    def _maybe_train_ivf(self) -> None:
+        """Switch a flat index to IVF once it holds enough vectors to train clusters"""
+        faiss = self._faiss
+        if self.index_type != 'ivf' or faiss is None:
+            return
+        if not isinstance(self.index, faiss.IndexFlat) or self.index.ntotal < self.nlist * 39:
+            return
+
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        quantizer = faiss.IndexFlatIP(self.embedding_dim)
+        index = faiss.IndexIVFFlat(quantizer, self.embedding_dim, self.nlist,
+                                   faiss.METRIC_INNER_PRODUCT)
+        index.train(vectors)
+        index.add(vectors)
+        index.nprobe = self.nprobe
+        self.index = index
+
+    def __len__(self) -> int:
+        return len(self.paper_ids)
+
+    def __contains__(self, paper_id: str) -> bool:
+        return paper_id in self._positions
+
+    def add(self, embeddings: np.ndarray, paper_ids: List[str]) -> int:
+        """
+        Add embeddings, skipping papers already indexed
+
+        Args:
+            embeddings: Matrix with one row per paper
+            paper_ids: Paper ids aligned with the rows
+
+        Returns:
+            Number of embeddings added
+        """
+        embeddings = normalize_rows(embeddings)
+        keep = []
+        for i, paper_id in enumerate(paper_ids):
+            if paper_id not in self._positions:
+                self._positions[paper_id] = len(self.paper_ids)
+                self.paper_ids.append(paper_id)
+                keep.append(i)
+
+        if not keep:
+            return 0
+
+        if self._faiss is not None:
+            self.index.add(embeddings[keep])
+            self._maybe_train_ivf()
+        else:
+            self._vectors = np.vstack([self._vectors, embeddings[keep]])
+
+        return len(keep)
+
+    def add_embedding(self, embedding: np.ndarray, paper_id: str) -> None:
+        """Add a single embedding to the index"""
+        self.add(embedding, [paper_id])
+
+    def search(self, query_embeddings: np.ndarray, k: int = 10) -> Tuple[np.ndarray, List[List[str]]]:
+        """
+        Find the k most similar papers for each query
+
+        Args:
+            query_embeddings: One query vector or a matrix of queries
+            k: Number of neighbours per query
+
+        Returns:
+            Tuple of (cosine similarity matrix, list of paper id lists per query);
+            an approximate index may find fewer than k neighbours, leaving a
+            shorter id list and -inf scores in the unfilled trailing slots
+        """
+        queries = normalize_rows(query_embeddings)
+        k = min(k, len(self.paper_ids))
+        if k == 0:
+            return np.empty((len(queries), 0), dtype=np.float32), [[] for _ in queries]
+
+        if self._faiss is not None:
+            scores, positions = self.index.search(queries, k)
+        else:
+            scores, positions = top_k_similar(queries, self._vectors, k, normalized=True)
+
+        # FAISS marks slots it couldn't fill with position -1, after the filled ones
+        filled = positions >= 0
+        scores = np.where(filled, scores, -np.inf).astype(np.float32)
+        ids = [[self.paper_ids[pos] for pos in row[row >= 0]] for row in positions]
+        return scores, ids
+
+    def search_similar(self, query_embedding: np.ndarray, k: int = 10) -> List[str]:
+        """
+        Find the ids of the k papers most similar to a query
+
+        Args:
+            query_embedding: Query vector
+            k: Number of neighbours
+
+        Returns:
+            Paper ids ordered by decreasing similarity
+        """
+        _scores, ids = self.search(query_embedding, k)
+        return ids[0]
+
+    def save(self) -> None:
+        """Atomically write the index and its id mapping to disk"""
+        index_dir = os.path.dirname(self.index_path)
+        if index_dir:
+            os.makedirs(index_dir, exist_ok=True)
+
+        # Ids are append-only, so writing them first keeps any crash recoverable
+        tmp_ids = f"{self.ids_path}.tmp"
+        with open(tmp_ids, 'w', encoding='utf-8') as f:
+            json.dump({'index_type': self.index_type, 'paper_ids': self.paper_ids}, f)
+        os.replace(tmp_ids, self.ids_path)
+
+        tmp_index = f"{self.index_path}.tmp"
+        if self._faiss is not None:
+            self._faiss.write_index(self.index, tmp_index)
+        else:
+            with open(tmp_index, 'wb') as f:
+                np.save(f, self._vectors)
+        os.replace(tmp_index, self.index_path)
+
+    def load(self) -> None:
+        """
+        Load the index and its id mapping from disk
+
+        An index saved with a different index_type than the configured one
+        is rebuilt as the configured type from its stored vectors.
+        """
+        with open(self.ids_path, 'r', encoding='utf-8') as f:
+            mapping = json.load(f)
+        paper_ids = mapping['paper_ids']
+        stored_type = mapping.get('index_type', self.index_type)
+
+        faiss = self._faiss
+        if faiss is not None:
+            self.index = faiss.read_index(self.index_path)
+            if self.index.d != self.embedding_dim:
+                raise ValueError(f"Vector index {self.index_path} has dimension {self.index.d}, "
+                                 f"expected {self.embedding_dim}")
+            if stored_type != self.index_type:
+                print(f"Vector index {self.index_path} was saved as '{stored_type}'; "
+                      f"rebuilding it as '{self.index_type}'")
+                self._rebuild()
+            if isinstance(self.index, faiss.IndexIVF):
+                self.index.nprobe = self.nprobe
+            elif isinstance(self.index, faiss.IndexHNSW):
+                self.index.hnsw.efSearch = self.ef_search
+            count = self.index.ntotal
+        else:
+            self._vectors = np.load(self.index_path)
+            count = len(self._vectors)
+
+        # A crash between writing ids and index leaves extra trailing ids
+        self.paper_ids = paper_ids[:count]
+        self._positions = {paper_id: pos for pos, paper_id in enumerate(self.paper_ids)}
+
+    def _rebuild(self) -> None:
+        """Move the loaded index's vectors into a new index of the configured type"""
+        if isinstance(self.index, self._faiss.IndexIVF):
+            self.index.make_direct_map()
+        vectors = self.index.reconstruct_n(0, self.index.ntotal)
+        self.index = self._create_index()
+        self.index.add(vectors)
+        self._maybe_train_ivf()
+
+    def get_info(self) -> Dict:
+        """
+        Get information about the index
+
+        Returns:
+            Dictionary with index information
+        """
+        return {
+            'index_path': self.index_path,
+            'index_type': self.index_type,
+            'size': len(self.paper_ids),
+            'embedding_dimension': self.embedding_dim,
+            'faiss_available': self._faiss is not None
+        }
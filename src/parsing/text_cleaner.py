@@ -1,19 +1,201 @@
 """
-Text Cleaner for Paper Daily - Basic Framework
+Text Cleaner for Paper Daily
+
+Normalizes paper text before embedding: LaTeX commands and math,
+line-wrap hyphenation of PDF text, PDF boilerplate and whitespace. All
+patterns are compiled once at import time and LaTeX is rewritten in a
+single regex pass.
 """
 
+import re
+from typing import Dict, List
+
+
+# Commands whose argument carries no meaning for embeddings
+DROP_COMMANDS = ('cite', 'citep', 'citet', 'citealp', 'ref', 'eqref', 'autoref', 'cref',
+                 'Cref', 'label', 'footnote', 'thanks', 'vspace', 'hspace')
+# Formatting commands whose argument is kept as plain text
+KEEP_COMMANDS = ('textbf', 'textit', 'texttt', 'textsc', 'textrm', 'emph', 'underline',
+                 'mathbf', 'mathcal', 'mathrm', 'mathit', 'mathbb', 'mathsf', 'mathfrak',
+                 'boldsymbol', 'operatorname', 'text', 'url', 'mbox')
+# Argument-less commands kept as their name; any other is dropped
+WORD_COMMANDS = frozenset((
+    'alpha', 'beta', 'gamma', 'delta', 'epsilon', 'varepsilon', 'zeta', 'eta', 'theta',
+    'vartheta', 'iota', 'kappa', 'lambda', 'mu', 'nu', 'xi', 'pi', 'rho', 'sigma', 'tau',
+    'upsilon', 'phi', 'varphi', 'chi', 'psi', 'omega', 'Gamma', 'Delta', 'Theta', 'Lambda',
+    'Xi', 'Pi', 'Sigma', 'Upsilon', 'Phi', 'Psi', 'Omega', 'infty', 'ell', 'nabla', 'partial',
+    'log', 'exp', 'sin', 'cos', 'tanh', 'max', 'min', 'arg', 'lim', 'sum', 'prod', 'sqrt'
+))
+# Words that keep their hyphen when a compound is broken after them
+COMPOUND_PREFIXES = frozenset((
+    'self', 'non', 'multi', 'pre', 'post', 'semi', 'co', 'cross', 'anti', 'meta', 'inter',
+    'intra', 'sub', 'super', 'well', 'state', 'end', 'zero', 'few', 'one', 'long', 'high',
+    'low', 'large', 'small', 'fine', 'real', 'open', 'task', 'data', 'model'
+))
+
+_ARG = r'\{((?:[^{}]|\{[^{}]*\})*)\}'
+
+LATEX_PATTERN = re.compile(
+    r'(?P<display>\$\$.+?\$\$|\\\[.+?\\\]|\\begin\{(?:equation|align|eqnarray|gather)\*?\}'
+    r'.+?\\end\{(?:equation|align|eqnarray|gather)\*?\})'
+    r'|(?P<inline>(?<!\\)\$(?P<inline_body>[^$]+?)(?<!\\)\$|\\\((?P<paren_body>.+?)\\\))'
+    r'|\\(?:' + '|'.join(DROP_COMMANDS) + r')\*?(?:\[[^\]]*\])*' + _ARG.replace('(', '(?:', 1) +
+    r'|\\href\{[^{}]*\}' + _ARG.replace('(', '(?P<href_text>', 1) +
+    r'|\\(?:' + '|'.join(KEEP_COMMANDS) + r')\*?' + _ARG.replace('(', '(?P<keep>', 1) +
+    r'|\\(?P<escaped>[%&_#$])'
+    r"|\\['`^\"~=.][{]?(?P<accented>[A-Za-z])[}]?"
+    r'|\\(?P<command>[A-Za-z]+)\*?'
+    r'|(?P<tilde>~)',
+    re.DOTALL
+)
+BRACES_PATTERN = re.compile(r'[{}]')
+HYPHENATION_PATTERN = re.compile(r'(\w+)-[ \t]*\r?\n[ \t]*([a-z])')
+ARXIV_STAMP_PATTERN = re.compile(r'arXiv:\d{4}\.\d{4,5}(?:v\d+)?\s*\[[\w.-]+\]\s*\d{1,2}\s+\w{3}\s+\d{4}')
+PAGE_NUMBER_PATTERN = re.compile(r'^\s*\d{1,3}\s*$', re.MULTILINE)
+WHITESPACE_PATTERN = re.compile(r'\s+')
+SPACE_BEFORE_PUNCT_PATTERN = re.compile(r'\s+([.,;:)\]])')
+
+ABSTRACT_HEADING_PATTERN = re.compile(r'^\s*a\s?b\s?s\s?t\s?r\s?a\s?c\s?t\b[\s.:—-]*',
+                                      re.IGNORECASE | re.MULTILINE)
+ABSTRACT_END_PATTERN = re.compile(
+    r'^\s*(?:(?:\d+|[IVX]+)\.?\s+introduction|introduction|keywords|index terms|'
+    r'ccs concepts|1\s+[A-Z])\b', re.IGNORECASE | re.MULTILINE
+)
+PARAGRAPH_PATTERN = re.compile(r'\n\s*\n')
+
 
 class TextCleaner:
     """Cleans and preprocesses text"""
-    
-    def __init__(self):
-        """Initialize text cleaner"""
-        pass
-        
-    def clean_text(self, text: str) -> str:
-        """Clean text - placeholder implementation"""
-        return text.strip()
-        
+
+    def __init__(self, keep_inline_math: bool = True, min_abstract_words: int = 40):
+        """
+        Initialize text cleaner
+
+        Args:
+            keep_inline_math: Keep the de-LaTeXed content of inline math (e.g. 'O(n^2)')
+                instead of dropping it; display math is always dropped
+            min_abstract_words: Minimum words for a paragraph to be taken as an
+                abstract when no 'Abstract' heading is found
+        """
+        self.keep_inline_math = keep_inline_math
+        self.min_abstract_words = min_abstract_words
+
+    def _replace_latex(self, match: re.Match) -> str:
+        """Replacement for a single LATEX_PATTERN match"""
+        group = match.lastgroup
+        if group in ('inline_body', 'paren_body', 'inline'):
+            if not self.keep_inline_math:
+                return ' '
+            body = match.group('inline_body') or match.group('paren_body') or ''
+            return self._strip_latex(body)
+        if group == 'href_text':
+            return match.group('href_text')
+        if group == 'keep':
+            return self._strip_latex(match.group('keep'))
+        if group == 'escaped':
+            return match.group('escaped')
+        if group == 'accented':
+            return match.group('accented')
+        if group == 'command':
+            # Greek letters and symbols read better as words than vanish
+            command = match.group('command')
+            return command if command in WORD_COMMANDS else ' '
+        if group == 'tilde':
+            return ' '
+        return ' '
+
+    def _strip_latex(self, text: str) -> str:
+        """Rewrite LaTeX in one pass and drop leftover braces"""
+        return BRACES_PATTERN.sub('', LATEX_PATTERN.sub(self._replace_latex, text))
+
+    @staticmethod
+    def _join_hyphenation(match: re.Match) -> str:
+        """Replacement for a HYPHENATION_PATTERN match, keeping the hyphen of compounds"""
+        word = match.group(1)
+        hyphen = '-' if word.lower() in COMPOUND_PREFIXES else ''
+        return word + hyphen + match.group(2)
+
+    def clean_text(self, text: str, dehyphenate: bool = False) -> str:
+        """
+        Clean a single text
+
+        Args:
+            text: Raw abstract, title or PDF text
+            dehyphenate: Join words hyphenated at a line end, for text extracted
+                from PDFs (line breaks in metadata are just wrapping, so
+                hyphens there are kept)
+
+        Returns:
+            Text with LaTeX, hyphenation, boilerplate and extra whitespace removed
+        """
+        if not text:
+            return ''
+
+        if dehyphenate:
+            text = HYPHENATION_PATTERN.sub(self._join_hyphenation, text)
+        else:
+            # A hyphen before a wrapped line is part of the word
+            text = HYPHENATION_PATTERN.sub(r'\1-\2', text)
+        text = ARXIV_STAMP_PATTERN.sub(' ', text)
+        text = PAGE_NUMBER_PATTERN.sub(' ', text)
+        if '\\' in text or '$' in text or '{' in text or '~' in text:
+            # Removed citations and refs leave gaps before punctuation
+            text = SPACE_BEFORE_PUNCT_PATTERN.sub(r'\1', self._strip_latex(text))
+        return WHITESPACE_PATTERN.sub(' ', text).strip()
+
+    def clean_batch(self, texts: List[str]) -> List[str]:
+        """
+        Clean a list of texts
+
+        Args:
+            texts: Raw texts
+
+        Returns:
+            Cleaned texts in the same order
+        """
+        clean = self.clean_text
+        return [clean(text) for text in texts]
+
+    def clean_papers(self, papers: List[Dict]) -> List[Dict]:
+        """
+        Clean the title and abstract of each paper in place
+
+        Args:
+            papers: Paper dictionaries
+
+        Returns:
+            The same paper dictionaries
+        """
+        for paper in papers:
+            paper['title'] = self.clean_text(paper.get('title', ''))
+            paper['abstract'] = self.clean_text(paper.get('abstract', ''))
+        return papers
+
     def extract_abstract(self, text: str) -> str:
-        """Extract abstract - placeholder implementation"""
-        return text[:500] + "..." if len(text) > 500 else text 
\ No newline at end of file
+        """
+        Extract the abstract from full paper text
+
+        Looks for an 'Abstract' heading and reads up to the introduction or
+        keywords; otherwise takes the first paragraph long enough to be one.
+
+        Args:
+            text: Text extracted from a PDF
+
+        Returns:
+            Cleaned abstract text
+        """
+        if not text:
+            return ''
+
+        heading = ABSTRACT_HEADING_PATTERN.search(text)
+        if heading:
+            end = ABSTRACT_END_PATTERN.search(text, heading.end())
+            abstract = text[heading.end():end.start() if end else heading.end() + 3000]
+            return self.clean_text(abstract, dehyphenate=True)
+
+        for paragraph in PARAGRAPH_PATTERN.split(text):
+            if len(paragraph.split()) >= self.min_abstract_words:
+                return self.clean_text(paragraph, dehyphenate=True)
+
+        cleaned = self.clean_text(text, dehyphenate=True)
+        return cleaned[:500] + "..." if len(cleaned) > 500 else cleaned
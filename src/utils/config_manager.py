@@ -42,7 +42,11 @@ class ConfigManager:
             "arxiv": {
                 "categories": ["cs.AI", "cs.LG", "cs.CL"],
                 "max_results": 50,
-                "api_url": "http://export.arxiv.org/api/query"
+                "api_url": "http://export.arxiv.org/api/query",
+                "max_workers": 4,
+                "requests_per_second": 0.33,
+                "burst": 1,
+                "settle_days": 3
             },
             "embedding": {
                 "model_name": "all-MiniLM-L6-v2",
@@ -0,0 +1,404 @@
+"""
+Database Manager for Paper Daily
+
+Persists paper metadata in SQLite so daily runs only process new work.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set
+
+from data_acquisition.paper import FIELDS, Paper
+
+
+# Paper keys stored in dedicated columns; anything else goes to `extra`
+PAPER_COLUMNS = list(FIELDS)
+JSON_COLUMNS = {'authors', 'categories'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    authors TEXT,
+    abstract TEXT,
+    published_date TEXT,
+    updated_date TEXT,
+    categories TEXT,
+    primary_category TEXT,
+    pdf_url TEXT,
+    arxiv_url TEXT,
+    source TEXT,
+    extra TEXT,
+    first_seen TEXT,
+    last_seen TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_papers_published_date ON papers (published_date);
+CREATE INDEX IF NOT EXISTS idx_papers_primary_category ON papers (primary_category);
+CREATE INDEX IF NOT EXISTS idx_papers_source ON papers (source);
+
+CREATE TABLE IF NOT EXISTS fetch_log (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    date TEXT NOT NULL,
+    paper_count INTEGER,
+    fetched_at TEXT,
+    PRIMARY KEY (source, scope, date)
+);
+
+CREATE TABLE IF NOT EXISTS sync_cursors (
+    source TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    cursor INTEGER,
+    updated_at TEXT,
+    PRIMARY KEY (source, scope)
+);
+
+CREATE TABLE IF NOT EXISTS recommendations (
+    run_date TEXT NOT NULL,
+    paper_id TEXT NOT NULL,
+    rank INTEGER,
+    score REAL,
+    reasons TEXT,
+    PRIMARY KEY (run_date, paper_id)
+);
+"""
+
+UPSERT_SQL = f"""
+INSERT INTO papers ({', '.join(PAPER_COLUMNS)}, extra, first_seen, last_seen)
+VALUES ({', '.join('?' for _ in PAPER_COLUMNS)}, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    {', '.join(f'{col} = excluded.{col}' for col in PAPER_COLUMNS[1:])},
+    extra = excluded.extra,
+    last_seen = excluded.last_seen
+"""
+
+
+class DBManager:
+    """Manages SQLite storage of paper metadata"""
+
+    def __init__(self, db_path: str = "data/db/papers.db", batch_size: int = 500):
+        """
+        Initialize the database manager
+
+        Args:
+            db_path: Path to the SQLite database file
+            batch_size: Number of rows written per executemany call
+        """
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self._lock = threading.Lock()
+
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _paper_to_row(self, paper: Dict, now: str) -> tuple:
+        """Convert a paper record or dictionary to an upsert row"""
+        values = []
+        for column in PAPER_COLUMNS:
+            value = paper.get(column)
+            if column in JSON_COLUMNS:
+                value = json.dumps(value or [], ensure_ascii=False)
+            values.append(value)
+
+        if isinstance(paper, Paper):
+            extra = paper.extra or {}
+        else:
+            extra = {key: value for key, value in paper.items() if key not in PAPER_COLUMNS}
+        values.append(json.dumps(extra, ensure_ascii=False, default=str))
+        values.extend([now, now])
+        return tuple(values)
+
+    def _row_to_paper(self, row: sqlite3.Row) -> Paper:
+        """Convert a database row back to a paper record"""
+        paper = {}
+        for column in PAPER_COLUMNS:
+            value = row[column]
+            if column in JSON_COLUMNS:
+                value = json.loads(value) if value else []
+            paper[column] = value
+
+        if row['extra']:
+            for key, value in json.loads(row['extra']).items():
+                paper.setdefault(key, value)
+        return Paper(**paper)
+
+    def save_paper(self, paper: Dict) -> None:
+        """
+        Store or update a single paper
+
+        Args:
+            paper: Paper record as returned by a fetcher
+        """
+        self.save_papers([paper])
+
+    def save_papers(self, papers: Iterable[Dict]) -> int:
+        """
+        Upsert papers in batches keyed on paper id
+
+        Args:
+            papers: Paper records as returned by a fetcher
+
+        Returns:
+            Number of papers written
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [self._paper_to_row(paper, now) for paper in papers if paper.get('id')]
+
+        with self._lock:
+            with self.conn:
+                for i in range(0, len(rows), self.batch_size):
+                    self.conn.executemany(UPSERT_SQL, rows[i:i + self.batch_size])
+
+        return len(rows)
+
+    def get_known_ids(self, paper_ids: Iterable[str]) -> Set[str]:
+        """
+        Return the subset of paper ids already stored
+
+        Args:
+            paper_ids: Candidate paper ids
+
+        Returns:
+            Set of ids present in the database
+        """
+        paper_ids = list(paper_ids)
+        known = set()
+
+        # Stay well below SQLite's bound-parameter limit
+        chunk_size = 900
+        with self._lock:
+            for i in range(0, len(paper_ids), chunk_size):
+                chunk = paper_ids[i:i + chunk_size]
+                placeholders = ', '.join('?' for _ in chunk)
+                cursor = self.conn.execute(
+                    f"SELECT id FROM papers WHERE id IN ({placeholders})", chunk
+                )
+                known.update(row['id'] for row in cursor)
+
+        return known
+
+    def filter_new_papers(self, papers: List[Dict]) -> List[Dict]:
+        """
+        Drop papers whose id is already stored
+
+        Args:
+            papers: Paper dictionaries
+
+        Returns:
+            Papers not yet in the database
+        """
+        known = self.get_known_ids(paper['id'] for paper in papers if paper.get('id'))
+        return [paper for paper in papers if paper.get('id') not in known]
+
+    def get_paper(self, paper_id: str) -> Optional[Paper]:
+        """Get a stored paper by id"""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM papers WHERE id = ?", (paper_id,)).fetchone()
+        return self._row_to_paper(row) if row else None
+
+    def get_papers(self, paper_ids: Iterable[str]) -> List[Paper]:
+        """
+        Get stored papers by id
+
+        Args:
+            paper_ids: Paper ids
+
+        Returns:
+            Paper records in the order of paper_ids (unknown ids are skipped)
+        """
+        paper_ids = list(paper_ids)
+        found = {}
+
+        chunk_size = 900
+        with self._lock:
+            for i in range(0, len(paper_ids), chunk_size):
+                chunk = paper_ids[i:i + chunk_size]
+                placeholders = ', '.join('?' for _ in chunk)
+                for row in self.conn.execute(
+                        f"SELECT * FROM papers WHERE id IN ({placeholders})", chunk):
+                    found[row['id']] = row
+
+        return [self._row_to_paper(found[paper_id]) for paper_id in paper_ids if paper_id in found]
+
+    def get_paper_ids(self) -> List[str]:
+        """Get the ids of all stored papers, oldest first"""
+        with self._lock:
+            rows = self.conn.execute("SELECT id FROM papers ORDER BY rowid").fetchall()
+        return [row['id'] for row in rows]
+
+    def get_papers_by_date(self, date: str, source: str = None,
+                           category: str = None) -> List[Paper]:
+        """
+        Get papers published on a date
+
+        Args:
+            date: Date in YYYY-MM-DD format
+            source: Optional source filter (e.g., 'arxiv')
+            category: Optional primary category filter
+
+        Returns:
+            List of Paper records
+        """
+        next_day = (datetime.strptime(date, '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        query = "SELECT * FROM papers WHERE published_date >= ? AND published_date < ?"
+        params = [date, next_day]
+
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        if category:
+            query += " AND primary_category = ?"
+            params.append(category)
+
+        query += " ORDER BY published_date DESC, id"
+
+        with self._lock:
+            rows = self.conn.execute(query, params).fetchall()
+        return [self._row_to_paper(row) for row in rows]
+
+    def count_papers(self, source: str = None) -> int:
+        """Count stored papers, optionally for a single source"""
+        with self._lock:
+            if source:
+                row = self.conn.execute(
+                    "SELECT COUNT(*) FROM papers WHERE source = ?", (source,)
+                ).fetchone()
+            else:
+                row = self.conn.execute("SELECT COUNT(*) FROM papers").fetchone()
+        return row[0]
+
+    def is_fetched(self, source: str, scope: str, date: str) -> bool:
+        """
+        Check whether a source scope (e.g., an arXiv category) was fully fetched for a date
+
+        Args:
+            source: Paper source (e.g., 'arxiv')
+            scope: Category or venue that was fetched
+            date: Date in YYYY-MM-DD format
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT 1 FROM fetch_log WHERE source = ? AND scope = ? AND date = ?",
+                (source, scope, date)
+            ).fetchone()
+        return row is not None
+
+    def mark_fetched(self, source: str, scope: str, date: str, paper_count: int = 0) -> None:
+        """Record that a source scope has been fully fetched for a date"""
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO fetch_log VALUES (?, ?, ?, ?, ?)",
+                    (source, scope, date, paper_count, now)
+                )
+
+    def get_fetched(self, source: str, date_from: str, date_to: str) -> Set[tuple]:
+        """
+        (scope, date) pairs of a source fully fetched within a date range
+
+        Args:
+            source: Paper source (e.g., 'arxiv')
+            date_from: First date in YYYY-MM-DD format
+            date_to: Last date in YYYY-MM-DD format (inclusive)
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT scope, date FROM fetch_log WHERE source = ? AND date BETWEEN ? AND ?",
+                (source, date_from, date_to)
+            ).fetchall()
+        return {(row['scope'], row['date']) for row in rows}
+
+    def mark_fetched_many(self, source: str, entries: Iterable[tuple]) -> None:
+        """
+        Record several fully fetched scopes in one transaction
+
+        Args:
+            source: Paper source (e.g., 'arxiv')
+            entries: (scope, date, paper_count) tuples
+        """
+        now = datetime.now().isoformat(timespec='seconds')
+        rows = [(source, scope, date, paper_count, now) for scope, date, paper_count in entries]
+        with self._lock:
+            with self.conn:
+                self.conn.executemany("INSERT OR REPLACE INTO fetch_log VALUES (?, ?, ?, ?, ?)", rows)
+
+    def get_sync_cursor(self, source: str, scope: str) -> int:
+        """
+        Cursor an incremental sync of a source scope stopped at, 0 if it never ran
+
+        Args:
+            source: Paper source (e.g., 'openreview')
+            scope: Venue or category that is synced
+        """
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT cursor FROM sync_cursors WHERE source = ? AND scope = ?", (source, scope)
+            ).fetchone()
+        return row['cursor'] if row is not None else 0
+
+    def set_sync_cursor(self, source: str, scope: str, cursor: int) -> None:
+        """Record where the next incremental sync of a source scope starts"""
+        now = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO sync_cursors VALUES (?, ?, ?, ?)",
+                    (source, scope, cursor, now)
+                )
+
+    def save_recommendations(self, run_date: str, recommendations: List[Dict]) -> None:
+        """
+        Store the ranked recommendations produced for a run date
+
+        Args:
+            run_date: Date in YYYY-MM-DD format
+            recommendations: Ranked paper dictionaries with 'score' and 'reasons'
+        """
+        rows = [
+            (run_date, paper['id'], rank, paper.get('score'),
+             json.dumps(paper.get('reasons', []), ensure_ascii=False))
+            for rank, paper in enumerate(recommendations, 1)
+        ]
+        with self._lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM recommendations WHERE run_date = ?", (run_date,))
+                self.conn.executemany(
+                    "INSERT INTO recommendations VALUES (?, ?, ?, ?, ?)", rows
+                )
+
+    def get_recommended_ids(self, exclude_date: str = None) -> Set[str]:
+        """
+        Get ids of papers already recommended on earlier runs
+
+        Args:
+            exclude_date: Run date whose recommendations should be ignored
+        """
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT DISTINCT paper_id FROM recommendations WHERE run_date != ?",
+                (exclude_date or '',)
+            ).fetchall()
+        return {row['paper_id'] for row in rows}
@@ -0,0 +1,49 @@
+"""
+Lazy Imports for Paper Daily
+
+Heavy optional dependencies (torch via sentence-transformers, faiss,
+PyMuPDF, pdfplumber) take seconds to import. Modules check availability
+with is_available(), which only locates the package, and import it with
+import_optional() on first real use.
+"""
+
+import functools
+import importlib
+import importlib.util
+from types import ModuleType
+from typing import Optional
+
+
+@functools.lru_cache(maxsize=None)
+def is_available(module_name: str) -> bool:
+    """
+    Check whether a module can be imported without importing it
+
+    Args:
+        module_name: Top-level module name (e.g., 'faiss')
+
+    Returns:
+        True if the module is installed
+    """
+    try:
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def import_optional(module_name: str) -> Optional[ModuleType]:
+    """
+    Import an optional module once, on first use
+
+    Args:
+        module_name: Module name (e.g., 'sentence_transformers')
+
+    Returns:
+        The module, or None if it fails to import
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        print(f"Warning: could not import {module_name}: {e}")
+        return None
@@ -0,0 +1,240 @@
+"""
+Metrics for Paper Daily
+
+Lightweight instrumentation: timing spans, counters, histograms and
+gauges collected in a thread-safe registry. Each run can be written to a
+JSON-lines file so timings can be compared across runs.
+"""
+
+import functools
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+
+class Histogram:
+    """Summary statistics over observed values, keeping a bounded sample"""
+
+    def __init__(self, max_samples: int = 10000):
+        """
+        Initialize the histogram
+
+        Args:
+            max_samples: Values kept for percentiles (reservoir sampled beyond this)
+        """
+        self.max_samples = max_samples
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.samples: List[float] = []
+
+    def observe(self, value: float) -> None:
+        """Record a value"""
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+        if len(self.samples) < self.max_samples:
+            self.samples.append(value)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.max_samples:
+                self.samples[slot] = value
+
+    def percentile(self, q: float) -> float:
+        """Value at quantile q (0-1) of the sampled values"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def summary(self) -> Dict:
+        """Count, total, min, max, mean and p50/p95 of the values"""
+        if not self.count:
+            return {'count': 0}
+        return {
+            'count': self.count,
+            'total': round(self.total, 6),
+            'min': round(self.min, 6),
+            'max': round(self.max, 6),
+            'mean': round(self.total / self.count, 6),
+            'p50': round(self.percentile(0.5), 6),
+            'p95': round(self.percentile(0.95), 6)
+        }
+
+
+class Metrics:
+    """Thread-safe registry of spans, counters, histograms and gauges"""
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._lock = threading.Lock()
+        self.logger = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Clear all metrics and start a new run"""
+        with self._lock:
+            self.run_id = uuid.uuid4().hex[:12]
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self.counters: Dict[str, float] = {}
+            self.histograms: Dict[str, Histogram] = {}
+            self.gauges: Dict[str, float] = {}
+            self.events: List[Dict] = []
+
+    def increment(self, name: str, value: float = 1) -> None:
+        """
+        Add to a counter
+
+        Args:
+            name: Counter name (e.g., 'arxiv.requests')
+            value: Amount to add
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name: str, value: float) -> None:
+        """
+        Record a value in a histogram
+
+        Args:
+            name: Histogram name (e.g., 'embedder.batch_size')
+            value: Observed value
+        """
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """
+        Set a gauge to its latest value
+
+        Args:
+            name: Gauge name (e.g., 'pipeline.embed.items_per_second')
+            value: Current value
+        """
+        with self._lock:
+            self.gauges[name] = value
+
+    @contextmanager
+    def span(self, name: str, log: bool = False, **tags):
+        """
+        Time a block of code
+
+        The duration is recorded in the '<name>.seconds' histogram and as a
+        span event in the run's metrics file.
+
+        Args:
+            name: Span name (e.g., 'arxiv.fetch_category')
+            log: Also report the span through Logger.log_performance
+            **tags: Extra fields stored with the span event
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - start, log=log, **tags)
+
+    def record_span(self, name: str, seconds: float, log: bool = False, **tags) -> None:
+        """
+        Record a span timed by the caller
+
+        Args:
+            name: Span name
+            seconds: Duration of the span
+            log: Also report the span through Logger.log_performance
+            **tags: Extra fields stored with the span event
+        """
+        self.observe(f"{name}.seconds", seconds)
+        with self._lock:
+            self.events.append({'type': 'span', 'name': name,
+                                'seconds': round(seconds, 6), **tags})
+        if log and self.logger is not None:
+            self.logger.log_performance(name, seconds, tags or None)
+
+    def timed(self, name: Optional[str] = None, log: bool = False):
+        """
+        Decorator timing every call of a function as a span
+
+        Args:
+            name: Span name (defaults to the function's qualified name)
+            log: Also report each call through Logger.log_performance
+        """
+        def decorator(func):
+            span_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, log=log):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def summary(self) -> Dict:
+        """
+        Snapshot of every metric
+
+        Returns:
+            Dictionary with counters, histogram summaries and gauges
+        """
+        with self._lock:
+            return {
+                'counters': dict(self.counters),
+                'histograms': {name: h.summary() for name, h in self.histograms.items()},
+                'gauges': dict(self.gauges)
+            }
+
+    def log_summary(self) -> None:
+        """Report the total time of each span through Logger.log_performance"""
+        if self.logger is None:
+            return
+        summary = self.summary()
+        for name, stats in sorted(summary['histograms'].items()):
+            if name.endswith('.seconds') and stats['count']:
+                self.logger.log_performance(name[:-len('.seconds')], stats['total'], {
+                    'calls': stats['count'], 'p50': stats['p50'], 'p95': stats['p95']
+                })
+        if summary['counters']:
+            self.logger.log("Metrics counters", "INFO", summary['counters'])
+
+    def write_jsonl(self, path: str, **run_info) -> None:
+        """
+        Append this run's span events and a summary line to a JSON-lines file
+
+        Args:
+            path: Metrics file path
+            **run_info: Extra fields for the summary line (e.g., date, papers)
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        summary = self.summary()
+        with self._lock:
+            events = list(self.events)
+
+        with open(path, 'a', encoding='utf-8') as f:
+            for event in events:
+                f.write(json.dumps({'run_id': self.run_id, **event}, default=str) + '\n')
+            f.write(json.dumps({
+                'run_id': self.run_id,
+                'type': 'summary',
+                'started_at': self.started_at,
+                'finished_at': datetime.now().isoformat(timespec='seconds'),
+                **run_info,
+                **summary
+            }, default=str) + '\n')
+
+
+# Process-wide registry used by the fetchers, embedder, recommender and pipeline
+metrics = Metrics()
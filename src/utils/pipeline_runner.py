@@ -0,0 +1,248 @@
+"""
+Pipeline Runner for Paper Daily
+
+Runs processing stages concurrently, connected by bounded queues, so
+downstream stages start on the first items while upstream stages are
+still producing. Full queues block producers, giving backpressure.
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .metrics import metrics
+
+
+_DONE = object()
+
+
+class Stage:
+    """A named processing step run by one or more worker threads"""
+
+    def __init__(self, name: str, func: Callable[[List], Optional[Iterable]],
+                 workers: int = 1, batch_size: int = 1, queue_size: int = 256):
+        """
+        Initialize a stage
+
+        Args:
+            name: Stage name used in reports
+            func: Called with a list of up to batch_size input items; returns
+                (or yields) the output items passed to the next stage
+            workers: Number of worker threads
+            batch_size: Maximum items handed to func at once
+            queue_size: Capacity of the stage's input queue
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.queue_size = max(1, queue_size)
+
+        self.input: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self.stats = {
+            'items_in': 0, 'items_out': 0, 'batches': 0, 'errors': 0,
+            'busy_seconds': 0.0, 'blocked_seconds': 0.0, 'max_queue_depth': 0,
+            'queue_depth_samples': 0,
+            'queue_depth_total': 0
+        }
+        self._first_start: Optional[float] = None
+        self._last_finish: Optional[float] = None
+        self._active_workers = 0
+        self._lock = threading.Lock()
+
+    def record_depth(self) -> None:
+        """Sample the input queue depth"""
+        depth = self.input.qsize()
+        with self._lock:
+            self.stats['max_queue_depth'] = max(self.stats['max_queue_depth'], depth)
+            self.stats['queue_depth_samples'] += 1
+            self.stats['queue_depth_total'] += depth
+
+    def report(self) -> Dict:
+        """
+        Summarize the stage's work
+
+        Returns:
+            Dictionary with counts, busy and wall time, throughput and queue depths
+        """
+        stats = dict(self.stats)
+        wall = 0.0
+        if self._first_start is not None and self._last_finish is not None:
+            wall = self._last_finish - self._first_start
+        samples = stats.pop('queue_depth_samples')
+        total_depth = stats.pop('queue_depth_total')
+
+        stats.update({
+            'workers': self.workers,
+            'wall_seconds': round(wall, 4),
+            'busy_seconds': round(stats['busy_seconds'], 4),
+            'blocked_seconds': round(stats['blocked_seconds'], 4),
+            'items_per_second': round(stats['items_in'] / wall, 2) if wall > 0 else 0.0,
+            'avg_queue_depth': round(total_depth / samples, 2) if samples else 0.0
+        })
+        return stats
+
+
+class PipelineRunner:
+    """Connects stages with bounded queues and runs them concurrently"""
+
+    def __init__(self, stages: List[Stage], sample_interval: float = 0.05):
+        """
+        Initialize the runner
+
+        Args:
+            stages: Stages in processing order
+            sample_interval: Seconds between queue depth samples
+        """
+        if not stages:
+            raise ValueError("PipelineRunner needs at least one stage")
+        self.stages = stages
+        self.sample_interval = sample_interval
+        self.results: List = []
+        self.wall_seconds = 0.0
+        self._results_lock = threading.Lock()
+
+    def _emit(self, index: int, item) -> float:
+        """
+        Pass an item to the stage after `index`, or collect it at the end
+
+        Returns:
+            Seconds spent waiting for room in the next stage's queue
+        """
+        if index + 1 < len(self.stages):
+            next_stage = self.stages[index + 1]
+            start = time.perf_counter()
+            next_stage.input.put(item)  # blocks when full: backpressure
+            blocked = time.perf_counter() - start
+            next_stage.record_depth()
+            return blocked
+
+        with self._results_lock:
+            self.results.append(item)
+        return 0.0
+
+    def _finish_worker(self, index: int) -> None:
+        """Signal the next stage once the last worker of a stage exits"""
+        stage = self.stages[index]
+        with stage._lock:
+            stage._active_workers -= 1
+            last = stage._active_workers == 0
+            stage._last_finish = time.perf_counter()
+
+        if last and index + 1 < len(self.stages):
+            next_stage = self.stages[index + 1]
+            for _ in range(next_stage.workers):
+                next_stage.input.put(_DONE)
+
+    def _run_worker(self, index: int) -> None:
+        stage = self.stages[index]
+        done = False
+
+        while not done:
+            item = stage.input.get()
+            if item is _DONE:
+                break
+
+            # Take whatever is already queued, up to batch_size, without waiting
+            batch = [item]
+            while len(batch) < stage.batch_size:
+                try:
+                    item = stage.input.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _DONE:
+                    done = True
+                    break
+                batch.append(item)
+
+            start = time.perf_counter()
+            with stage._lock:
+                if stage._first_start is None:
+                    stage._first_start = start
+                stage.stats['items_in'] += len(batch)
+                stage.stats['batches'] += 1
+
+            produced = 0
+            blocked = 0.0
+            try:
+                outputs = stage.func(batch)
+                for output in outputs or []:
+                    blocked += self._emit(index, output)
+                    produced += 1
+            except Exception as e:
+                with stage._lock:
+                    stage.stats['errors'] += 1
+                print(f"Error in pipeline stage '{stage.name}': {e}")
+
+            busy = time.perf_counter() - start - blocked
+            with stage._lock:
+                stage.stats['items_out'] += produced
+                stage.stats['blocked_seconds'] += blocked
+                stage.stats['busy_seconds'] += busy
+            metrics.observe(f"pipeline.{stage.name}.batch_seconds", busy)
+            metrics.observe(f"pipeline.{stage.name}.batch_size", len(batch))
+
+        self._finish_worker(index)
+
+    def _sample_depths(self, stop: threading.Event) -> None:
+        while not stop.wait(self.sample_interval):
+            for stage in self.stages:
+                stage.record_depth()
+
+    def run(self, source: Iterable) -> List:
+        """
+        Feed source items through every stage and wait for completion
+
+        Args:
+            source: Items for the first stage
+
+        Returns:
+            Items produced by the last stage (in completion order)
+        """
+        self.results = []
+        start = time.perf_counter()
+
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage._active_workers = stage.workers
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=self._run_worker, args=(index,),
+                                          name=f"{stage.name}-{worker}", daemon=True)
+                thread.start()
+                threads.append(thread)
+
+        stop_sampling = threading.Event()
+        sampler = threading.Thread(target=self._sample_depths, args=(stop_sampling,), daemon=True)
+        sampler.start()
+
+        first = self.stages[0]
+        for item in source:
+            first.input.put(item)
+            first.record_depth()
+        for _ in range(first.workers):
+            first.input.put(_DONE)
+
+        for thread in threads:
+            thread.join()
+        stop_sampling.set()
+        sampler.join()
+
+        self.wall_seconds = time.perf_counter() - start
+        for stage in self.stages:
+            for key, value in stage.report().items():
+                metrics.set_gauge(f"pipeline.{stage.name}.{key}", value)
+        return self.results
+
+    def report(self) -> Dict:
+        """
+        Per-stage throughput and queue depth report for the last run
+
+        Returns:
+            Dictionary with total wall time and a report per stage
+        """
+        return {
+            'wall_seconds': round(self.wall_seconds, 4),
+            'results': len(self.results),
+            'stages': {stage.name: stage.report() for stage in self.stages}
+        }